@@ -103,7 +103,7 @@ $keyAlias = "torah-app"
 # ============================================================
 Write-Step "Step 2/4: Building Web App"
 
-npm run build 2>&1 | Select-Object -Last 5
+npm run build:native 2>&1 | Select-Object -Last 5
 Write-Ok "Web app built"
 
 # ============================================================
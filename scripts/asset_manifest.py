@@ -0,0 +1,97 @@
+"""
+asset_manifest.py
+Input-hash manifest shared by the asset generators (generate_icons.py,
+store-listing/generate_all_graphics.py, store-listing/generate_feature_graphic.py).
+
+Every output file is keyed by a hash of everything that goes into drawing it
+(size, colors, font file, scale, texts, the generator's DRAW_VERSION ...).
+An output is regenerated only when that hash changed or the file is missing,
+so unchanged PNGs are not rewritten and do not show up as binary diffs.
+
+Usage from a generator:
+    manifest = AssetManifest(ROOT / "assets" / ".icon-manifest.json", ROOT)
+    if manifest.is_stale(path, inputs, force=force):
+        draw(...)
+        manifest.record(path, inputs)
+    manifest.save()
+    manifest.report()
+"""
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+
+
+@lru_cache(maxsize=None)
+def file_digest(path: str) -> str:
+    """sha256 of a file's bytes (fonts etc.), or a stable marker if it doesn't exist."""
+    if not os.path.isfile(path):
+        return f"missing:{os.path.basename(path)}"
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def inputs_hash(inputs: dict) -> str:
+    """Stable hash of a JSON-able dict of drawing inputs (tuples hash like lists)."""
+    blob = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+class AssetManifest:
+    """Map of output path (relative to root) → hash of the inputs that produced it."""
+
+    def __init__(self, path: Path, root: Path):
+        self.path = Path(path)
+        self.root = Path(root)
+        self.entries: dict[str, str] = {}
+        self.changes: list[tuple[str, str]] = []   # (output, reason)
+        self.skipped = 0
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if data.get("version") == MANIFEST_VERSION:
+                    self.entries = data.get("outputs", {})
+            except (OSError, ValueError):
+                print(f"WARNING: unreadable manifest {self.path} — rebuilding everything")
+
+    def key(self, output) -> str:
+        return Path(os.path.relpath(output, self.root)).as_posix()
+
+    def is_stale(self, output, inputs: dict, force: bool = False) -> bool:
+        """True if output must be (re)generated; records why for report()."""
+        key = self.key(output)
+        old = self.entries.get(key)
+        if force:
+            reason = "forced"
+        elif old is None:
+            reason = "new"
+        elif old != inputs_hash(inputs):
+            reason = "inputs changed"
+        elif not Path(output).exists():
+            reason = "missing on disk"
+        else:
+            self.skipped += 1
+            return False
+        self.changes.append((key, reason))
+        return True
+
+    def record(self, output, inputs: dict):
+        self.entries[self.key(output)] = inputs_hash(inputs)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": MANIFEST_VERSION, "outputs": dict(sorted(self.entries.items()))}
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+
+    def report(self):
+        print(f"\nManifest: {len(self.changes)} regenerated, {self.skipped} up to date")
+        for key, reason in self.changes:
+            print(f"  ↻ {key}  ({reason})")
@@ -1,34 +1,37 @@
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-import sys
-
-KEY_FILE = r"scripts\google-play-service-account.json"
-PACKAGE  = "com.torahapp.pash"
-SCOPES   = ["https://www.googleapis.com/auth/androidpublisher"]
-TRACK    = sys.argv[1] if len(sys.argv) > 1 else "alpha"
-VC       = sys.argv[2] if len(sys.argv) > 2 else "4"
-
-creds   = service_account.Credentials.from_service_account_file(KEY_FILE, scopes=SCOPES)
-service = build("androidpublisher", "v3", credentials=creds)
-
-edit = service.edits().insert(body={}, packageName=PACKAGE).execute()
-eid  = edit["id"]
-
-service.edits().tracks().update(
-    packageName=PACKAGE,
-    editId=eid,
-    track=TRACK,
-    body={
-        "releases": [{
-            "versionCodes": [VC],
-            "status": "completed",
-            "releaseNotes": [
-                {"language": "he-IL", "text": "גרסה 1.4.0 - שיפורי ביצועים ותיקוני באגים"},
-                {"language": "en-US", "text": "Version 1.4.0 - Performance improvements and bug fixes"},
-            ]
-        }]
-    }
-).execute()
-
-service.edits().commit(packageName=PACKAGE, editId=eid).execute()
-print(f"SUCCESS - versionCode {VC} assigned to track: {TRACK}")
+"""
+assign_track.py
+Points one or more tracks at an already-uploaded versionCode, in a single edit.
+(To upload and assign in one go, use upload_play.py with several tracks.)
+
+Usage:
+    python scripts/assign_track.py                  # alpha, versionCode 4
+    python scripts/assign_track.py beta 7
+    python scripts/assign_track.py alpha,beta 7     # several tracks, one edit
+    python scripts/assign_track.py alpha 7 --fake http://127.0.0.1:8765
+"""
+import argparse
+
+from upload_play import make_publisher
+
+RELEASE_NOTES = [
+    {"language": "he-IL", "text": "גרסה 1.4.0 - שיפורי ביצועים ותיקוני באגים"},
+    {"language": "en-US", "text": "Version 1.4.0 - Performance improvements and bug fixes"},
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assign an uploaded versionCode to track(s).")
+    parser.add_argument("track", nargs="?", default="alpha",
+                        help="track name, or comma-separated list")
+    parser.add_argument("vc", nargs="?", default="4")
+    parser.add_argument("--fake", nargs="?", const="local", default=None,
+                        help="use the fake API (optionally at URL) instead of Google Play")
+    args = parser.parse_args()
+
+    tracks = [t for t in args.track.split(",") if t]
+    make_publisher(args.fake).assign(tracks, args.vc, RELEASE_NOTES)
+    print(f"SUCCESS - versionCode {args.vc} assigned to track: {', '.join(tracks)}")
+
+
+if __name__ == "__main__":
+    main()
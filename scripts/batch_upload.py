@@ -0,0 +1,288 @@
+"""
+batch_upload.py
+Bulk upserts and failure isolation for the batch uploaders (upload_commentaries.py,
+upload_siddur.py): a batch the server rejects is bisected until the offending
+rows are isolated, everything else still lands, and the rejected rows go to a
+dead-letter file with the server's error instead of aborting the whole file.
+
+Only rejections caused by the data — 4xx other than 401/403/404/408/409/429,
+e.g. an oversized comment, a bad character, a check violation — are bisected.
+409 (a row already there, on a URL without on_conflict) is not the data's fault.
+Network errors, 5xx, auth and rate limits fail the batch as before, so the
+upload stops and resumes from its cursor (upload_cursor.py) on the next run.
+
+Rows go through the bulk_upsert_* RPCs (migration
+20261019070000_bulk_upsert.sql) a few MB per request — usually one per file —
+via BulkUpserter, which falls back to REST batches (and the bisection above)
+when the RPC is missing or rejects a chunk.
+
+Dead letters are appended to scripts/.dead_letter.jsonl, one per row:
+    {"table": "commentaries", "url": ".../rest/v1/commentaries?on_conflict=...",
+     "source": "commentaries:Rashi:1", "status": 400, "error": "...",
+     "row": {...}, "at": "..."}
+
+Usage:
+    python scripts/batch_upload.py                     # summary of dead letters
+    python scripts/batch_upload.py replay [--table T]  # re-send them; keep the ones still rejected
+
+A replay re-stamps the revisions of every chapter / section it landed rows in
+(content_revisions.py), so syncing clients receive them.
+
+Requirements: pip install requests
+"""
+import argparse
+import base64
+import gzip
+import json
+import os
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+import requests
+
+DEAD_LETTER_PATH = Path(__file__).parent / ".dead_letter.jsonl"
+
+RPC_CHUNK_BYTES = 4 << 20
+
+# Statuses that say nothing about the rows themselves — never bisected
+NOT_DATA_ERRORS = {401, 403, 404, 408, 409, 429}
+
+
+def post_rows(url: str, headers: dict, rows: list[dict], timeout: int = 60) -> tuple[int, str]:
+    """(status, error text); status 0 for network errors, error '' on success."""
+    try:
+        r = requests.post(url, headers=headers, json=rows, timeout=timeout)
+    except requests.RequestException as e:
+        return 0, f"{type(e).__name__}: {e}"
+    if r.status_code in (200, 201, 204):
+        return r.status_code, ""
+    return r.status_code, r.text[:1000]
+
+
+def is_data_error(status: int) -> bool:
+    return 400 <= status < 500 and status not in NOT_DATA_ERRORS
+
+
+def write_dead_letters(table: str, url: str, source: str, rejected: list[tuple[dict, int, str]],
+                       path: Path = DEAD_LETTER_PATH):
+    at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with open(path, "a", encoding="utf-8") as f:
+        for row, status, error in rejected:
+            f.write(json.dumps({"table": table, "url": url, "source": source, "status": status,
+                                "error": error, "row": row, "at": at}, ensure_ascii=False) + "\n")
+
+
+def insert_isolating(table: str, url: str, headers: dict, rows: list[dict], source: str,
+                     timeout: int = 60) -> int | None:
+    """
+    Insert rows, bisecting on data errors.  Returns the number of rows written
+    to the dead-letter file (0 = the batch went in whole), or None if the batch
+    failed for a reason other than its data — nothing is dead-lettered then.
+    """
+    rejected: list[tuple[dict, int, str]] = []
+    requests_sent = 0
+
+    def send(part: list[dict]) -> bool:
+        nonlocal requests_sent
+        requests_sent += 1
+        status, error = post_rows(url, headers, part, timeout)
+        if not error:
+            return True
+        if not is_data_error(status):
+            print(f"    ✗ Insert error {status or 'network'}: {error[:300]}")
+            return False
+        if len(part) == 1:
+            rejected.append((part[0], status, error))
+            return True
+        mid = len(part) // 2
+        return send(part[:mid]) and send(part[mid:])
+
+    if not send(rows):
+        return None
+    if rejected:
+        write_dead_letters(table, url, source, rejected)
+        print(f"    ⚠ {len(rejected)} row(s) rejected ({requests_sent} requests to isolate) "
+              f"→ {DEAD_LETTER_PATH.name}: {rejected[0][2][:200]}")
+    return len(rejected)
+
+
+# ── Bulk upsert RPC ───────────────────────────────────────────────────────────
+
+class BulkUpserter:
+    """
+    Sends rows through a bulk_upsert_* RPC (migration 20261019070000_bulk_upsert.sql)
+    in chunks of about chunk_bytes of JSON — one request for most files — and
+    falls back to REST batches of batch_size when the RPC is missing (404) or
+    rejects a chunk for its data, so bisection and dead-lettering still apply.
+    gzip sends the chunk as base64 gzip (p_gzip) until the server says it
+    can't decode it.  params are extra RPC arguments sent with every chunk;
+    fallback=False makes any RPC failure fail the chunk (for RPCs whose target
+    REST can't reach, like commentary_reload_rows' staging table).
+    """
+
+    def __init__(self, table: str, rpc: str, insert_url: str, headers: dict, batch_size: int,
+                 supabase_url: str, gzip: bool = False, chunk_bytes: int = RPC_CHUNK_BYTES,
+                 params: dict | None = None, fallback: bool = True):
+        self.table = table
+        self.params = params or {}
+        self.fallback = fallback
+        self.rpc_url = f"{supabase_url}/rest/v1/rpc/{rpc}"
+        self.insert_url = insert_url
+        self.headers = headers
+        self.batch_size = batch_size
+        self.gzip = gzip
+        self.chunk_bytes = chunk_bytes
+        self.use_rpc = True
+        self.written = 0          # rows the RPC reported as inserted or changed
+        self.all_rpc = True       # False once any chunk went through REST batches
+
+    def chunks(self, rows: list[dict], start: int = 0):
+        """Yield (end index, chunk) from rows[start:]; chunk size follows the current mode."""
+        i = start
+        while i < len(rows):
+            if not self.use_rpc:
+                chunk = rows[i:i + self.batch_size]
+            else:
+                chunk, size = [], 0
+                while i + len(chunk) < len(rows) and (not chunk or size < self.chunk_bytes):
+                    row = rows[i + len(chunk)]
+                    size += len(json.dumps(row, ensure_ascii=False).encode("utf-8")) + 1
+                    chunk.append(row)
+            i += len(chunk)
+            yield i, chunk
+
+    def _call(self, rows: list[dict]) -> tuple[int, str]:
+        if self.gzip:
+            blob = gzip.compress(json.dumps(rows, ensure_ascii=False).encode("utf-8"))
+            payload = {**self.params, "p_gzip": base64.b64encode(blob).decode("ascii")}
+        else:
+            payload = {**self.params, "p_rows": rows}
+        try:
+            r = requests.post(self.rpc_url, headers=self.headers, json=payload, timeout=300)
+        except requests.RequestException as e:
+            return 0, f"{type(e).__name__}: {e}"
+        if r.status_code == 200:
+            self.written += int(r.json() or 0)
+            return 200, ""
+        return r.status_code, r.text[:1000]
+
+    def send(self, rows: list[dict], source: str) -> int | None:
+        """Upsert rows; dead-lettered count like insert_isolating, None on a non-data failure."""
+        if self.use_rpc:
+            status, error = self._call(rows)
+            if error and self.gzip and "bulk_payload: gzip" in error:
+                print("    ⚠ server can't gunzip — sending plain JSON")
+                self.gzip = False
+                status, error = self._call(rows)
+            if not error:
+                return 0
+            if not self.fallback:
+                print(f"    ✗ RPC error {status or 'network'}: {error[:300]}")
+                return None
+            if status == 404:
+                print(f"    ⚠ {self.rpc_url.rsplit('/', 1)[1]} not found — using REST batches "
+                      f"(apply migration 20261019070000_bulk_upsert.sql)")
+                self.use_rpc = False
+            elif not is_data_error(status):
+                print(f"    ✗ RPC error {status or 'network'}: {error[:300]}")
+                return None
+            else:
+                print(f"    ⚠ RPC rejected {len(rows)} rows ({error[:120]}) — isolating in REST batches")
+
+        self.all_rpc = False
+        dead = 0
+        for i in range(0, len(rows), self.batch_size):
+            rejected = insert_isolating(self.table, self.insert_url, self.headers,
+                                        rows[i:i + self.batch_size], source)
+            if rejected is None:
+                return None
+            dead += rejected
+        return dead
+
+
+# ── Dead-letter file ──────────────────────────────────────────────────────────
+
+def load_dead_letters(path: Path = DEAD_LETTER_PATH) -> list[dict]:
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def without_dead_letters(rows: list[dict], source: str) -> list[dict]:
+    """rows minus those dead-lettered for source — what actually landed, for revision stamping."""
+    dead = {json.dumps(l["row"], sort_keys=True, ensure_ascii=False)
+            for l in load_dead_letters() if l["source"] == source}
+    if not dead:
+        return rows
+    return [r for r in rows if json.dumps(r, sort_keys=True, ensure_ascii=False) not in dead]
+
+
+def replay(headers: dict, table: str | None = None) -> tuple[list[dict], int]:
+    """Re-send dead letters one by one; returns (accepted letters, number still rejected)."""
+    letters = load_dead_letters()
+    keep, accepted, rejected = [], [], 0
+    for letter in letters:
+        if table and letter["table"] != table:
+            keep.append(letter)
+            continue
+        status, error = post_rows(letter["url"], headers, [letter["row"]])
+        if error:
+            keep.append({**letter, "status": status, "error": error})
+            rejected += 1
+        else:
+            accepted.append(letter)
+    tmp = DEAD_LETTER_PATH.with_suffix(".tmp")
+    tmp.write_text("".join(json.dumps(l, ensure_ascii=False) + "\n" for l in keep), encoding="utf-8")
+    os.replace(tmp, DEAD_LETTER_PATH)
+    return accepted, rejected
+
+
+def stamp_replayed(accepted: list[dict], supabase_url: str, headers: dict):
+    """
+    Re-stamp every scope a replay landed rows in.  Replayed rows arrive with
+    revision NULL, and the scope's earlier checksum left them out — so the
+    scope is stamped again from the local rows, minus those still dead-lettered.
+    """
+    from content_revisions import SCOPES, local_rows, stamp_rows
+
+    remaining = load_dead_letters()
+    for table in sorted({l["table"] for l in accepted}):
+        columns = SCOPES[table][0]
+        scope_of = lambda r: tuple(r[c] for c in columns)
+        touched = {scope_of(l["row"]) for l in accepted if l["table"] == table}
+        dead = {json.dumps(l["row"], sort_keys=True, ensure_ascii=False)
+                for l in remaining if l["table"] == table}
+        rows = [r for r in local_rows(table)
+                if scope_of(r) in touched and json.dumps(r, sort_keys=True, ensure_ascii=False) not in dead]
+        stamp_rows(table, rows, supabase_url, headers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or replay rows rejected by the uploaders.")
+    parser.add_argument("command", nargs="?", choices=["summary", "replay"], default="summary")
+    parser.add_argument("--table", help="only dead letters for this table")
+    args = parser.parse_args()
+
+    letters = [l for l in load_dead_letters() if not args.table or l["table"] == args.table]
+    if args.command == "summary":
+        if not letters:
+            print("  No dead letters.")
+            return
+        for (table, source), n in sorted(Counter((l["table"], l["source"]) for l in letters).items()):
+            print(f"  {table:14s} {source:32s} {n:5d}")
+        for status, n in Counter(l["status"] for l in letters).most_common():
+            print(f"    status {status}: {n}")
+        return
+
+    import upload_commentaries as config
+    accepted, rejected = replay(config.HEADERS, args.table)
+    print(f"  ✓ {len(accepted)} accepted, {rejected} still rejected")
+    stamp_replayed(accepted, config.SUPABASE_URL, config.HEADERS)
+    sys.exit(1 if rejected else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -29,7 +29,7 @@ Write-Host ""
 
 # Step 1: Build web app
 Write-Host "[1/4] בונה את אפליקציית הווב..." -ForegroundColor Yellow
-npm run build
+npm run build:native
 if ($LASTEXITCODE -ne 0) {
     Write-Host "שגיאה בבניית האפליקציה!" -ForegroundColor Red
     exit 1
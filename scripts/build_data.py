@@ -0,0 +1,299 @@
+"""
+build_data.py
+One entry point for the data refresh: every download / migration / upload /
+derived-file script is a stage in a dependency graph, with declared inputs and
+outputs, instead of a dozen scripts run by hand in the right order.
+
+  schema         migrate_siddur → migrate   (migrate comes before every upload)
+  commentaries   resolve_refs → download_commentaries → upload_commentaries
+  siddur         download_siddur → upload_siddur
+  tehillim       download_tehillim → upload_tehillim
+  nevi'im        download_neviim
+  derived        build_related, og_images, pack_corpus   (after the downloads)
+  check          verify_uploads --check-only             (after the uploads)
+
+Independent branches run concurrently (--jobs, default 4), each stage as its
+own `python scripts/<script>.py` process with its output prefixed by the stage
+name.  A stage is skipped when its script, arguments and input files hash the
+same as on its last successful run, its outputs exist, and nothing it depends
+on ran in this build — see scripts/.build_state.json.  Download stages take
+only their script as input, so they run once; use --force to refresh.
+
+migrate applies every pending supabase/migrations/*.sql (apply_migration.py
+--all) after migrate_siddur has created the siddur / tehillim tables, which
+are not in supabase/migrations/.  On a project whose schema was applied by hand
+it stops until `apply_migration.py --all --baseline VERSION` has been run once
+(see apply_migration.py).  The upload stages run with --force: they only run
+when their input files changed, and without it the uploaders skip any file
+that already has rows in the DB.
+
+Only the standard library is imported here — requests, psycopg2, Pillow etc.
+load in the stage processes that need them — so --help, --list and no-op runs
+start instantly.
+
+Usage:
+    python scripts/build_data.py                     # everything that is out of date
+    python scripts/build_data.py upload_siddur       # that stage and what it needs
+    python scripts/build_data.py --dry-run           # what would run, and why
+    python scripts/build_data.py --force download_tehillim
+    python scripts/build_data.py --list
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+ROOT       = Path(__file__).parent.parent
+SCRIPTS    = Path(__file__).parent
+STATE_PATH = SCRIPTS / ".build_state.json"
+STATE_VERSION = 1
+
+SEFARIA  = "src/data/sefaria/*_on_*.json"
+SIDDUR   = "src/data/siddur/siddur_*.json"
+TEHILLIM = "src/data/tehillim.json"
+NEVIIM   = ["src/data/esther.json", "src/data/joshua.json", "src/data/judges.json",
+            "src/data/i_samuel.json", "src/data/ii_samuel.json", "src/data/i_kings.json",
+            "src/data/ii_kings.json"]
+REFS     = "supabase/functions/_shared/sefaria_refs.json"
+
+# name → script, args, after (dependencies), inputs and outputs (globs relative to the root)
+STAGES = {
+    "migrate_siddur":       {"script": "apply_siddur_migration.py"},
+    "migrate":              {"script": "apply_migration.py", "args": ["--all"], "after": ["migrate_siddur"],
+                             "inputs": ["supabase/migrations/*.sql"]},
+    "resolve_refs":         {"script": "resolve_refs.py", "outputs": [REFS]},
+    "download_commentaries": {"script": "download_commentaries.py", "after": ["resolve_refs"],
+                              "inputs": [REFS], "outputs": [SEFARIA]},
+    "download_siddur":      {"script": "download_siddur.py", "outputs": [SIDDUR]},
+    "download_tehillim":    {"script": "download_tehillim.py", "outputs": [TEHILLIM]},
+    "download_neviim":      {"script": "download_neviim.py", "outputs": NEVIIM},
+    "upload_commentaries":  {"script": "upload_commentaries.py", "args": ["--force"],
+                             "after": ["migrate", "download_commentaries"], "inputs": [SEFARIA]},
+    "upload_siddur":        {"script": "upload_siddur.py", "args": ["--force"],
+                             "after": ["migrate", "download_siddur"], "inputs": [SIDDUR]},
+    "upload_tehillim":      {"script": "upload_tehillim_db.py", "after": ["migrate", "download_tehillim"],
+                             "inputs": [TEHILLIM]},
+    "build_related":        {"script": "build_related.py",
+                             "after": ["download_commentaries", "download_neviim", "download_tehillim"],
+                             "inputs": NEVIIM + [TEHILLIM, SEFARIA],
+                             "outputs": ["src/data/related_pesukim.json"]},
+    "og_images":            {"script": "generate_og_images.py",
+                             "after": ["download_neviim", "download_tehillim", "download_siddur"],
+                             "inputs": NEVIIM + [TEHILLIM, SIDDUR, "src/utils/parshaStartPositions.ts"],
+                             "outputs": ["og-cards/manifest.json"]},
+    "pack_corpus":          {"script": "pack_corpus.py", "args": ["build"],
+                             "after": ["download_commentaries", "download_neviim", "download_tehillim",
+                                       "download_siddur", "build_related"],
+                             "inputs": ["src/data/**/*.json"], "outputs": ["build/corpus.zpk"]},
+    "verify_uploads":       {"script": "verify_uploads.py", "args": ["--check-only"],
+                             "after": ["upload_commentaries", "upload_siddur", "upload_tehillim"],
+                             "inputs": [SEFARIA, SIDDUR, TEHILLIM]},
+}
+
+
+# ── Graph ─────────────────────────────────────────────────────────────────────
+
+def closure(targets: list[str]) -> list[str]:
+    """targets plus everything they depend on, in a valid run order."""
+    order, seen = [], set()
+
+    def visit(name: str, path: tuple):
+        if name in path:
+            raise SystemExit(f"✗ dependency cycle: {' → '.join(path + (name,))}")
+        if name in seen:
+            return
+        for dep in STAGES[name].get("after", []):
+            visit(dep, path + (name,))
+        seen.add(name)
+        order.append(name)
+
+    for t in targets:
+        visit(t, ())
+    return order
+
+
+# ── Input hashing ─────────────────────────────────────────────────────────────
+
+class State:
+    """Per-stage input digests of the last successful run, plus a (size, mtime) → sha256 file cache."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.stages: dict[str, str] = {}
+        self.files: dict[str, list] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                if data.get("version") == STATE_VERSION:
+                    self.stages, self.files = data["stages"], data["files"]
+            except (OSError, ValueError, KeyError):
+                print(f"⚠ unreadable {path.name} — every stage counts as changed")
+        self.lock = threading.Lock()
+
+    def file_sha(self, path: Path) -> str:
+        rel = path.relative_to(ROOT).as_posix()
+        st = path.stat()
+        with self.lock:
+            cached = self.files.get(rel)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        with self.lock:
+            self.files[rel] = [st.st_size, st.st_mtime_ns, h.hexdigest()]
+        return h.hexdigest()
+
+    def digest(self, name: str) -> str:
+        stage = STAGES[name]
+        files = [SCRIPTS / stage["script"]] + expand(stage.get("inputs", []))
+        blob = json.dumps({
+            "args": stage.get("args", []),
+            "files": {p.relative_to(ROOT).as_posix(): self.file_sha(p) for p in files if p.is_file()},
+        }, sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+    def save(self):
+        data = {"version": STATE_VERSION, "stages": dict(sorted(self.stages.items())),
+                "files": dict(sorted(self.files.items()))}
+        self.path.write_text(json.dumps(data, indent=1) + "\n", encoding="utf-8")
+
+
+def expand(patterns: list[str]) -> list[Path]:
+    return sorted({p for pattern in patterns for p in ROOT.glob(pattern)})
+
+
+def outputs_missing(name: str) -> list[str]:
+    return [o for o in STAGES[name].get("outputs", []) if not any(ROOT.glob(o))]
+
+
+def why_run(name: str, state: State, ran: set[str], force: set[str]) -> str | None:
+    """Reason the stage must run, or None if it is up to date."""
+    if name in force:
+        return "forced"
+    if name not in state.stages:
+        return "never run"
+    missing = outputs_missing(name)
+    if missing:
+        return f"missing {missing[0]}"
+    deps = [d for d in STAGES[name].get("after", []) if d in ran]
+    if deps:
+        return f"{deps[0]} ran"
+    if state.digest(name) != state.stages[name]:
+        return "inputs changed"
+    return None
+
+
+# ── Running ───────────────────────────────────────────────────────────────────
+
+print_lock = threading.Lock()
+
+
+def run_stage(name: str) -> tuple[int, float]:
+    """Run one stage's script, prefixing its output; returns (exit code, seconds)."""
+    stage = STAGES[name]
+    cmd = [sys.executable, "-u", str(SCRIPTS / stage["script"]), *stage.get("args", [])]
+    started = time.monotonic()
+    env = {**os.environ, "PYTHONIOENCODING": "utf-8"}
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            stdin=subprocess.DEVNULL, text=True, encoding="utf-8", errors="replace")
+    for line in proc.stdout:
+        with print_lock:
+            print(f"  [{name}] {line.rstrip()}")
+    return proc.wait(), time.monotonic() - started
+
+
+def build(order: list[str], state: State, force: set[str], jobs: int, dry_run: bool) -> list[str]:
+    """Run the stages in order, concurrently where the graph allows; returns failed stages."""
+    done, ran, failed, blocked = set(), set(), [], []
+    pending = list(order)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for name in list(pending):
+                deps = STAGES[name].get("after", [])
+                if any(d in failed or d in blocked for d in deps):
+                    pending.remove(name)
+                    blocked.append(name)
+                    print(f"  · {name:22s} blocked (a dependency failed)")
+                    continue
+                if not all(d in done for d in deps) or len(running) >= jobs:
+                    continue
+                pending.remove(name)
+                reason = why_run(name, state, ran, force)
+                if reason is None:
+                    print(f"  ✓ {name:22s} up to date")
+                    done.add(name)
+                elif dry_run:
+                    print(f"  ↻ {name:22s} would run ({reason})")
+                    done.add(name)
+                    ran.add(name)
+                else:
+                    print(f"  ▶ {name:22s} {reason}")
+                    running[pool.submit(run_stage, name)] = name
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                code, seconds = future.result()
+                if code == 0:
+                    state.stages[name] = state.digest(name)
+                    state.save()
+                    done.add(name)
+                    ran.add(name)
+                    print(f"  ✓ {name:22s} done ({seconds:.0f}s)")
+                else:
+                    failed.append(name)
+                    print(f"  ✗ {name:22s} exit {code} ({seconds:.0f}s)")
+    return failed + blocked
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the data build as a dependency graph of stages.")
+    parser.add_argument("targets", nargs="*", help="stages to bring up to date (default: all)")
+    parser.add_argument("--force", nargs="*", metavar="STAGE",
+                        help="re-run these stages (no names: every selected stage)")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="stages to run at once")
+    parser.add_argument("--dry-run", action="store_true", help="show what would run and why")
+    parser.add_argument("--list", action="store_true", help="print the stages and exit")
+    args = parser.parse_args()
+
+    unknown = [t for t in args.targets + (args.force or []) if t not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s) {unknown}; see --list")
+
+    if args.list:
+        for name, stage in STAGES.items():
+            after = ", ".join(stage.get("after", [])) or "—"
+            print(f"  {name:22s} {stage['script']:28s} after: {after}")
+        return
+
+    order = closure(args.targets or list(STAGES))
+    force = set(order) if args.force == [] else set(args.force or [])
+    state = State(STATE_PATH)
+
+    print(f"{len(order)} stage(s), up to {args.jobs} at once{' (dry run)' if args.dry_run else ''}\n")
+    started = time.monotonic()
+    failed = build(order, state, force, max(1, args.jobs), args.dry_run)
+
+    print(f"\n{'='*60}")
+    if failed:
+        print(f"✗ {len(failed)} stage(s) failed or blocked: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"✓ Done in {time.monotonic() - started:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+build_related.py
+Offline "related pesukim" index: every pasuk in src/data is vectorized with
+TF-IDF over normalized Hebrew, and its top-k nearest neighbours (cosine) are
+written to a small lookup table the app reads directly — no network, no LLM.
+
+A pasuk's document is its own text plus the commentary on it:
+    Nevi'im / Esther   pesukim from src/data/*.json (Hebrew payload)
+    Tehillim           lines of src/data/tehillim.json
+    Torah              commentary chunks from src/data/sefaria (the Torah text
+                       itself isn't bundled, so the commentaries stand in for it)
+Commentary is added at COMMENTARY_WEIGHT so it informs, but doesn't swamp,
+the verse's own words.
+
+Normalization: HTML and entities stripped, nikud / cantillation removed,
+abbreviation quotes dropped, maqaf and punctuation split words, final letters
+folded (ך→כ ...).
+Terms in fewer than MIN_DF or more than MAX_DF_RATIO of the documents are
+dropped; tf is sublinear (1 + log), rows are L2-normalized, so X @ X.T is
+cosine similarity.  Neighbours are computed BATCH rows at a time as sparse
+products, each batch densified only to pick its top k.
+
+Output: src/data/related_pesukim.json
+    {"format": 1, "k": K,
+     "refs": ["102.1.1", "tehillim.23.1", ...],      <sefer_id|tehillim>.<perek>.<pasuk>
+     "neighbours": [[j, ...], ...],                  indexes into refs, best first
+     "scores": [[87, ...], ...]}                     cosine × 100
+
+Usage:
+    python scripts/build_related.py [--k 8] [--out PATH]
+    python scripts/build_related.py --show 102.1.1
+
+Requirements: pip install numpy scipy
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+import download_commentaries as commentaries
+import download_neviim as neviim
+
+DATA_DIR = Path(__file__).parent.parent / "src" / "data"
+OUT_PATH = DATA_DIR / "related_pesukim.json"
+
+INDEX_FORMAT      = 1
+K                 = 8
+BATCH             = 512
+MIN_DF            = 2
+MAX_DF_RATIO      = 0.25
+COMMENTARY_WEIGHT = 0.5
+
+FINALS   = str.maketrans("ךםןףץ", "כמנפצ")
+TAG      = re.compile(r"<[^>]*>")
+ENTITY   = re.compile(r"&[#\w]+;")
+MARKS    = re.compile(r"[֑-ׇ]")
+QUOTES   = re.compile(r"[\"'׳״]")       # רש"י, ע' stay one word
+NON_WORD = re.compile(r"[^א-ת]+")
+
+
+def sparse():
+    try:
+        import scipy.sparse
+    except ImportError:
+        print("scipy not found. Install with: pip install scipy")
+        sys.exit(1)
+    return scipy.sparse
+
+
+# ── Documents ─────────────────────────────────────────────────────────────────
+
+def tokens(text: str) -> list[str]:
+    text = ENTITY.sub(" ", TAG.sub(" ", text))
+    text = QUOTES.sub("", MARKS.sub("", text.replace("־", " ")))
+    return [w for w in NON_WORD.split(text.translate(FINALS)) if len(w) > 1]
+
+
+def flatten(value) -> list[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [s for item in value for s in flatten(item)]
+    return []
+
+
+def collect() -> tuple[list[str], list[Counter], list[Counter]]:
+    """refs, and per ref the term counts of its own text and of its commentary."""
+    own: dict[str, Counter] = {}
+    notes: dict[str, Counter] = {}
+
+    for name in neviim.SPLIT_FILES:
+        path = DATA_DIR / f"{name}.json"
+        if not path.exists():
+            continue
+        sefer = json.loads(path.read_text(encoding="utf-8"))
+        for parsha in sefer["parshiot"]:
+            for perek in parsha["perakim"]:
+                for pasuk in perek["pesukim"]:
+                    ref = f"{sefer['sefer_id']}.{perek['perek_num']}.{pasuk['pasuk_num']}"
+                    own[ref] = Counter(tokens(pasuk["text"]))
+
+    tehillim = json.loads((DATA_DIR / "tehillim.json").read_text(encoding="utf-8"))
+    for chapter, entry in tehillim.items():
+        for i, line in enumerate(entry.get("lines", []), start=1):
+            own[f"tehillim.{chapter}.{i}"] = Counter(tokens(line))
+
+    for commentator_id, sefer_id, book_en, sefaria_ref, out_filename in commentaries.COMMENTARIES:
+        path = commentaries.OUTPUT_DIR / f"{out_filename}.json"
+        if not path.exists():
+            continue
+        text = json.loads(path.read_text(encoding="utf-8")).get("text", [])
+        for p, chapter in enumerate(text, start=1):
+            if not isinstance(chapter, list):
+                continue
+            for v, comments in enumerate(chapter, start=1):
+                words = [w for s in flatten(comments) for w in tokens(s)]
+                if words:
+                    notes.setdefault(f"{sefer_id}.{p}.{v}", Counter()).update(words)
+
+    refs = sorted(set(own) | set(notes), key=sort_key)
+    return refs, [own.get(r, Counter()) for r in refs], [notes.get(r, Counter()) for r in refs]
+
+
+def sort_key(ref: str):
+    book, perek, pasuk = ref.split(".")
+    return (1000 if book == "tehillim" else int(book), int(perek), int(pasuk))
+
+
+# ── TF-IDF ────────────────────────────────────────────────────────────────────
+
+def count_matrix(docs: list[Counter], vocab: dict[str, int]):
+    indptr, indices, data = [0], [], []
+    for counts in docs:
+        for term, n in counts.items():
+            j = vocab.get(term)
+            if j is not None:
+                indices.append(j)
+                data.append(1.0 + np.log(n))
+        indptr.append(len(indices))
+    return sparse().csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32),
+         np.asarray(indptr, dtype=np.int64)),
+        shape=(len(docs), len(vocab)))
+
+
+def l2_normalize(m):
+    norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse().diags(1.0 / norms).astype(np.float32) @ m
+
+
+def vectorize(own: list[Counter], notes: list[Counter]):
+    df = Counter()
+    for a, b in zip(own, notes):
+        df.update(set(a) | set(b))
+    n_docs = len(own)
+    vocab_terms = sorted(t for t, n in df.items() if MIN_DF <= n <= MAX_DF_RATIO * n_docs)
+    vocab = {t: j for j, t in enumerate(vocab_terms)}
+    idf = np.asarray([np.log(n_docs / df[t]) + 1.0 for t in vocab_terms], dtype=np.float32)
+    weight = sparse().diags(idf)
+
+    text = l2_normalize(count_matrix(own, vocab) @ weight)
+    comm = l2_normalize(count_matrix(notes, vocab) @ weight)
+    return l2_normalize(text + COMMENTARY_WEIGHT * comm).tocsr(), len(vocab)
+
+
+# ── Neighbours ────────────────────────────────────────────────────────────────
+
+def nearest(x, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """(indexes, similarities), each n × k, best first; self excluded."""
+    n = x.shape[0]
+    k = min(k, n - 1)
+    xt = x.T.tocsr()
+    idx = np.zeros((n, k), dtype=np.int32)
+    sim = np.zeros((n, k), dtype=np.float32)
+    for start in range(0, n, BATCH):
+        stop = min(start + BATCH, n)
+        block = (x[start:stop] @ xt).toarray()
+        block[np.arange(stop - start), np.arange(start, stop)] = -1.0
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        top_sim = np.take_along_axis(block, top, axis=1)
+        order = np.argsort(-top_sim, axis=1)
+        idx[start:stop] = np.take_along_axis(top, order, axis=1)
+        sim[start:stop] = np.take_along_axis(top_sim, order, axis=1)
+    return idx, sim
+
+
+def build(k: int, out: Path):
+    started = time.monotonic()
+    refs, own, notes = collect()
+    x, n_terms = vectorize(own, notes)
+    print(f"  ✓ {len(refs)} pesukim × {n_terms} terms, {x.nnz} non-zeros "
+          f"({time.monotonic() - started:.1f}s)")
+
+    started = time.monotonic()
+    idx, sim = nearest(x, k)
+    print(f"  ✓ top-{idx.shape[1]} neighbours ({time.monotonic() - started:.1f}s)")
+
+    neighbours, scores = [], []
+    for row_idx, row_sim in zip(idx, sim):
+        keep = row_sim > 0
+        neighbours.append(row_idx[keep].tolist())
+        scores.append(np.rint(row_sim[keep] * 100).astype(int).tolist())
+    table = {"format": INDEX_FORMAT, "k": int(idx.shape[1]), "refs": refs,
+             "neighbours": neighbours, "scores": scores}
+    out.write_text(json.dumps(table, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    print(f"  ✓ {out}  {out.stat().st_size / 1024:.0f} KB")
+
+
+def show(ref: str, path: Path):
+    table = json.loads(path.read_text(encoding="utf-8"))
+    try:
+        i = table["refs"].index(ref)
+    except ValueError:
+        print(f"No pasuk {ref!r} in {path.name}")
+        sys.exit(1)
+    for j, score in zip(table["neighbours"][i], table["scores"][i]):
+        print(f"  {score:3d}  {table['refs'][j]}")
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the related-pesukim neighbour table.")
+    parser.add_argument("--k", type=int, default=K)
+    parser.add_argument("--out", type=Path, default=OUT_PATH)
+    parser.add_argument("--show", metavar="REF", help="print the neighbours of one pasuk")
+    args = parser.parse_args()
+
+    if args.show:
+        show(args.show, args.out)
+    else:
+        build(args.k, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+check_gaps.py
+Completeness index for the downloaded text data, with targeted re-fetch.
+
+Every data file is compared against the expected shape of its base book
+(chapters, and verses per chapter) from Sefaria's shape API, cached in
+scripts/sefaria_shapes.json.  Without network or cache it falls back to the
+chapter counts we already know (Torah books, NEVIIM_BOOKS, 150 Psalms).
+
+  commentaries (src/data/sefaria/*_on_*.json)
+      missing file, or chapters cut off / malformed (e.g. a 2-chapter Genesis)
+  Nevi'im (src/data/{book}.json), tehillim.json
+      missing chapters, and chapters with fewer verses than expected
+
+--fix re-fetches only the missing ranges — ranged refs such as
+"Ramban_on_Genesis.3-50", "Joshua.5-7" or "Psalms.119.100-176" — and merges
+them into the existing file in place.  Chapters Sefaria has no commentary for
+are stored as [] so they stop showing up as gaps.
+
+Usage:
+    python scripts/check_gaps.py                    # report
+    python scripts/check_gaps.py --fix              # re-fetch and merge the gaps
+    python scripts/check_gaps.py --json gaps.json   # also write the index
+    python scripts/check_gaps.py --refresh-shapes   # re-download expected shapes
+
+Requirements: pip install requests
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+import requests
+
+import download_commentaries as commentaries
+import download_neviim as neviim
+import download_tehillim as tehillim
+
+ROOT        = Path(__file__).parent.parent
+SHAPES_PATH = Path(__file__).parent / "sefaria_shapes.json"
+SHAPE_URL   = "https://www.sefaria.org/api/shape/{title}"
+
+TORAH_CHAPTERS = {"Genesis": 50, "Exodus": 40, "Leviticus": 27, "Numbers": 36, "Deuteronomy": 34}
+
+
+# ── Expected shapes ───────────────────────────────────────────────────────────
+
+def load_shapes(titles: list[str], refresh: bool = False) -> dict[str, list[int]]:
+    """{book title: [verses per chapter]}, fetching any that aren't cached yet."""
+    shapes = {}
+    if SHAPES_PATH.exists() and not refresh:
+        shapes = json.loads(SHAPES_PATH.read_text(encoding="utf-8"))
+
+    missing = [t for t in titles if t not in shapes]
+    for title in missing:
+        try:
+            r = requests.get(SHAPE_URL.format(title=title), headers=neviim.HEADERS, timeout=20)
+            r.raise_for_status()
+            data = r.json()
+            data = data[0] if isinstance(data, list) else data
+            shapes[title] = [int(n) for n in data["chapters"]]
+        except Exception as e:
+            print(f"  ⚠ shape for {title} unavailable ({type(e).__name__}) — chapter counts only")
+        time.sleep(0.1)
+
+    if missing and any(t in shapes for t in missing):
+        SHAPES_PATH.write_text(json.dumps(shapes, indent=2), encoding="utf-8")
+    return shapes
+
+
+def ranges(nums) -> list[tuple[int, int]]:
+    """[1, 2, 3, 7, 9, 10] → [(1, 3), (7, 7), (9, 10)]"""
+    runs = []
+    for n in sorted(nums):
+        if runs and n == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], n)
+        else:
+            runs.append((n, n))
+    return runs
+
+
+def span(first: int, last: int) -> str:
+    """Sefaria ref fragment: "5" or "5-7"."""
+    return f"{first}" if first == last else f"{first}-{last}"
+
+
+def format_ranges(nums) -> str:
+    return ", ".join(span(a, b) for a, b in ranges(nums))
+
+
+# ── Index ─────────────────────────────────────────────────────────────────────
+
+def targets() -> list[dict]:
+    """Every file we expect to exist, with the Sefaria ref and base book it follows."""
+    out = []
+    for commentator_id, sefer_id, book_en, sefaria_ref, out_filename in commentaries.COMMENTARIES:
+        out.append({"kind": "commentary", "path": commentaries.OUTPUT_DIR / f"{out_filename}.json",
+                    "ref": sefaria_ref, "book": book_en, "commentator": commentator_id,
+                    "chapters": TORAH_CHAPTERS[book_en]})
+    for sefer_id, he_name, en_name, slug, num_chapters in neviim.NEVIIM_BOOKS:
+        out.append({"kind": "navi", "path": neviim.OUTPUT_DIR / f"{slug.lower()}.json",
+                    "ref": slug, "book": slug, "sefer": (sefer_id, he_name, en_name),
+                    "chapters": num_chapters})
+    out.append({"kind": "tehillim", "path": tehillim.OUTPUT_FILE,
+                "ref": "Psalms", "book": "Psalms", "chapters": 150})
+    return out
+
+
+def present_verses(target: dict) -> dict[int, int] | None:
+    """{chapter: verses (or commentary entries) present}, or None if the file is missing."""
+    path = target["path"]
+    if not path.exists():
+        return None
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if target["kind"] == "commentary":
+        return {i: len(ch) for i, ch in enumerate(data.get("text", []), start=1)
+                if isinstance(ch, list)}
+    if target["kind"] == "navi":
+        return {pr["perek_num"]: len(pr["pesukim"])
+                for p in data.get("parshiot", []) for pr in p["perakim"]}
+    return {int(k): len(v.get("lines", [])) for k, v in data.items()}
+
+
+def find_gaps(target: dict, shape: list[int] | None) -> dict:
+    """Index entry for one file: missing chapters and (for base texts) short chapters."""
+    expected = len(shape) if shape else target["chapters"]
+    present = present_verses(target)
+    entry = {"file": str(target["path"].relative_to(ROOT)), "ref": target["ref"],
+             "expected_chapters": expected, "missing_file": present is None,
+             "missing_chapters": [], "short_chapters": {}}
+    if present is None:
+        entry["missing_chapters"] = list(range(1, expected + 1))
+        return entry
+
+    entry["missing_chapters"] = [ch for ch in range(1, expected + 1) if ch not in present]
+    # Commentaries legitimately skip verses, so only base texts are held to verse counts.
+    if shape and target["kind"] != "commentary":
+        entry["short_chapters"] = {
+            ch: [present[ch], shape[ch - 1]]
+            for ch in range(1, expected + 1)
+            if ch in present and present[ch] < shape[ch - 1]
+        }
+    return entry
+
+
+def is_complete(entry: dict) -> bool:
+    return not entry["missing_chapters"] and not entry["short_chapters"]
+
+
+# ── Re-fetch ──────────────────────────────────────────────────────────────────
+
+def fetch_ref(ref: str) -> dict:
+    url = f"{neviim.BASE_URL}/{ref}?context=0&pad=0"
+    print(f"    GET {url}")
+    r = requests.get(url, headers=neviim.HEADERS, timeout=60)
+    r.raise_for_status()
+    return r.json()
+
+
+def write_json(path: Path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def fix_commentary(target: dict, entry: dict):
+    if entry["missing_file"]:
+        text_arr = commentaries.fetch_text(target["ref"])
+        if text_arr and commentaries.has_content(text_arr):
+            commentaries.save_json(target["path"], target["commentator"], target["ref"], text_arr)
+        return
+
+    data = json.loads(target["path"].read_text(encoding="utf-8"))
+    text = data.get("text", [])
+    for first, last in ranges(entry["missing_chapters"]):
+        try:
+            got = fetch_ref(f"{target['ref']}.{span(first, last)}").get("he") or []
+        except Exception as e:
+            print(f"    ✗ {target['ref']}.{span(first, last)}: {e}")
+            continue
+        if first == last:
+            got = [got]
+        while len(text) < last:
+            text.append([])
+        for i, chapter in enumerate(got[:last - first + 1]):
+            text[first - 1 + i] = chapter if isinstance(chapter, list) else []
+        # chapters Sefaria has nothing for stay [] — present, just without commentary
+        for ch in range(first, last + 1):
+            if not isinstance(text[ch - 1], list):
+                text[ch - 1] = []
+        print(f"    ✓ merged chapters {span(first, last)}")
+        time.sleep(1)
+    data["text"] = text
+    write_json(target["path"], data)
+
+
+def fix_navi(target: dict, entry: dict):
+    sefer_id, he_name, en_name = target["sefer"]
+    if entry["missing_file"]:
+        data = {"sefer_id": sefer_id, "sefer_name": he_name, "english_name": en_name, "parshiot": []}
+    else:
+        data = neviim.load_sefer(target["path"].stem)
+
+    for first, last in ranges(entry["missing_chapters"]):
+        try:
+            chapters = neviim.fetch_range(target["ref"], first, last)
+        except Exception as e:
+            print(f"    ✗ {target['ref']}.{span(first, last)}: {e}")
+            continue
+        for ch, (he_verses, en_verses) in chapters.items():
+            if he_verses:
+                data["parshiot"].append(neviim.build_parsha(sefer_id, ch, he_verses, en_verses))
+        print(f"    ✓ merged chapters {span(first, last)}")
+        time.sleep(0.15)
+    data["parshiot"].sort(key=lambda p: p["perakim"][0]["perek_num"])
+
+    perakim = {pr["perek_num"]: pr for p in data["parshiot"] for pr in p["perakim"]}
+    for ch, (have, expected) in entry["short_chapters"].items():
+        ref = f"{target['ref']}.{ch}.{span(have + 1, expected)}"
+        try:
+            d = fetch_ref(ref)
+        except Exception as e:
+            print(f"    ✗ {ref}: {e}")
+            continue
+        he_verses, en_verses = neviim.flatten(d.get("he", [])), neviim.flatten(d.get("text", []))
+        perakim[ch]["pesukim"].extend(neviim.build_pesukim(sefer_id, ch, he_verses, en_verses, start=have + 1))
+        print(f"    ✓ merged {ref} ({len(he_verses)} verses)")
+        time.sleep(0.15)
+    neviim.save_sefer(target["path"].stem, data)
+
+
+def fix_tehillim(target: dict, entry: dict):
+    data = {} if entry["missing_file"] else json.loads(target["path"].read_text(encoding="utf-8"))
+
+    for first, last in ranges(entry["missing_chapters"]):
+        ref = f"Psalms.{span(first, last)}"
+        try:
+            d = fetch_ref(ref)
+        except Exception as e:
+            print(f"    ✗ {ref}: {e}")
+            continue
+        he = d.get("he", [])
+        chapters = he if first != last else [he]
+        for ch, verses in zip(range(first, last + 1), chapters):
+            lines = tehillim.flatten_text(verses)
+            if lines:
+                data[str(ch)] = {"chapter": ch, "title": d.get("heTitle") or f"תהלים פרק {ch}",
+                                 "lines": lines}
+        print(f"    ✓ merged {ref}")
+        time.sleep(0.15)
+
+    for ch, (have, expected) in entry["short_chapters"].items():
+        ref = f"Psalms.{ch}.{span(have + 1, expected)}"
+        try:
+            d = fetch_ref(ref)
+        except Exception as e:
+            print(f"    ✗ {ref}: {e}")
+            continue
+        data[str(ch)]["lines"].extend(tehillim.flatten_text(d.get("he", [])))
+        print(f"    ✓ merged {ref}")
+        time.sleep(0.15)
+
+    write_json(target["path"], dict(sorted(data.items(), key=lambda kv: int(kv[0]))))
+
+
+FIXERS = {"commentary": fix_commentary, "navi": fix_navi, "tehillim": fix_tehillim}
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def build_index(refresh_shapes: bool = False) -> list[tuple[dict, dict]]:
+    all_targets = targets()
+    shapes = load_shapes(sorted({t["book"] for t in all_targets}), refresh=refresh_shapes)
+    return [(t, find_gaps(t, shapes.get(t["book"]))) for t in all_targets]
+
+
+def print_index(index):
+    complete = 0
+    for target, entry in index:
+        if is_complete(entry):
+            complete += 1
+            continue
+        if entry["missing_file"]:
+            print(f"  ✗ {entry['file']}: file missing")
+            continue
+        parts = []
+        if entry["missing_chapters"]:
+            parts.append(f"missing chapters {format_ranges(entry['missing_chapters'])}")
+        for ch, (have, expected) in entry["short_chapters"].items():
+            parts.append(f"ch {ch}: {have}/{expected} verses")
+        print(f"  ✗ {entry['file']}: {'; '.join(parts)}")
+    print(f"\n  {complete}/{len(index)} files complete")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find and fill gaps in the downloaded text data.")
+    parser.add_argument("--fix", action="store_true", help="re-fetch missing ranges and merge them in")
+    parser.add_argument("--json", type=Path, help="write the completeness index to this file")
+    parser.add_argument("--refresh-shapes", action="store_true", help="re-download expected shapes")
+    args = parser.parse_args()
+
+    print("Completeness index\n" + "=" * 60)
+    index = build_index(args.refresh_shapes)
+    print_index(index)
+
+    if args.fix:
+        for target, entry in index:
+            if not is_complete(entry):
+                print(f"\n  Filling {entry['file']} ...")
+                FIXERS[target["kind"]](target, entry)
+        print("\nAfter fix\n" + "=" * 60)
+        index = build_index()
+        print_index(index)
+
+    if args.json:
+        write_json(args.json, [entry for _, entry in index])
+        print(f"\n  Index → {args.json}")
+
+
+if __name__ == "__main__":
+    main()
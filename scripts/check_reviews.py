@@ -1,48 +1,229 @@
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+"""
+check_reviews.py
+Keeps a local SQLite copy of the app's Google Play reviews and queries it.
+
+`sync` follows nextPageToken through the reviews list (newest first) and stops
+as soon as it reaches reviews older than the stored high-water mark, so a
+routine run only fetches what changed since the last one.  Reviews modified in
+the mark's own second are re-read and deduped on reviewId, so one that landed
+in the same second as the last sync isn't missed.  Everything else
+(`list`, `stats`) runs against the local database without touching the API.
+
+Usage:
+    python scripts/check_reviews.py                         # sync, then show the 20 newest
+    python scripts/check_reviews.py sync [--full]
+    python scripts/check_reviews.py list --rating 1-2 --version 5 --since 2026-01-01
+    python scripts/check_reviews.py stats
+    python scripts/check_reviews.py tracks                  # current releases per track
+    python scripts/check_reviews.py sync --fake http://127.0.0.1:8765
+
+Requirements: pip install requests google-auth
+"""
+import argparse
 import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+from upload_play import make_publisher
+
+DB_PATH   = Path(__file__).parent / ".play_reviews.sqlite3"
+PAGE_SIZE = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    review_id       TEXT PRIMARY KEY,
+    author          TEXT,
+    rating          INTEGER,
+    text            TEXT,
+    language        TEXT,
+    version_code    INTEGER,
+    version_name    TEXT,
+    device          TEXT,
+    android_version INTEGER,
+    modified        INTEGER NOT NULL,   -- unix seconds, latest user/developer comment
+    reply_text      TEXT,
+    raw             TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_rating   ON reviews(rating);
+CREATE INDEX IF NOT EXISTS idx_reviews_version  ON reviews(version_code);
+CREATE INDEX IF NOT EXISTS idx_reviews_modified ON reviews(modified);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def open_db(path: Path = DB_PATH) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _seconds(ts: dict | None) -> int:
+    return int((ts or {}).get("seconds", 0))
+
+
+def review_row(review: dict) -> dict:
+    """Flatten one API review resource into a reviews-table row."""
+    user, dev = {}, {}
+    for c in review.get("comments", []):
+        user = c.get("userComment", user)
+        dev = c.get("developerComment", dev)
+    return {
+        "review_id": review["reviewId"],
+        "author": review.get("authorName"),
+        "rating": user.get("starRating"),
+        "text": user.get("text", "").strip(),
+        "language": user.get("reviewerLanguage"),
+        "version_code": user.get("appVersionCode"),
+        "version_name": user.get("appVersionName"),
+        "device": user.get("device"),
+        "android_version": user.get("androidOsVersion"),
+        "modified": max(_seconds(user.get("lastModified")), _seconds(dev.get("lastModified"))),
+        "reply_text": dev.get("text"),
+        "raw": json.dumps(review, ensure_ascii=False),
+    }
+
+
+def get_high_water(conn) -> int:
+    row = conn.execute("SELECT value FROM sync_state WHERE key = 'high_water'").fetchone()
+    return int(row["value"]) if row else 0
+
+
+def sync(conn, publisher, full: bool = False) -> tuple[int, int]:
+    """
+    Pull reviews newer than the high-water mark (all of them with full=True).
+    Returns (pages fetched, reviews stored).
+    """
+    high_water = 0 if full else get_high_water(conn)
+    # Already stored at exactly the mark: the >= below re-reads them, skip those
+    at_mark = {row["review_id"] for row in conn.execute(
+        "SELECT review_id FROM reviews WHERE modified = ?", (high_water,))}
+    newest = high_water
+    pages = stored = 0
+    token = None
+    while True:
+        page = publisher.list_reviews(page_token=token, max_results=PAGE_SIZE)
+        pages += 1
+        rows = [review_row(r) for r in page.get("reviews", [])]
+        fresh = [r for r in rows if r["modified"] > high_water
+                 or (r["modified"] == high_water and r["review_id"] not in at_mark)]
+        if fresh:
+            conn.executemany(
+                "INSERT OR REPLACE INTO reviews VALUES (:review_id, :author, :rating, :text, :language, "
+                ":version_code, :version_name, :device, :android_version, :modified, :reply_text, :raw)",
+                fresh)
+            stored += len(fresh)
+            newest = max(newest, max(r["modified"] for r in fresh))
 
-KEY_FILE = r"scripts\google-play-service-account.json"
-PACKAGE  = "com.torahapp.pash"
-SCOPES   = ["https://www.googleapis.com/auth/androidpublisher"]
+        token = page.get("tokenPagination", {}).get("nextPageToken")
+        # Pages are newest first: once a page reaches below the mark,
+        # everything after it is older still.
+        if not token or any(r["modified"] < high_water for r in rows):
+            break
 
-creds   = service_account.Credentials.from_service_account_file(KEY_FILE, scopes=SCOPES)
-service = build("androidpublisher", "v3", credentials=creds)
+    conn.execute("INSERT OR REPLACE INTO sync_state VALUES ('high_water', ?)", (str(newest),))
+    conn.commit()
+    return pages, stored
 
-print("=== REVIEWS ===")
-try:
-    result = service.reviews().list(packageName=PACKAGE, maxResults=20).execute()
-    reviews = result.get("reviews", [])
-    if not reviews:
+
+def parse_date(value: str) -> int:
+    return int(datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp())
+
+
+def query_reviews(conn, rating: str | None = None, version: int | None = None,
+                  since: str | None = None, until: str | None = None, limit: int = 20) -> list:
+    """Local query; rating is "N" or "LO-HI", dates are ISO (YYYY-MM-DD)."""
+    where, params = [], []
+    if rating:
+        lo, _, hi = rating.partition("-")
+        where.append("rating BETWEEN ? AND ?")
+        params += [int(lo), int(hi or lo)]
+    if version is not None:
+        where.append("version_code = ?")
+        params.append(version)
+    if since:
+        where.append("modified >= ?")
+        params.append(parse_date(since))
+    if until:
+        where.append("modified < ?")
+        params.append(parse_date(until))
+    sql = "SELECT * FROM reviews"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY modified DESC LIMIT ?"
+    return conn.execute(sql, params + [limit]).fetchall()
+
+
+def print_reviews(rows):
+    if not rows:
         print("No reviews found.")
-    for r in reviews:
-        comments = r.get("comments", [])
-        for c in comments:
-            uc = c.get("userComment", {})
-            rating = uc.get("starRating", "?")
-            text   = uc.get("text", "")
-            print(f"\n⭐ {rating}/5")
-            print(f"   {text[:300]}")
-            dr = c.get("developerComment", {})
-            if dr:
-                print(f"   [Dev reply]: {dr.get('text','')[:200]}")
-except Exception as e:
-    print(f"Reviews error: {e}")
-
-print("\n=== APP INFO ===")
-try:
-    edit = service.edits().insert(body={}, packageName=PACKAGE).execute()
-    eid  = edit["id"]
-    
-    tracks = service.edits().tracks().list(packageName=PACKAGE, editId=eid).execute()
-    for t in tracks.get("tracks", []):
-        track_name = t.get("track")
-        for rel in t.get("releases", []):
-            vc    = rel.get("versionCodes", [])
-            status = rel.get("status")
-            print(f"  Track: {track_name} | Status: {status} | VersionCodes: {vc}")
-    
-    # Cancel edit (don't commit)
-    service.edits().delete(packageName=PACKAGE, editId=eid).execute()
-except Exception as e:
-    print(f"App info error: {e}")
+    for r in rows:
+        when = datetime.fromtimestamp(r["modified"], timezone.utc).strftime("%Y-%m-%d")
+        print(f"\n⭐ {r['rating']}/5   v{r['version_name'] or r['version_code'] or '?'}   {when}")
+        print(f"   {r['text'][:300]}")
+        if r["reply_text"]:
+            print(f"   [Dev reply]: {r['reply_text'][:200]}")
+
+
+def print_stats(conn):
+    total = conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+    print(f"=== {total} reviews stored ===")
+    print("\nBy rating:")
+    for r in conn.execute("SELECT rating, COUNT(*) n FROM reviews GROUP BY rating ORDER BY rating DESC"):
+        print(f"  ⭐ {r['rating']}: {r['n']}")
+    print("\nBy version:")
+    for r in conn.execute("SELECT version_code, version_name, COUNT(*) n, AVG(rating) avg "
+                          "FROM reviews GROUP BY version_code ORDER BY version_code DESC"):
+        print(f"  {r['version_name'] or r['version_code']}: {r['n']} reviews, avg {r['avg']:.2f}")
+
+
+def print_tracks(publisher):
+    edit_id = publisher.insert_edit()
+    try:
+        for t in publisher.list_tracks(edit_id):
+            for rel in t.get("releases", []):
+                print(f"  Track: {t.get('track')} | Status: {rel.get('status')} "
+                      f"| VersionCodes: {rel.get('versionCodes', [])}")
+    finally:
+        publisher.delete_edit(edit_id)    # read-only: never commit
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync and query Google Play reviews.")
+    parser.add_argument("command", nargs="?", default="check",
+                        choices=["check", "sync", "list", "stats", "tracks"])
+    parser.add_argument("--full", action="store_true", help="sync: ignore the high-water mark")
+    parser.add_argument("--rating", help="list: N or LO-HI, e.g. 1-2")
+    parser.add_argument("--version", type=int, help="list: appVersionCode")
+    parser.add_argument("--since", help="list: YYYY-MM-DD")
+    parser.add_argument("--until", help="list: YYYY-MM-DD (exclusive)")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    parser.add_argument("--fake", nargs="?", const="local", default=None,
+                        help="use the fake API (optionally at URL) instead of Google Play")
+    args = parser.parse_args()
+
+    conn = open_db(args.db)
+
+    if args.command in ("check", "sync"):
+        pages, stored = sync(conn, make_publisher(args.fake), full=args.full)
+        print(f"Synced: {stored} new/updated reviews ({pages} page{'s' if pages != 1 else ''})")
+
+    if args.command == "check":
+        print("\n=== REVIEWS ===")
+        print_reviews(query_reviews(conn, limit=args.limit))
+    elif args.command == "list":
+        print_reviews(query_reviews(conn, args.rating, args.version, args.since, args.until, args.limit))
+    elif args.command == "stats":
+        print_stats(conn)
+    elif args.command == "tracks":
+        print("=== APP INFO ===")
+        print_tracks(make_publisher(args.fake))
+
+
+if __name__ == "__main__":
+    main()
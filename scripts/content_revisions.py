@@ -0,0 +1,179 @@
+"""
+content_revisions.py
+Canonical per-chapter / per-section checksums, and revision stamping for the
+content change feed (migration 20261019020000_content_revisions.sql).
+
+After an upload, each chapter (commentaries, tehillim) or
+section (siddur) is reported to record_content_changes() with its checksum.
+The server hands out a new revision only when the checksum differs from the
+last one recorded for that scope, stamps the rows' `revision` column and
+appends to content_changes — so re-running an upload with unchanged data
+creates no new revisions, and clients syncing "since revision N" (see
+sync_client.py) only pull what actually changed.
+
+record_content_changes() is granted to service_role only (migration
+20261019100000), so stamping needs SUPABASE_SERVICE_ROLE_KEY; with the anon
+key it is skipped with a warning.
+
+Usage:
+    python scripts/content_revisions.py                # stamp every table from the local JSON
+    python scripts/content_revisions.py siddur         # one table
+
+Requirements: pip install requests
+"""
+import base64
+import hashlib
+import json
+import sys
+from collections import defaultdict
+
+import requests
+
+STAMP_BATCH = 500
+
+
+# ── Canonical text (must match the SQL *_checksums() — 20261019000000, 20261019110000) ─
+
+def checksum(lines: list[str]) -> str:
+    return hashlib.md5("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def json_text(value) -> str:
+    """Same text Postgres produces for jsonb::text (for arrays of strings)."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def pasuk_line(row: dict) -> str:
+    # migration 20261019110000: one line per comment
+    return f"{row['pasuk']}\t{row['comment_idx']}\t{row.get('dibur_hamatchil') or ''}\t{row['text']}"
+
+
+def comment_order(row: dict) -> tuple:
+    return row["pasuk"], row["comment_idx"]
+
+
+def siddur_line(row: dict) -> str:
+    return f"{row['section_idx']}\t{row['cat_name']}\t{row['title']}\t{json_text(row['lines'])}"
+
+
+def tehillim_line(row: dict) -> str:
+    return f"{row['title']}\t{json_text(row['lines'])}"
+
+
+def group_checksums(rows: list[dict], key, line, order) -> dict:
+    """{key: (row_count, md5)} for local rows, grouped and ordered like the SQL side."""
+    groups = defaultdict(list)
+    for row in rows:
+        groups[key(row)].append(row)
+    return {
+        k: (len(g), checksum([line(r) for r in sorted(g, key=order)]))
+        for k, g in groups.items()
+    }
+
+
+# ── Revision scopes ───────────────────────────────────────────────────────────
+
+# table → (scope columns, canonical line, row order within the scope).
+# rashi_commentary is a view of commentaries now (migration 20261019050000);
+# its entry only reads the retired scopes still in the feed.
+SCOPES = {
+    "commentaries":     (("commentator", "sefer_id", "perek"), pasuk_line, comment_order),
+    "rashi_commentary": (("sefer_id", "perek"), pasuk_line, comment_order),
+    "siddur":           (("nusach", "category", "section_idx"), siddur_line,
+                         lambda r: r["section_idx"]),
+    "tehillim":         (("chapter",), tehillim_line,
+                         lambda r: r["chapter"]),
+}
+
+RETIRED = {"rashi_commentary"}
+
+
+def scope_changes(table: str, rows: list[dict]) -> list[dict]:
+    """One {table, scope, checksum} change per chapter/section in rows."""
+    columns, line, order = SCOPES[table]
+    key = lambda r: tuple(r[c] for c in columns)
+    return [
+        {"table": table, "scope": dict(zip(columns, k)), "checksum": digest}
+        for k, (_, digest) in sorted(group_checksums(rows, key, line, order).items())
+    ]
+
+
+def deleted_change(table: str, scope: dict) -> dict:
+    return {"table": table, "scope": scope, "checksum": None}
+
+
+def key_role(headers: dict) -> str:
+    """The role claim of the JWT in headers ("anon", "service_role", ...); "" if unreadable."""
+    if headers.get("apikey", "").startswith("sb_secret_"):
+        return "service_role"
+    try:
+        payload = headers["apikey"].split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return claims.get("role", "")
+    except (KeyError, IndexError, ValueError):
+        return ""
+
+
+def stamp(changes: list[dict], supabase_url: str, headers: dict) -> int | None:
+    """Record changes; returns how many got a new revision (None on error)."""
+    if key_role(headers) != "service_role":
+        print("    ⚠ Revision stamping needs SUPABASE_SERVICE_ROLE_KEY — skipped "
+              "(set it and run  python scripts/content_revisions.py)")
+        return None
+    new = 0
+    for start in range(0, len(changes), STAMP_BATCH):
+        r = requests.post(f"{supabase_url}/rest/v1/rpc/record_content_changes", headers=headers,
+                          json={"p_changes": changes[start:start + STAMP_BATCH]}, timeout=120)
+        if r.status_code != 200:
+            print(f"    ✗ Revision stamp error {r.status_code}: {r.text[:300]}")
+            return None
+        new += int(r.json())
+    return new
+
+
+def stamp_rows(table: str, rows: list[dict], supabase_url: str, headers: dict):
+    """Stamp every scope in rows and print a one-line summary."""
+    changes = scope_changes(table, rows)
+    new = stamp(changes, supabase_url, headers)
+    if new is not None:
+        print(f"      ↑ {new} of {len(changes)} {table} scope(s) got a new revision")
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def local_rows(table: str) -> list[dict]:
+    """Rows the upload scripts would send for a table, from the local JSON."""
+    if table == "commentaries":
+        import upload_commentaries as m
+        return [r for c, s, p in m.ALL_FILES for r in m.load_rows(c, s, p)[0]]
+    if table == "siddur":
+        import upload_siddur as m
+        rows = []
+        for nusach in m.NUSACHIM:
+            path = m.DATA_DIR / f"siddur_{nusach}.json"
+            if path.exists():
+                with open(path, encoding="utf-8") as f:
+                    rows.extend(m.build_rows(nusach, json.load(f)))
+        return rows
+    import upload_tehillim_db as m
+    with open(m.TEHILLIM_PATH, encoding="utf-8") as f:
+        return m.build_rows(json.load(f))
+
+
+def main():
+    import upload_commentaries as config
+
+    stamped = [t for t in SCOPES if t not in RETIRED]
+    tables = sys.argv[1:] or stamped
+    for table in tables:
+        if table not in stamped:
+            print(f"Unknown table: {table}. Valid: {stamped}")
+            sys.exit(1)
+
+    for table in tables:
+        print(f"\n  {table}")
+        stamp_rows(table, local_rows(table), config.SUPABASE_URL, config.HEADERS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+data_delta.py
+Delta packages between two releases of the bundled data set (src/data), so an
+over-the-air data update downloads the few chapters that changed instead of
+the whole 35+ MB corpus.
+
+A package is a zip with:
+    manifest.json        base/target tree digests, and per file: action,
+                         base and target sha256
+    patches/<path>.json  structured diff of a JSON file: ops that replace whole
+                         chapters / sections (any node ≤ UNIT_BYTES is replaced
+                         as a unit, larger dicts and lists are recursed into)
+    files/<path>         full bytes for new files, or where a patch would not
+                         be smaller
+
+apply checks every base file's hash first, builds every result in memory and
+checks it against the target hash, and only then writes anything.
+
+Usage:
+    python scripts/data_delta.py build OLD NEW -o delta.zip   # OLD/NEW: directory or git:<rev>
+    python scripts/data_delta.py build git:v1.4.0 src/data -o data-1.4.0-1.4.1.zip
+    python scripts/data_delta.py apply delta.zip src/data [--dry-run]
+    python scripts/data_delta.py info delta.zip
+"""
+import argparse
+import hashlib
+import io
+import json
+import subprocess
+import sys
+import tarfile
+import zipfile
+from pathlib import Path
+
+DELTA_FORMAT = 1
+UNIT_BYTES   = 4096
+DATA_REL     = "src/data"
+ROOT         = Path(__file__).parent.parent
+
+
+# ── Inputs ────────────────────────────────────────────────────────────────────
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_tree(spec: str) -> dict[str, bytes]:
+    """{relative path: bytes} of every .json under a directory or a git revision's src/data."""
+    if spec.startswith("git:"):
+        archive = subprocess.run(["git", "archive", spec[4:], DATA_REL], cwd=ROOT,
+                                 capture_output=True, check=True).stdout
+        tree = {}
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            for member in tar.getmembers():
+                if member.isfile() and member.name.endswith(".json"):
+                    tree[member.name[len(DATA_REL) + 1:]] = tar.extractfile(member).read()
+        return tree
+    base = Path(spec)
+    return {
+        p.relative_to(base).as_posix(): p.read_bytes()
+        for p in sorted(base.rglob("*.json"))
+        if not any(part.startswith(".") for part in p.relative_to(base).parts)
+    }
+
+
+def tree_digest(hashes: dict[str, str]) -> str:
+    return sha256("".join(f"{path}\t{h}\n" for path, h in sorted(hashes.items())).encode("utf-8"))
+
+
+# ── Structured diff ───────────────────────────────────────────────────────────
+
+def encoded_size(value) -> int:
+    return len(json.dumps(value, ensure_ascii=False))
+
+
+def diff(old, new, path: list, ops: list):
+    """Append ops turning old into new, replacing nodes ≤ UNIT_BYTES as a whole."""
+    if old == new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict) and encoded_size(new) > UNIT_BYTES:
+        kept_order = [k for k in old if k in new] + [k for k in new if k not in old]
+        if kept_order == list(new):           # key order survives, so recurse
+            for k in old:
+                if k not in new:
+                    ops.append({"op": "del", "path": path + [k]})
+            for k, v in new.items():
+                if k in old:
+                    diff(old[k], v, path + [k], ops)
+                else:
+                    ops.append({"op": "set", "path": path + [k], "value": v})
+            return
+    if isinstance(old, list) and isinstance(new, list) and encoded_size(new) > UNIT_BYTES:
+        for i in range(min(len(old), len(new))):
+            diff(old[i], new[i], path + [i], ops)
+        for i in range(len(old), len(new)):
+            ops.append({"op": "set", "path": path + [i], "value": new[i]})
+        if len(new) < len(old):
+            ops.append({"op": "truncate", "path": path, "length": len(new)})
+        return
+    ops.append({"op": "set", "path": path, "value": new})
+
+
+def apply_ops(doc, ops: list):
+    """Apply diff() ops to a parsed JSON document; returns the new document."""
+    for op in ops:
+        path = op["path"]
+        if op["op"] == "truncate":
+            target = doc
+            for key in path:
+                target = target[key]
+            del target[op["length"]:]
+            continue
+        if not path:
+            doc = op["value"]
+            continue
+        parent = doc
+        for key in path[:-1]:
+            parent = parent[key]
+        key = path[-1]
+        if op["op"] == "set":
+            if isinstance(parent, list) and key == len(parent):
+                parent.append(op["value"])
+            else:
+                parent[key] = op["value"]
+        elif op["op"] == "del":
+            del parent[key]
+        else:
+            raise ValueError(f"unknown op {op['op']!r}")
+    return doc
+
+
+# ── Serialization ─────────────────────────────────────────────────────────────
+
+FORMATS = [
+    {"indent": 2, "ensure_ascii": False},
+    {"indent": None, "ensure_ascii": False},
+    {"indent": 2, "ensure_ascii": True},
+    {"indent": None, "ensure_ascii": True},
+    {"indent": 4, "ensure_ascii": False},
+]
+
+
+def serialize(doc, fmt: dict) -> bytes:
+    text = json.dumps(doc, ensure_ascii=fmt["ensure_ascii"], indent=fmt["indent"])
+    return (text + fmt.get("trailer", "")).encode("utf-8")
+
+
+def detect_format(doc, raw: bytes) -> dict | None:
+    """The json.dump settings that reproduce raw exactly, if any."""
+    for fmt in FORMATS:
+        for trailer in ("", "\n"):
+            candidate = {**fmt, "trailer": trailer}
+            if serialize(doc, candidate) == raw:
+                return candidate
+    return None
+
+
+# ── Build ─────────────────────────────────────────────────────────────────────
+
+def build(old_spec: str, new_spec: str, out: Path):
+    old_tree, new_tree = read_tree(old_spec), read_tree(new_spec)
+    old_hashes = {p: sha256(b) for p, b in old_tree.items()}
+    new_hashes = {p: sha256(b) for p, b in new_tree.items()}
+
+    manifest = {
+        "format": DELTA_FORMAT,
+        "base_tree": tree_digest(old_hashes),
+        "target_tree": tree_digest(new_hashes),
+        "files": [],
+    }
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+        for path in sorted(set(old_tree) | set(new_tree)):
+            entry = {"path": path,
+                     "base_sha256": old_hashes.get(path),
+                     "target_sha256": new_hashes.get(path)}
+            if path not in new_tree:
+                entry["action"] = "delete"
+            elif path not in old_tree:
+                entry["action"] = "add"
+                zf.writestr(f"files/{path}", new_tree[path])
+            elif old_hashes[path] == new_hashes[path]:
+                continue
+            else:
+                patch = make_patch(old_tree[path], new_tree[path])
+                if patch is not None and len(patch) < len(new_tree[path]) // 2:
+                    entry["action"] = "patch"
+                    zf.writestr(f"patches/{path}.json", patch)
+                else:
+                    entry["action"] = "replace"
+                    zf.writestr(f"files/{path}", new_tree[path])
+            manifest["files"].append(entry)
+        zf.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2))
+
+    full = sum(len(b) for b in new_tree.values())
+    print(f"  {len(manifest['files'])} file(s) changed of {len(new_tree)}")
+    for entry in manifest["files"]:
+        print(f"    {entry['action']:8s} {entry['path']}")
+    print(f"  Package: {out}  {out.stat().st_size / 1024:.1f} KB "
+          f"(full data set: {full / (1024 * 1024):.1f} MB)")
+
+
+def make_patch(old_raw: bytes, new_raw: bytes) -> bytes | None:
+    """Encoded patch, or None if the result can't be reproduced byte-for-byte."""
+    try:
+        old_doc, new_doc = json.loads(old_raw), json.loads(new_raw)
+    except ValueError:
+        return None
+    fmt = detect_format(new_doc, new_raw)
+    if fmt is None:
+        return None
+    ops = []
+    diff(old_doc, new_doc, [], ops)
+    if serialize(apply_ops(json.loads(old_raw), ops), fmt) != new_raw:
+        return None
+    return json.dumps({"format": fmt, "ops": ops}, ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+# ── Apply ─────────────────────────────────────────────────────────────────────
+
+def apply(package: Path, data_dir: Path, dry_run: bool = False) -> bool:
+    with zipfile.ZipFile(package) as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+        if manifest["format"] != DELTA_FORMAT:
+            print(f"  ✗ unsupported delta format {manifest['format']}")
+            return False
+
+        results: dict[Path, bytes | None] = {}
+        for entry in manifest["files"]:
+            path = data_dir / entry["path"]
+            if entry["base_sha256"] is not None:
+                if not path.exists() or sha256(path.read_bytes()) != entry["base_sha256"]:
+                    print(f"  ✗ {entry['path']}: not the base version this delta was built from")
+                    return False
+            elif path.exists() and sha256(path.read_bytes()) != entry["target_sha256"]:
+                print(f"  ✗ {entry['path']}: exists but isn't expected")
+                return False
+
+            if entry["action"] == "delete":
+                results[path] = None
+                continue
+            if entry["action"] == "patch":
+                patch = json.loads(zf.read(f"patches/{entry['path']}.json"))
+                doc = apply_ops(json.loads(path.read_bytes()), patch["ops"])
+                data = serialize(doc, patch["format"])
+            else:
+                data = zf.read(f"files/{entry['path']}")
+            if sha256(data) != entry["target_sha256"]:
+                print(f"  ✗ {entry['path']}: result doesn't match target hash")
+                return False
+            results[path] = data
+
+    for path, data in results.items():
+        print(f"    {'delete' if data is None else 'write':6s} {path}")
+        if dry_run:
+            continue
+        if data is None:
+            path.unlink(missing_ok=True)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+
+    if not dry_run:
+        digest = tree_digest({p: sha256(b) for p, b in read_tree(str(data_dir)).items()})
+        if digest != manifest["target_tree"]:
+            print("  ⚠ files verified, but the data set as a whole differs from the target release "
+                  "(it had local changes outside this delta)")
+    print(f"  ✓ {len(results)} file(s) {'would be ' if dry_run else ''}updated")
+    return True
+
+
+def info(package: Path):
+    with zipfile.ZipFile(package) as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+        sizes = {i.filename: i.compress_size for i in zf.infolist()}
+    print(f"  base   {manifest['base_tree'][:16]}  →  target {manifest['target_tree'][:16]}")
+    for entry in manifest["files"]:
+        member = (f"patches/{entry['path']}.json" if entry["action"] == "patch"
+                  else f"files/{entry['path']}")
+        size = sizes.get(member, 0)
+        print(f"    {entry['action']:8s} {entry['path']:50s} {size / 1024:8.1f} KB")
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Build / apply delta packages of src/data.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build")
+    p.add_argument("old")
+    p.add_argument("new")
+    p.add_argument("-o", "--out", type=Path, required=True)
+    p = sub.add_parser("apply")
+    p.add_argument("package", type=Path)
+    p.add_argument("data_dir", type=Path)
+    p.add_argument("--dry-run", action="store_true")
+    p = sub.add_parser("info")
+    p.add_argument("package", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build(args.old, args.new, args.out)
+    elif args.command == "apply":
+        sys.exit(0 if apply(args.package, args.data_dir, args.dry_run) else 1)
+    else:
+        info(args.package)
+
+
+if __name__ == "__main__":
+    main()
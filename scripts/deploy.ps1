@@ -76,9 +76,9 @@ $pkg | ConvertTo-Json -Depth 20 | Set-Content $packageJsonPath -Encoding UTF8
 Write-Ok "Version bumped to $newName (versionCode $newCode)"
 
 # ── Step 2: Build web ────────────────────────────────────────────
-Write-Step 2 $totalSteps "Building web app (npm run build)"
+Write-Step 2 $totalSteps "Building web app (npm run build:native)"
 
-npm run build
+npm run build:native
 if ($LASTEXITCODE -ne 0) { Write-Err "Web build failed" }
 Write-Ok "Web build complete"
 
@@ -23,6 +23,8 @@ import re
 import requests
 from pathlib import Path
 
+import resolve_refs
+
 OUTPUT_DIR = Path(__file__).parent.parent / "src" / "data" / "sefaria"
 
 BOOKS = [
@@ -33,24 +35,19 @@ BOOKS = [
     (5, "Deuteronomy"),
 ]
 
-# Sefaria text refs for each commentator + book
-# Format: (commentator_id, sefer_id, english_book, sefaria_ref)
+# Sefaria text refs for each commentator + book, from the resolved-title table
+# (scripts/resolve_refs.py) — e.g. Chizkuni is "Chizkuni,_Genesis" on Sefaria.
+# Books Sefaria was found not to have are left out.
+# Format: (commentator_id, sefer_id, english_book, sefaria_ref, out_filename)
 COMMENTARIES = []
 for sefer_id, book_en in BOOKS:
-    for commentator_id, sefaria_name_tmpl, out_name_tmpl in [
-        # Standard "X_on_Book" format
-        ("Rashi",       "Rashi_on_{book}",      "Rashi_on_{book}"),
-        ("Ramban",      "Ramban_on_{book}",      "Ramban_on_{book}"),
-        ("Ibn_Ezra",    "Ibn_Ezra_on_{book}",    "Ibn_Ezra_on_{book}"),
-        ("Sforno",      "Sforno_on_{book}",      "Sforno_on_{book}"),
-        ("Or_HaChaim",  "Or_HaChaim_on_{book}",  "Or_HaChaim_on_{book}"),
-        ("Kli_Yakar",   "Kli_Yakar_on_{book}",   "Kli_Yakar_on_{book}"),
-        ("Malbim",      "Malbim_on_{book}",      "Malbim_on_{book}"),
-        # Chizkuni uses "Chizkuni,_Book" format on Sefaria
-        ("Chizkuni",    "Chizkuni%2C_{book}",    "Chizkuni_on_{book}"),
-    ]:
-        sefaria_ref = sefaria_name_tmpl.format(book=book_en)
-        out_filename = out_name_tmpl.format(book=book_en)
+    for commentator_id in ["Rashi", "Ramban", "Ibn_Ezra", "Sforno", "Or_HaChaim",
+                           "Kli_Yakar", "Malbim", "Chizkuni"]:
+        title = resolve_refs.resolved(commentator_id, book_en)
+        if title is None:
+            continue
+        sefaria_ref = resolve_refs.url_ref(title)
+        out_filename = f"{commentator_id}_on_{book_en}"
         COMMENTARIES.append((commentator_id, sefer_id, book_en, sefaria_ref, out_filename))
 
 
@@ -1,9 +1,13 @@
 """
 download_neviim.py
 Downloads 6 Nevi'im books from Sefaria in the same JSON format as esther.json.
-Output: src/data/{book}.json  (e.g. yehoshua.json, shoftim.json, ...)
+Output: src/data/{book}.json     Hebrew  (e.g. joshua.json, judges.json, ...)
+        src/data/en/{book}.json  English, keyed by the same verse ids
 
-Format:
+The two languages are separate payloads so the app only fetches (and parses)
+the English translation when the English view is on.
+
+Hebrew:
 {
   "sefer_id": 102,
   "sefer_name": "יהושע",
@@ -16,7 +20,7 @@ Format:
         {
           "perek_num": 1,
           "pesukim": [
-            { "id": 102001001, "pasuk_num": 1, "text": "...", "text_en": "...", "content": [] },
+            { "id": 102001001, "pasuk_num": 1, "text": "..." },
             ...
           ]
         }
@@ -25,12 +29,20 @@ Format:
     ...
   ]
 }
+
+English:
+{ "sefer_id": 102, "english_name": "Joshua", "verses": { "102001001": "...", ... } }
+
+Usage:
+    python scripts/download_neviim.py            # download missing books
+    python scripts/download_neviim.py --split    # split existing files that still carry text_en
 """
-import json, time, requests
+import json, sys, time, requests
 from pathlib import Path
 
 BASE_URL   = "https://www.sefaria.org/api/texts"
 OUTPUT_DIR = Path(__file__).parent.parent / "src" / "data"
+EN_DIR     = OUTPUT_DIR / "en"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 HEADERS    = {"User-Agent": "TorahApp/1.0"}
 
@@ -44,26 +56,111 @@ NEVIIM_BOOKS = [
     (107, "מלכים ב", "II Kings",  "II_Kings", 25),
 ]
 
+# Every bundled file in this format (esther.json predates this script)
+SPLIT_FILES = ["esther"] + [slug.lower() for *_, slug, _ in NEVIIM_BOOKS]
+
+
+def flatten(val) -> list[str]:
+    if isinstance(val, str):
+        return [val.strip()] if val.strip() else []
+    if isinstance(val, list):
+        out = []
+        for item in val:
+            out.extend(flatten(item))
+        return out
+    return []
+
 
 def fetch_chapter(sefaria_slug: str, chapter: int) -> tuple[list[str], list[str]]:
     """Return (hebrew_verses, english_verses) for a single chapter."""
     url = f"{BASE_URL}/{sefaria_slug}.{chapter}?context=0&pad=0"
     r   = requests.get(url, headers=HEADERS, timeout=20)
+    r.raise_for_status()
     d   = r.json()
+    return flatten(d.get("he", [])), flatten(d.get("text", []))
+
+
+def fetch_range(sefaria_slug: str, first: int, last: int) -> dict[int, tuple[list[str], list[str]]]:
+    """Chapters first..last in one ranged request → {chapter: (hebrew_verses, english_verses)}."""
+    if first == last:
+        return {first: fetch_chapter(sefaria_slug, first)}
+    url = f"{BASE_URL}/{sefaria_slug}.{first}-{last}?context=0&pad=0"
+    r   = requests.get(url, headers=HEADERS, timeout=60)
+    r.raise_for_status()
+    d   = r.json()
+    he, en = d.get("he", []), d.get("text", [])
+    return {
+        ch: (flatten(he[i]) if i < len(he) else [], flatten(en[i]) if i < len(en) else [])
+        for i, ch in enumerate(range(first, last + 1))
+    }
+
+
+def build_pesukim(sefer_id: int, ch: int, he_verses: list[str], en_verses: list[str],
+                  start: int = 1) -> list[dict]:
+    """Pasuk objects for verses numbered from `start`."""
+    pesukim = []
+    for i, he in enumerate(he_verses, start=start):
+        en = en_verses[i - start] if i - start < len(en_verses) else ""
+        pesukim.append({
+            "id":       sefer_id * 1_000_000 + ch * 1000 + i,
+            "pasuk_num": i,
+            "text":     he,
+            "text_en":  en,
+        })
+    return pesukim
+
+
+def build_parsha(sefer_id: int, ch: int, he_verses: list[str], en_verses: list[str]) -> dict:
+    return {
+        "parsha_id":   sefer_id * 100 + ch,
+        "parsha_name": f"פרק {ch}",
+        "perakim": [{
+            "perek_num": ch,
+            "pesukim":   build_pesukim(sefer_id, ch, he_verses, en_verses),
+        }],
+    }
 
-    def flatten(val) -> list[str]:
-        if isinstance(val, str):
-            return [val.strip()] if val.strip() else []
-        if isinstance(val, list):
-            out = []
-            for item in val:
-                out.extend(flatten(item))
-            return out
-        return []
 
-    he_verses = flatten(d.get("he", []))
-    en_verses = flatten(d.get("text", []))
-    return he_verses, en_verses
+# ── Per-language payloads ─────────────────────────────────────────────────────
+
+def split_sefer(sefer: dict) -> tuple[dict, dict]:
+    """(hebrew, english) payloads of a sefer whose pesukim carry text_en."""
+    verses = {}
+    parshiot = []
+    for parsha in sefer["parshiot"]:
+        perakim = []
+        for perek in parsha["perakim"]:
+            pesukim = []
+            for pasuk in perek["pesukim"]:
+                if pasuk.get("text_en"):
+                    verses[str(pasuk["id"])] = pasuk["text_en"]
+                pesukim.append({"id": pasuk["id"], "pasuk_num": pasuk["pasuk_num"], "text": pasuk["text"]})
+            perakim.append({**perek, "pesukim": pesukim})
+        parshiot.append({**parsha, "perakim": perakim})
+    hebrew = {**sefer, "parshiot": parshiot}
+    english = {"sefer_id": sefer["sefer_id"], "english_name": sefer["english_name"], "verses": verses}
+    return hebrew, english
+
+
+def load_sefer(name: str) -> dict:
+    """Hebrew payload with text_en merged back in from the English one."""
+    with open(OUTPUT_DIR / f"{name}.json", encoding="utf-8") as f:
+        sefer = json.load(f)
+    en_path = EN_DIR / f"{name}.json"
+    verses = json.loads(en_path.read_text(encoding="utf-8"))["verses"] if en_path.exists() else {}
+    for parsha in sefer["parshiot"]:
+        for perek in parsha["perakim"]:
+            for pasuk in perek["pesukim"]:
+                pasuk.setdefault("text_en", verses.get(str(pasuk["id"]), ""))
+    return sefer
+
+
+def save_sefer(name: str, sefer: dict):
+    hebrew, english = split_sefer(sefer)
+    EN_DIR.mkdir(parents=True, exist_ok=True)
+    for path, data in ((OUTPUT_DIR / f"{name}.json", hebrew), (EN_DIR / f"{name}.json", english)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
 
 
 def download_sefer(sefer_id: int, he_name: str, en_name: str,
@@ -73,31 +170,16 @@ def download_sefer(sefer_id: int, he_name: str, en_name: str,
     print(f"{'='*55}")
 
     parshiot = []
+    failed = []
     for ch in range(1, num_chapters + 1):
         try:
             he_verses, en_verses = fetch_chapter(slug, ch)
-            pesukim = []
-            for i, he in enumerate(he_verses, start=1):
-                pasuk_id = sefer_id * 1_000_000 + ch * 1000 + i
-                en = en_verses[i - 1] if i <= len(en_verses) else ""
-                pesukim.append({
-                    "id":       pasuk_id,
-                    "pasuk_num": i,
-                    "text":     he,
-                    "text_en":  en,
-                    "content":  [],
-                })
-            parshiot.append({
-                "parsha_id":   sefer_id * 100 + ch,
-                "parsha_name": f"פרק {ch}",
-                "perakim": [{
-                    "perek_num": ch,
-                    "pesukim":   pesukim,
-                }],
-            })
-            print(f"  פרק {ch:2d}: {len(pesukim)} פסוקים")
+            parsha = build_parsha(sefer_id, ch, he_verses, en_verses)
+            parshiot.append(parsha)
+            print(f"  פרק {ch:2d}: {len(parsha['perakim'][0]['pesukim'])} פסוקים")
         except Exception as e:
             print(f"  פרק {ch:2d}: ERROR – {e}")
+            failed.append(ch)
         time.sleep(0.15)
 
     sefer = {
@@ -108,18 +190,35 @@ def download_sefer(sefer_id: int, he_name: str, en_name: str,
     }
     total = sum(len(p["perakim"][0]["pesukim"]) for p in parshiot)
     print(f"\n  סה\"כ: {total} פסוקים ב-{len(parshiot)} פרקים")
+    if failed:
+        print(f"  ✗ חסרים פרקים {failed} — להשלמה: python scripts/check_gaps.py --fix")
     return sefer
 
 
+def split_existing():
+    for name in SPLIT_FILES:
+        path = OUTPUT_DIR / f"{name}.json"
+        if not path.exists():
+            continue
+        before = path.stat().st_size
+        save_sefer(name, load_sefer(name))
+        en_size = (EN_DIR / f"{name}.json").stat().st_size
+        print(f"  ✓ {name}: {before / 1024:.0f} KB → {path.stat().st_size / 1024:.0f} KB "
+              f"+ en {en_size / 1024:.0f} KB")
+
+
 def main():
+    if "--split" in sys.argv[1:]:
+        split_existing()
+        return
+
     for sefer_id, he_name, en_name, slug, num_ch in NEVIIM_BOOKS:
         out_path = OUTPUT_DIR / f"{slug.lower()}.json"
         if out_path.exists():
             print(f"כבר קיים: {out_path.name} — מדלג")
             continue
         data = download_sefer(sefer_id, he_name, en_name, slug, num_ch)
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        save_sefer(slug.lower(), data)
         print(f"  נשמר: {out_path}")
 
     print("\n✓ הורדת כל הנביאים הסתיימה!")
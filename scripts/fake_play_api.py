@@ -0,0 +1,293 @@
+"""
+fake_play_api.py
+Local stand-in for the parts of the Google Play androidpublisher v3 API the
+publishing scripts use, so the whole upload → assign → commit flow can be run
+offline (no service account, no real edits).
+
+Implements:
+  POST   /androidpublisher/v3/applications/{pkg}/edits
+  GET    /androidpublisher/v3/applications/{pkg}/edits/{id}
+  DELETE /androidpublisher/v3/applications/{pkg}/edits/{id}
+  POST   /androidpublisher/v3/applications/{pkg}/edits/{id}:commit
+  GET    /androidpublisher/v3/applications/{pkg}/edits/{id}/tracks
+  PUT    /androidpublisher/v3/applications/{pkg}/edits/{id}/tracks/{track}
+  POST   /upload/androidpublisher/v3/applications/{pkg}/edits/{id}/bundles?uploadType=resumable
+  PUT    /upload-session/{sid}        (resumable protocol: Content-Range, 308 + Range)
+  GET    /androidpublisher/v3/applications/{pkg}/reviews?maxResults=&token=
+
+--drop-every N accepts every Nth upload chunk and then closes the connection
+without answering, to exercise retry + resume-from-offset.
+--reviews N seeds N synthetic reviews (newest first, paginated like the real
+API); state.add_review() appends newer ones for incremental-sync testing.
+
+Usage:
+    python scripts/fake_play_api.py [--port 8765] [--drop-every N] [--reviews N]
+    python scripts/upload_play.py internal --fake http://127.0.0.1:8765 --aab some.aab
+
+or in-process (what upload_play.py --fake does with no URL):
+    server, base_url = start_fake_server(drop_every=3)
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+APP = r"/androidpublisher/v3/applications/(?P<pkg>[^/]+)"
+
+
+class FakePlayState:
+    def __init__(self, drop_every: int = 0, reviews: int = 0):
+        self.lock = threading.Lock()            # handlers run one at a time
+        self.edits: dict[str, dict] = {}
+        self.sessions: dict[str, dict] = {}
+        self.tracks: dict[str, dict] = {}          # committed state, per track
+        self.bundles: list[dict] = []
+        self.next_version_code = 100
+        self.ids = itertools.count(1)
+        self.drop_every = drop_every
+        self.chunk_puts = 0
+        self.reviews: list[dict] = []              # oldest first
+        self.clock = int(time.time()) - reviews * 3600
+        for _ in range(reviews):
+            self.add_review()
+
+    def add_review(self, rating: int | None = None, text: str | None = None) -> dict:
+        """Append a review newer than every existing one (same shape as the real API)."""
+        with self.lock:
+            n = len(self.reviews) + 1
+            self.clock += 3600
+            review = {
+                "reviewId": f"fake-review-{n}",
+                "authorName": f"User {n}",
+                "comments": [{"userComment": {
+                    "text": text or f"Review number {n}",
+                    "lastModified": {"seconds": str(self.clock), "nanos": 0},
+                    "starRating": rating or (n % 5) + 1,
+                    "reviewerLanguage": "he" if n % 2 else "en",
+                    "appVersionCode": 1 + n % 4,
+                    "appVersionName": f"1.{n % 4}.0",
+                    "device": "generic",
+                    "androidOsVersion": 34,
+                }}],
+            }
+            if n % 3 == 0:
+                review["comments"].append({"developerComment": {
+                    "text": "Thanks!", "lastModified": {"seconds": str(self.clock), "nanos": 0},
+                }})
+            self.reviews.append(review)
+            return review
+
+
+class Handler(BaseHTTPRequestHandler):
+    state: FakePlayState = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    # ── plumbing ────────────────────────────────────────────────────────────
+
+    def _body(self) -> bytes:
+        n = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(n) if n else b""
+
+    def _send(self, status: int, payload=None, headers: dict | None = None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, message: str):
+        self._send(status, {"error": {"code": status, "message": message}})
+
+    def _route(self, method: str):
+        path = urlparse(self.path).path
+        for route_method, pattern, handler in ROUTES:
+            m = re.fullmatch(pattern, path)
+            if m and route_method == method:
+                with self.state.lock:
+                    return handler(self, **m.groupdict())
+        self._body()
+        self._error(404, f"no route for {method} {path}")
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_PUT(self):
+        self._route("PUT")
+
+    def do_DELETE(self):
+        self._route("DELETE")
+
+    # ── edits ───────────────────────────────────────────────────────────────
+
+    def _edit(self, edit_id):
+        edit = self.state.edits.get(edit_id)
+        if edit is None:
+            self._error(404, f"edit {edit_id} not found")
+        return edit
+
+    def post_edits(self, pkg):
+        self._body()
+        edit_id = f"fake-edit-{next(self.state.ids)}"
+        self.state.edits[edit_id] = {"tracks": {}, "bundles": []}
+        self._send(200, {"id": edit_id, "expiryTimeSeconds": "3600"})
+
+    def get_edit(self, pkg, edit_id):
+        if self._edit(edit_id) is not None:
+            self._send(200, {"id": edit_id})
+
+    def delete_edit(self, pkg, edit_id):
+        if self.state.edits.pop(edit_id, None) is None:
+            return self._error(404, f"edit {edit_id} not found")
+        self._send(204)
+
+    def post_commit(self, pkg, edit_id):
+        self._body()
+        edit = self.state.edits.pop(edit_id, None)
+        if edit is None:
+            return self._error(404, f"edit {edit_id} not found")
+        self.state.bundles.extend(edit["bundles"])
+        self.state.tracks.update(edit["tracks"])
+        self._send(200, {"id": edit_id})
+
+    def get_tracks(self, pkg, edit_id):
+        edit = self._edit(edit_id)
+        if edit is not None:
+            tracks = {**self.state.tracks, **edit["tracks"]}
+            self._send(200, {"kind": "androidpublisher#tracksListResponse",
+                             "tracks": list(tracks.values())})
+
+    def put_track(self, pkg, edit_id, track):
+        body = json.loads(self._body() or b"{}")
+        edit = self._edit(edit_id)
+        if edit is None:
+            return
+        known = {str(b["versionCode"]) for b in self.state.bundles + edit["bundles"]}
+        for rel in body.get("releases", []):
+            missing = [vc for vc in rel.get("versionCodes", []) if vc not in known]
+            if missing:
+                return self._error(400, f"unknown versionCodes {missing}")
+        edit["tracks"][track] = {"track": track, "releases": body.get("releases", [])}
+        self._send(200, edit["tracks"][track])
+
+    # ── reviews ─────────────────────────────────────────────────────────────
+
+    def get_reviews(self, pkg):
+        query = parse_qs(urlparse(self.path).query)
+        max_results = int(query.get("maxResults", ["20"])[0])
+        start = int(query.get("token", ["0"])[0])
+        newest_first = self.state.reviews[::-1]
+        page = newest_first[start:start + max_results]
+        payload = {"reviews": page}
+        if start + max_results < len(newest_first):
+            payload["tokenPagination"] = {"nextPageToken": str(start + max_results)}
+        self._send(200, payload)
+
+    # ── resumable upload ────────────────────────────────────────────────────
+
+    def post_upload(self, pkg, edit_id):
+        self._body()
+        if self._edit(edit_id) is None:
+            return
+        total = int(self.headers.get("X-Upload-Content-Length") or -1)
+        sid = f"s{next(self.state.ids)}"
+        self.state.sessions[sid] = {"edit_id": edit_id, "total": total, "data": bytearray(),
+                                    "result": None}
+        host = self.headers.get("Host")
+        self._send(200, {}, headers={"Location": f"http://{host}/upload-session/{sid}"})
+
+    def put_session(self, sid):
+        session = self.state.sessions.get(sid)
+        body = self._body()
+        if session is None:
+            return self._error(404, "upload session not found")
+
+        m = re.fullmatch(r"bytes (\*|(\d+)-(\d+))/(\d+)", self.headers.get("Content-Range", ""))
+        if not m:
+            return self._error(400, "bad Content-Range")
+        if m.group(1) == "*":                              # status query
+            return self._upload_status(session)
+
+        start, end = int(m.group(2)), int(m.group(3))
+        if start != len(session["data"]) or end - start + 1 != len(body):
+            return self._upload_status(session)            # tell client where we are
+        session["data"].extend(body)
+
+        self.state.chunk_puts += 1
+        if self.state.drop_every and self.state.chunk_puts % self.state.drop_every == 0:
+            self.close_connection = True                   # kept the bytes, lost the reply
+            return
+        self._upload_status(session)
+
+    def _upload_status(self, session):
+        received = len(session["data"])
+        if received < session["total"]:
+            headers = {"Range": f"bytes=0-{received - 1}"} if received else {}
+            return self._send(308, None, headers=headers)
+        if session["result"] is None:
+            vc = self.state.next_version_code
+            self.state.next_version_code += 1
+            bundle = {"versionCode": vc, "sha256": hashlib.sha256(session["data"]).hexdigest()}
+            edit = self.state.edits.get(session["edit_id"])
+            if edit is not None:
+                edit["bundles"].append(bundle)
+            session["result"] = bundle
+        self._send(200, session["result"])
+
+
+ROUTES = [
+    ("POST",   APP + r"/edits", Handler.post_edits),
+    ("POST",   APP + r"/edits/(?P<edit_id>[^/:]+):commit", Handler.post_commit),
+    ("GET",    APP + r"/edits/(?P<edit_id>[^/:]+)", Handler.get_edit),
+    ("DELETE", APP + r"/edits/(?P<edit_id>[^/:]+)", Handler.delete_edit),
+    ("GET",    APP + r"/edits/(?P<edit_id>[^/:]+)/tracks", Handler.get_tracks),
+    ("PUT",    APP + r"/edits/(?P<edit_id>[^/:]+)/tracks/(?P<track>[^/]+)", Handler.put_track),
+    ("GET",    APP + r"/reviews", Handler.get_reviews),
+    ("POST",   r"/upload" + APP + r"/edits/(?P<edit_id>[^/:]+)/bundles", Handler.post_upload),
+    ("PUT",    r"/upload-session/(?P<sid>[^/]+)", Handler.put_session),
+]
+
+
+def start_fake_server(port: int = 0, drop_every: int = 0, reviews: int = 0):
+    """Run the fake API in a daemon thread. Returns (server, base_url)."""
+    state = FakePlayState(drop_every=drop_every, reviews=reviews)
+    handler = type("FakePlayHandler", (Handler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake androidpublisher v3 API for offline testing.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--drop-every", type=int, default=0,
+                        help="drop the connection after every Nth upload chunk")
+    parser.add_argument("--reviews", type=int, default=0,
+                        help="seed N synthetic reviews")
+    args = parser.parse_args()
+
+    server, base_url = start_fake_server(args.port, args.drop_every, args.reviews)
+    print(f"Fake Play API listening on {base_url}  (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,12 +11,38 @@ Outputs:
   public/icon-192x192.png    - 192x192 PWA icon
   public/icon-512x512.png    - 512x512 PWA icon
   public/favicon.ico         - multi-size favicon
+  android/app/src/main/res/  - mipmap icons + splash screens for every density
+
+Each variant of the mark (light, transparent, adaptive foreground) is drawn
+once at MASTER_SIZE and every output is resampled from that master — except
+sizes where the scaled-down gold ring would be under 2px (favicon, 16–72px),
+which are drawn on their own with the ring held at 2px.  Writes
+run in a process pool; pass --jobs N to size it (--jobs 1 runs in-process).
+
+Outputs whose inputs (size, colors, font file, scale, DRAW_VERSION) are
+unchanged since the last run are skipped — see assets/.icon-manifest.json.
+Bump DRAW_VERSION whenever the drawing code changes.
+
+Every PNG goes through optimize_images.save_optimized (exact palette where
+lossless, max zlib effort, no metadata).  --webp writes the Android res
+outputs as lossless WebP instead.
+
+Usage:
+    python scripts/generate_icons.py [--jobs N] [--force] [--webp]
 """
 
+import argparse
 import os
-import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 
+from asset_manifest import AssetManifest, file_digest
+from optimize_images import OPTIMIZER_VERSION, format_saving, save_optimized
+
+# Bump when draw_circle_torah / the generate_* functions change output.
+DRAW_VERSION = 2
+
 # ── Colors ──────────────────────────────────────────────────────────────
 WHITE = (255, 255, 255)
 NAVY = (17, 42, 71)          # hsl(220, 60%, 20%) ≈ #112A47
@@ -27,12 +53,35 @@ DARK_BG = (30, 58, 95)       # #1e3a5f  (used for splash-dark)
 FONTS_DIR = os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts")
 FONT_PATH = os.path.join(FONTS_DIR, "frank.ttf")  # Frank Ruehl
 
+# ── Masters ─────────────────────────────────────────────────────────────
+# Largest output that needs the mark is the 2732 splash (icon = 2732 // 3),
+# so a 1024 master is only ever downsampled.
+MASTER_SIZE = 1024
+
+# variant → (transparent_bg, scale)
+MASTERS = {
+    "light":      (False, 1.0),   # circle on white  (icons, favicon)
+    "mark":       (True,  1.0),   # circle on transparent (pasted onto splashes)
+    "foreground": (True,  0.72),  # adaptive icon foreground, inside the safe zone
+}
 
-def draw_circle_torah(size, transparent_bg=False, scale=1.0):
+
+@lru_cache(maxsize=None)
+def load_font(font_size):
+    """Load Frank Ruehl at the given size (once per process)."""
+    try:
+        return ImageFont.truetype(FONT_PATH, font_size)
+    except (OSError, IOError):
+        print("WARNING: Could not load Frank Ruehl font, using default")
+        return ImageFont.load_default()
+
+
+def draw_circle_torah(size, transparent_bg=False, scale=1.0, min_stroke=2):
     """Draw the circle + תורה icon at given size.
     
     scale: how much of the canvas the circle occupies (0-1).
            For adaptive icons, use ~0.6 to stay in safe zone.
+    min_stroke: thinnest gold ring, in pixels of this canvas.
     """
     if transparent_bg:
         img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
@@ -45,7 +94,7 @@ def draw_circle_torah(size, transparent_bg=False, scale=1.0):
     # Circle radius: ~216/512 of size * scale
     base_ratio = 216 / 512
     r = int(size * base_ratio * scale)
-    stroke_w = max(2, int(size * 12 / 512 * scale))
+    stroke_w = max(min_stroke, int(size * 12 / 512 * scale))
     
     # White filled circle
     draw.ellipse(
@@ -57,11 +106,7 @@ def draw_circle_torah(size, transparent_bg=False, scale=1.0):
     
     # Hebrew text "תורה" - reversed because Pillow renders LTR
     font_size = int(size * 168 / 512 * scale)
-    try:
-        font = ImageFont.truetype(FONT_PATH, font_size)
-    except (OSError, IOError):
-        font = ImageFont.load_default()
-        print("WARNING: Could not load Frank Ruehl font, using default")
+    font = load_font(font_size)
     
     text = "תורה"[::-1]  # Reverse for Pillow's LTR rendering
     bbox = draw.textbbox((0, 0), text, font=font)
@@ -79,55 +124,79 @@ def draw_circle_torah(size, transparent_bg=False, scale=1.0):
     return img
 
 
-def generate_icon(size, filepath, transparent_bg=False, scale=1.0):
+@lru_cache(maxsize=None)
+def get_master(variant):
+    """Render the MASTER_SIZE master for a variant (once per process)."""
+    transparent_bg, scale = MASTERS[variant]
+    return draw_circle_torah(MASTER_SIZE, transparent_bg=transparent_bg, scale=scale)
+
+
+# Below this the ring, scaled down from the master, would be under 2px
+# (16–48px icons and favicon sizes); those are drawn on their own at
+# SMALL_SUPERSAMPLE× with the ring held at 2px of the output.
+MIN_STROKE = 2
+SMALL_SUPERSAMPLE = 4
+
+
+@lru_cache(maxsize=None)
+def draw_small(variant, size):
+    """A small output drawn on its own (supersampled) so the ring keeps MIN_STROKE."""
+    transparent_bg, scale = MASTERS[variant]
+    big = size * SMALL_SUPERSAMPLE
+    img = draw_circle_torah(big, transparent_bg=transparent_bg, scale=scale,
+                            min_stroke=MIN_STROKE * SMALL_SUPERSAMPLE)
+    return img.resize((size, size), Image.Resampling.LANCZOS)
+
+
+def resample(variant, size):
+    """Downsample a master to size x size with a high-quality filter."""
+    _, scale = MASTERS[variant]
+    if size * 12 / 512 * scale < MIN_STROKE:
+        return draw_small(variant, size).copy()
+    master = get_master(variant)
+    if size == MASTER_SIZE:
+        return master.copy()
+    return master.resize((size, size), Image.Resampling.LANCZOS)
+
+
+def generate_icon(size, filepath, variant="light"):
     """Generate and save an icon."""
-    img = draw_circle_torah(size, transparent_bg=transparent_bg, scale=scale)
-    
-    # Convert RGBA to RGB if saving as non-transparent
-    if not transparent_bg and img.mode == "RGBA":
-        bg = Image.new("RGB", img.size, WHITE)
-        bg.paste(img, mask=img.split()[3])
-        img = bg
-    
-    img.save(filepath)
-    print(f"  ✓ {filepath} ({size}x{size})")
+    img = resample(variant, size)
+    before, after = save_optimized(img, filepath)
+    return f"  ✓ {filepath} ({size}x{size})  {format_saving(before, after)}", before, after
+
+
+def generate_solid(size, filepath, color=WHITE):
+    """Generate a solid-colour square (adaptive icon background layers)."""
+    before, after = save_optimized(Image.new("RGBA", (size, size), color + (255,)), filepath)
+    return f"  ✓ {os.path.basename(filepath)} ({size}x{size})  {format_saving(before, after)}", before, after
 
 
 def generate_splash(size, filepath, dark=False):
     """Generate splash screen with centered circle + תורה on solid background."""
     bg_color = DARK_BG if dark else WHITE
-    
-    if dark:
-        img = Image.new("RGB", (size, size), bg_color)
-    else:
-        img = Image.new("RGB", (size, size), bg_color)
+    img = Image.new("RGB", (size, size), bg_color)
     
     # Draw the circle icon in the center, smaller relative to splash
     icon_size = size // 3  # Icon takes ~1/3 of splash
-    icon_img = draw_circle_torah(icon_size, transparent_bg=True)
+    icon_img = resample("mark", icon_size)
     
     # Paste centered
     offset = (size - icon_size) // 2
     img.paste(icon_img, (offset, offset), icon_img)
     
-    img.save(filepath)
-    print(f"  ✓ {filepath} ({size}x{size})")
+    before, after = save_optimized(img, filepath)
+    return f"  ✓ {filepath} ({size}x{size})  {format_saving(before, after)}", before, after
 
 
 def generate_favicon(filepath):
     """Generate multi-size .ico favicon."""
     sizes = [16, 32, 48, 64, 128, 256]
-    images = []
-    for s in sizes:
-        img = draw_circle_torah(s)
-        if img.mode == "RGBA":
-            bg = Image.new("RGB", img.size, WHITE)
-            bg.paste(img, mask=img.split()[3])
-            img = bg
-        images.append(img)
+    images = [resample("light", s) for s in sizes]
     
     images[0].save(filepath, format="ICO", sizes=[(s, s) for s in sizes], append_images=images[1:])
-    print(f"  ✓ {filepath} (favicon, {len(sizes)} sizes)")
+    written = os.path.getsize(filepath)
+    return f"  ✓ {filepath} (favicon, {len(sizes)} sizes)", written, written
 
 
 def generate_android_splash(width, height, filepath, dark=False):
@@ -135,121 +204,218 @@ def generate_android_splash(width, height, filepath, dark=False):
     bg_color = DARK_BG if dark else WHITE
     img = Image.new("RGB", (width, height), bg_color)
     
-    # Icon size: 1/4 of smallest dimension
+    # Icon size: 1/3 of smallest dimension
     icon_size = min(width, height) // 3
-    icon_img = draw_circle_torah(icon_size, transparent_bg=True)
+    icon_img = resample("mark", icon_size)
     
     ox = (width - icon_size) // 2
     oy = (height - icon_size) // 2
     img.paste(icon_img, (ox, oy), icon_img)
     
-    img.save(filepath)
-    print(f"  ✓ {os.path.basename(os.path.dirname(filepath))}/splash.png ({width}x{height})")
+    before, after = save_optimized(img, filepath)
+    name = f"{os.path.basename(os.path.dirname(filepath))}/{os.path.basename(filepath)}"
+    return f"  ✓ {name} ({width}x{height})  {format_saving(before, after)}", before, after
 
 
-def main():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    root = os.path.dirname(script_dir)
-    
+JOB_FUNCS = {
+    "icon":           generate_icon,
+    "solid":          generate_solid,
+    "splash":         generate_splash,
+    "favicon":        generate_favicon,
+    "android_splash": generate_android_splash,
+}
+
+
+def run_job(job):
+    """Worker entry point: job = (section, kind, args, kwargs) → (section, line, before, after)."""
+    section, kind, args, kwargs = job
+    return (section, *JOB_FUNCS[kind](*args, **kwargs))
+
+
+MIPMAP_SIZES = {
+    "mipmap-ldpi": 36,
+    "mipmap-mdpi": 48,
+    "mipmap-hdpi": 72,
+    "mipmap-xhdpi": 96,
+    "mipmap-xxhdpi": 144,
+    "mipmap-xxxhdpi": 192,
+}
+
+SPLASH_CONFIGS = {
+    # drawable (default)
+    "drawable": (320, 480, False),
+    "drawable-night": (320, 240, True),
+    # Portrait
+    "drawable-port-ldpi": (240, 320, False),
+    "drawable-port-mdpi": (320, 480, False),
+    "drawable-port-hdpi": (480, 800, False),
+    "drawable-port-xhdpi": (720, 1280, False),
+    "drawable-port-xxhdpi": (960, 1600, False),
+    "drawable-port-xxxhdpi": (1280, 1920, False),
+    # Portrait night
+    "drawable-port-night-ldpi": (240, 320, True),
+    "drawable-port-night-mdpi": (320, 480, True),
+    "drawable-port-night-hdpi": (480, 800, True),
+    "drawable-port-night-xhdpi": (720, 1280, True),
+    "drawable-port-night-xxhdpi": (960, 1600, True),
+    "drawable-port-night-xxxhdpi": (1280, 1920, True),
+    # Landscape
+    "drawable-land-ldpi": (320, 240, False),
+    "drawable-land-mdpi": (480, 320, False),
+    "drawable-land-hdpi": (800, 480, False),
+    "drawable-land-xhdpi": (1280, 720, False),
+    "drawable-land-xxhdpi": (1600, 960, False),
+    "drawable-land-xxxhdpi": (1920, 1280, False),
+    # Landscape night
+    "drawable-land-night-ldpi": (320, 240, True),
+    "drawable-land-night-mdpi": (480, 320, True),
+    "drawable-land-night-hdpi": (800, 480, True),
+    "drawable-land-night-xhdpi": (1280, 720, True),
+    "drawable-land-night-xxhdpi": (1600, 960, True),
+    "drawable-land-night-xxxhdpi": (1920, 1280, True),
+}
+
+
+def uses_vector_foreground(android_res):
+    """True if the adaptive icon points at the generated VectorDrawable foreground."""
+    path = os.path.join(android_res, "mipmap-anydpi-v26", "ic_launcher.xml")
+    if not os.path.exists(path):
+        return False
+    with open(path, encoding="utf-8") as f:
+        return "@drawable/ic_torah_foreground" in f.read()
+
+
+def build_jobs(root, webp=False):
+    """List every output as a picklable (section, kind, args, kwargs) job."""
     assets_dir = os.path.join(root, "assets")
     public_dir = os.path.join(root, "public")
     android_res = os.path.join(root, "android", "app", "src", "main", "res")
+    res_ext = ".webp" if webp else ".png"
     
-    print("Generating icons in circle + תורה style...\n")
+    jobs = []
     
     # ── Assets ──
-    print("Assets:")
-    generate_icon(512, os.path.join(assets_dir, "icon.png"))
-    generate_icon(512, os.path.join(assets_dir, "icon-only.png"))
-    generate_icon(512, os.path.join(assets_dir, "icon-foreground.png"), 
-                  transparent_bg=True, scale=0.72)
-    
-    bg = Image.new("RGBA", (1024, 1024), WHITE + (255,))
-    bg.save(os.path.join(assets_dir, "icon-background.png"))
-    print(f"  ✓ icon-background.png (1024x1024)")
+    section = "Assets"
+    jobs.append((section, "icon", (512, os.path.join(assets_dir, "icon.png")), {}))
+    jobs.append((section, "icon", (512, os.path.join(assets_dir, "icon-only.png")), {}))
+    jobs.append((section, "icon", (512, os.path.join(assets_dir, "icon-foreground.png")),
+                 {"variant": "foreground"}))
+    jobs.append((section, "solid", (1024, os.path.join(assets_dir, "icon-background.png")), {}))
     
     # ── Splash screens (assets) ──
-    print("\nSplash screens (assets):")
-    generate_splash(2732, os.path.join(assets_dir, "splash.png"), dark=False)
-    generate_splash(2732, os.path.join(assets_dir, "splash-dark.png"), dark=True)
+    section = "Splash screens (assets)"
+    jobs.append((section, "splash", (2732, os.path.join(assets_dir, "splash.png")), {"dark": False}))
+    jobs.append((section, "splash", (2732, os.path.join(assets_dir, "splash-dark.png")), {"dark": True}))
     
     # ── PWA icons ──
-    print("\nPWA icons:")
-    generate_icon(192, os.path.join(public_dir, "icon-192x192.png"))
-    generate_icon(512, os.path.join(public_dir, "icon-512x512.png"))
+    section = "PWA icons"
+    jobs.append((section, "icon", (192, os.path.join(public_dir, "icon-192x192.png")), {}))
+    jobs.append((section, "icon", (512, os.path.join(public_dir, "icon-512x512.png")), {}))
     
     # ── Favicon ──
-    print("\nFavicon:")
-    generate_favicon(os.path.join(public_dir, "favicon.ico"))
+    jobs.append(("Favicon", "favicon", (os.path.join(public_dir, "favicon.ico"),), {}))
     
-    # ── Android mipmap icons ──
-    print("\nAndroid mipmap icons:")
-    mipmap_sizes = {
-        "mipmap-ldpi": 36,
-        "mipmap-mdpi": 48,
-        "mipmap-hdpi": 72,
-        "mipmap-xhdpi": 96,
-        "mipmap-xxhdpi": 144,
-        "mipmap-xxxhdpi": 192,
-    }
+    # Once generate_vector_icons.py --replace-rasters has run, the splash and
+    # adaptive icon layers are VectorDrawables and their PNGs must not come back.
+    vector_splash = os.path.exists(os.path.join(android_res, "drawable", "splash.xml"))
+    vector_layers = uses_vector_foreground(android_res)
     
-    for density, size in mipmap_sizes.items():
+    # ── Android mipmap icons ──
+    section = "Android mipmap icons"
+    for density, size in MIPMAP_SIZES.items():
         d = os.path.join(android_res, density)
-        if not os.path.isdir(d):
-            os.makedirs(d, exist_ok=True)
-        
         # ic_launcher - full icon
-        generate_icon(size, os.path.join(d, "ic_launcher.png"))
+        jobs.append((section, "icon", (size, os.path.join(d, "ic_launcher" + res_ext)), {}))
         # ic_launcher_round - same (circle already)
-        generate_icon(size, os.path.join(d, "ic_launcher_round.png"))
+        jobs.append((section, "icon", (size, os.path.join(d, "ic_launcher_round" + res_ext)), {}))
+        if vector_layers:
+            continue
         # ic_launcher_foreground - transparent bg, smaller for safe zone
-        generate_icon(size, os.path.join(d, "ic_launcher_foreground.png"),
-                      transparent_bg=True, scale=0.72)
+        jobs.append((section, "icon", (size, os.path.join(d, "ic_launcher_foreground" + res_ext)),
+                     {"variant": "foreground"}))
         # ic_launcher_background - solid white
-        bg_icon = Image.new("RGBA", (size, size), WHITE + (255,))
-        bg_icon.save(os.path.join(d, "ic_launcher_background.png"))
+        jobs.append((section, "solid", (size, os.path.join(d, "ic_launcher_background" + res_ext)), {}))
     
     # ── Android splash screens ──
-    print("\nAndroid splash screens:")
-    splash_configs = {
-        # drawable (default)
-        "drawable": (320, 480, False),
-        "drawable-night": (320, 240, True),
-        # Portrait
-        "drawable-port-ldpi": (240, 320, False),
-        "drawable-port-mdpi": (320, 480, False),
-        "drawable-port-hdpi": (480, 800, False),
-        "drawable-port-xhdpi": (720, 1280, False),
-        "drawable-port-xxhdpi": (960, 1600, False),
-        "drawable-port-xxxhdpi": (1280, 1920, False),
-        # Portrait night
-        "drawable-port-night-ldpi": (240, 320, True),
-        "drawable-port-night-mdpi": (320, 480, True),
-        "drawable-port-night-hdpi": (480, 800, True),
-        "drawable-port-night-xhdpi": (720, 1280, True),
-        "drawable-port-night-xxhdpi": (960, 1600, True),
-        "drawable-port-night-xxxhdpi": (1280, 1920, True),
-        # Landscape
-        "drawable-land-ldpi": (320, 240, False),
-        "drawable-land-mdpi": (480, 320, False),
-        "drawable-land-hdpi": (800, 480, False),
-        "drawable-land-xhdpi": (1280, 720, False),
-        "drawable-land-xxhdpi": (1600, 960, False),
-        "drawable-land-xxxhdpi": (1920, 1280, False),
-        # Landscape night
-        "drawable-land-night-ldpi": (320, 240, True),
-        "drawable-land-night-mdpi": (480, 320, True),
-        "drawable-land-night-hdpi": (800, 480, True),
-        "drawable-land-night-xhdpi": (1280, 720, True),
-        "drawable-land-night-xxhdpi": (1600, 960, True),
-        "drawable-land-night-xxxhdpi": (1920, 1280, True),
+    section = "Android splash screens"
+    for folder, (w, h, dark) in ({} if vector_splash else SPLASH_CONFIGS).items():
+        d = os.path.join(android_res, folder)
+        jobs.append((section, "android_splash", (w, h, os.path.join(d, "splash" + res_ext)), {"dark": dark}))
+    
+    return jobs
+
+
+def output_path(job):
+    """The file a job writes (first str argument)."""
+    return next(a for a in job[2] if isinstance(a, str))
+
+
+def job_inputs(job):
+    """Everything that determines a job's output, for the manifest hash."""
+    section, kind, args, kwargs = job
+    return {
+        "draw_version": DRAW_VERSION,
+        "kind":         kind,
+        "args":         [a for a in args if not isinstance(a, str)],
+        "kwargs":       kwargs,
+        "colors":       [WHITE, NAVY, GOLD_STROKE] + ([DARK_BG] if kwargs.get("dark") else []),
+        "font":         file_digest(FONT_PATH),
+        "master_size":  MASTER_SIZE,
+        "masters":      MASTERS,
+        "optimizer":    OPTIMIZER_VERSION,
     }
+
+
+def print_results(results):
+    """Print job results in submission order, with a header per section."""
+    current = None
+    total_before = total_after = 0
+    for section, line, before, after in results:
+        if section != current:
+            print(f"\n{section}:")
+            current = section
+        print(line)
+        total_before += before
+        total_after += after
+    print(f"\nTotal vs Pillow defaults: {format_saving(total_before, total_after)}, "
+          f"saved {(total_before - total_after) / 1024:.1f} KB")
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root = os.path.dirname(script_dir)
     
-    for folder, (w, h, dark) in splash_configs.items():
-        d = os.path.join(android_res, folder)
-        if not os.path.isdir(d):
-            os.makedirs(d, exist_ok=True)
-        generate_android_splash(w, h, os.path.join(d, "splash.png"), dark=dark)
+    parser = argparse.ArgumentParser(description="Generate app icons and splash screens.")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (1 = in-process)")
+    parser.add_argument("--force", action="store_true", help="regenerate even if up to date")
+    parser.add_argument("--webp", action="store_true", help="write the Android res outputs as lossless WebP")
+    args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    
+    manifest = AssetManifest(os.path.join(root, "assets", ".icon-manifest.json"), root)
+    jobs = [j for j in build_jobs(root, webp=args.webp)
+            if manifest.is_stale(output_path(j), job_inputs(j), force=args.force)]
+    for job in jobs:
+        os.makedirs(os.path.dirname(output_path(job)), exist_ok=True)
+    
+    print("Generating icons in circle + תורה style...")
+    
+    if not jobs:
+        manifest.report()
+        print("\n✅ All icons and splash screens are up to date.")
+        return
+    
+    if args.jobs == 1:
+        print_results(map(run_job, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            print_results(pool.map(run_job, jobs))
+    
+    for job in jobs:
+        manifest.record(output_path(job), job_inputs(job))
+    manifest.save()
+    manifest.report()
     
     print("\n✅ All icons and splash screens generated successfully!")
 
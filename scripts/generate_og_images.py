@@ -0,0 +1,272 @@
+"""
+Pre-render the 1200×630 share (Open Graph) cards as static PNGs.
+
+One card per:
+  parsha               og/parsha-<id>.png              (54, from src/utils/parshaStartPositions.ts)
+  Nevi'im chapter      og/sefer-<sefer_id>-<perek>.png
+  Tehillim chapter     og/tehillim-<chapter>.png
+  Siddur section       og/siddur-<nusach>-<category>-<idx>.png
+
+Same design as the og-image edge function (navy gradient, gold frame, title,
+quoted first line, site footer), drawn with the store-listing rendering
+primitives (store-listing/rendering.py: gradients, cached fonts and bidi).
+Cards render in a process pool (--jobs N, --jobs 1 runs in-process), go
+through optimize_images.save_optimized, and are skipped when their inputs are
+unchanged — see og-cards/.og-manifest.json.
+
+og-cards/manifest.json maps card key → file, title and description; og-share
+reads it (from APP_ORIGIN/og/) and points og:image at the static file instead
+of the SVG function.
+
+The cards go to og-cards/, not public/, so the ~1,200 PNGs stay out of the
+Capacitor APK and the Electron bundle.  og-cards/ is committed; the web build
+(`npm run build`, what the web deploy runs) copies it to dist/og/, and the
+native builds (`npm run build:native`) skip it — see vite.config.ts.
+
+Usage:
+    python scripts/generate_og_images.py [--jobs N] [--force] [--out DIR]
+"""
+import argparse
+import json
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import ImageDraw
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "store-listing"))
+from rendering import font_inputs, get_font, heb, text_width, vertical_gradient
+
+from asset_manifest import AssetManifest
+from optimize_images import OPTIMIZER_VERSION, format_saving, save_optimized
+
+DATA_DIR     = ROOT / "src" / "data"
+OUT_DIR      = ROOT / "og-cards"
+PARSHA_START = ROOT / "src" / "utils" / "parshaStartPositions.ts"
+
+# Bump when draw_card changes output.
+DRAW_VERSION = 1
+
+W, H = 1200, 630
+
+# ── Colors (og-image palette) ─────────────────────────────────────────────
+BG_TOP    = (15, 31, 51)     # #0f1f33
+BG_DELTA  = (-2, 9, 17)      # → #0d2844
+GOLD      = (200, 169, 110)  # #c8a96e
+GOLD_DIM  = (120, 104, 75)
+TITLE     = (240, 230, 210)  # #f0e6d2
+DESC      = (212, 197, 169)  # #d4c5a9
+SITE      = "pash.lovable.app"
+APP_NAME  = "חמישה חומשי תורה"
+
+SIZES = {"app": 26, "title": 56, "desc": 30, "footer": 20}
+
+NUSACH_NAMES = {"sefard": "ספרד", "ashkenaz": "אשכנז", "edot_hamizrach": "עדות המזרח", "chabad": 'חב"ד'}
+SEFER_NAMES  = {1: "בראשית", 2: "שמות", 3: "ויקרא", 4: "במדבר", 5: "דברים"}
+
+MARKS = re.compile(r"[֑-ׇ]")
+TAG   = re.compile(r"<[^>]*>|&[#\w]+;")
+
+
+# ── Text helpers ──────────────────────────────────────────────────────────
+
+def hebrew_number(n: int) -> str:
+    """Hebrew numeral as og-share writes it (ט״ו, ט״ז; gershayim before the last letter)."""
+    ones = ["", "א", "ב", "ג", "ד", "ה", "ו", "ז", "ח", "ט"]
+    tens = ["", "י", "כ", "ל", "מ", "נ", "ס", "ע", "פ", "צ"]
+    letters = "ק" * (n // 100)
+    rest = n % 100
+    if rest == 15:
+        letters += "טו"
+    elif rest == 16:
+        letters += "טז"
+    else:
+        letters += tens[rest // 10] + ones[rest % 10]
+    return letters if len(letters) == 1 else letters[:-1] + "״" + letters[-1]
+
+
+def plain(text: str) -> str:
+    """Card text: no markup, no nikud / cantillation (the card fonts don't stack marks)."""
+    text = MARKS.sub("", TAG.sub(" ", text).replace("־", " "))
+    return " ".join(text.split())
+
+
+def fit(text: str, size: int, width: int) -> str:
+    """Display-ordered text, cut at a word boundary (with …) to fit width."""
+    words = text.split()
+    while words:
+        candidate = " ".join(words) + ("" if len(words) == len(text.split()) else " …")
+        if text_width(heb(candidate), size) <= width:
+            return heb(candidate)
+        words.pop()
+    return ""
+
+
+# ── Cards ─────────────────────────────────────────────────────────────────
+
+def parsha_cards() -> list[dict]:
+    cards, sefer = [], 0
+    for line in PARSHA_START.read_text(encoding="utf-8").splitlines():
+        if "───" in line:
+            sefer += 1
+            continue
+        m = re.match(r"\s*(\d+):\s*\{\s*perek:\s*(\d+),\s*pasuk:\s*(\d+)\s*\},\s*//\s*(.+)", line)
+        if m:
+            pid, perek, pasuk, name = int(m[1]), int(m[2]), int(m[3]), m[4].strip()
+            cards.append({
+                "key": f"parsha/{pid}", "file": f"parsha-{pid}.png",
+                "title": f"פרשת {name}",
+                "desc": f"{SEFER_NAMES.get(sefer, '')} {hebrew_number(perek)}, {hebrew_number(pasuk)}",
+                "sefer": sefer, "perek": perek, "pasuk": pasuk,
+            })
+    return cards
+
+
+def neviim_cards() -> list[dict]:
+    import download_neviim as neviim
+    cards = []
+    for name in neviim.SPLIT_FILES:
+        path = DATA_DIR / f"{name}.json"
+        if not path.exists():
+            continue
+        sefer = json.loads(path.read_text(encoding="utf-8"))
+        for parsha in sefer["parshiot"]:
+            for perek in parsha["perakim"]:
+                first = perek["pesukim"][0]["text"] if perek["pesukim"] else ""
+                cards.append({
+                    "key": f"sefer/{sefer['sefer_id']}/{perek['perek_num']}",
+                    "file": f"sefer-{sefer['sefer_id']}-{perek['perek_num']}.png",
+                    "title": f"{sefer['sefer_name']} פרק {hebrew_number(perek['perek_num'])}",
+                    "desc": plain(first),
+                })
+    return cards
+
+
+def tehillim_cards() -> list[dict]:
+    tehillim = json.loads((DATA_DIR / "tehillim.json").read_text(encoding="utf-8"))
+    return [{
+        "key": f"tehillim/{ch}", "file": f"tehillim-{ch}.png",
+        "title": f"תהילים פרק {hebrew_number(int(ch))}",
+        "desc": plain(entry["lines"][0]) if entry.get("lines") else "",
+    } for ch, entry in tehillim.items()]
+
+
+def siddur_cards() -> list[dict]:
+    cards = []
+    for nusach, nusach_name in NUSACH_NAMES.items():
+        path = DATA_DIR / "siddur" / f"siddur_{nusach}.json"
+        if not path.exists():
+            continue
+        data = json.loads(path.read_text(encoding="utf-8"))
+        for category, cat in data.items():
+            for idx, section in enumerate(cat.get("sections", [])):
+                cards.append({
+                    "key": f"siddur/{nusach}/{category}/{idx}",
+                    "file": f"siddur-{nusach}-{category}-{idx}.png",
+                    "title": plain(section.get("title", "")) or cat.get("name", ""),
+                    "desc": f"{cat.get('name', '')} · נוסח {nusach_name}",
+                })
+    return cards
+
+
+def all_cards() -> list[dict]:
+    return parsha_cards() + neviim_cards() + tehillim_cards() + siddur_cards()
+
+
+def card_inputs(card: dict) -> dict:
+    return {
+        "script": "generate_og_images",
+        "draw_version": DRAW_VERSION,
+        "title": card["title"],
+        "desc": card["desc"],
+        "fonts": font_inputs(),
+        "optimizer": OPTIMIZER_VERSION,
+    }
+
+
+# ── Drawing ───────────────────────────────────────────────────────────────
+
+def draw_card(card: dict):
+    img = vertical_gradient(W, H, BG_TOP, BG_DELTA)
+    draw = ImageDraw.Draw(img)
+
+    # Frame and corner dots
+    draw.rounded_rectangle([20, 20, W - 20, H - 20], radius=18, outline=GOLD, width=2)
+    draw.rounded_rectangle([32, 32, W - 32, H - 32], radius=14, outline=GOLD_DIM, width=1)
+    for cx, cy in ((50, 50), (W - 50, 50), (50, H - 50), (W - 50, H - 50)):
+        draw.ellipse([cx - 3, cy - 3, cx + 3, cy + 3], fill=GOLD)
+
+    # App name and dividers
+    app = heb(APP_NAME)
+    draw.text(((W - text_width(app, SIZES["app"])) // 2, 125), app, fill=GOLD, font=get_font(SIZES["app"]))
+    for y in (178, 490):
+        draw.line([300, y, 560, y], fill=GOLD_DIM, width=1)
+        draw.ellipse([597, y - 3, 603, y + 3], fill=GOLD)
+        draw.line([640, y, 900, y], fill=GOLD_DIM, width=1)
+
+    title = fit(card["title"], SIZES["title"], W - 240)
+    draw.text(((W - text_width(title, SIZES["title"])) // 2, 235), title,
+              fill=TITLE, font=get_font(SIZES["title"]))
+
+    if card["desc"]:
+        desc = fit(card["desc"], SIZES["desc"], 760)
+        draw.rounded_rectangle([200, 330, 1000, 400], radius=8, fill=(38, 52, 66))
+        draw.text(((W - text_width(desc, SIZES["desc"])) // 2, 345), desc,
+                  fill=DESC, font=get_font(SIZES["desc"]))
+
+    draw.rounded_rectangle([440, 520, 760, 556], radius=18, fill=(34, 48, 62))
+    draw.text(((W - text_width(SITE, SIZES["footer"])) // 2, 528), SITE,
+              fill=GOLD, font=get_font(SIZES["footer"]))
+    return img
+
+
+def run_job(job):
+    card, path = job
+    before, after = save_optimized(draw_card(card), path)
+    return card["key"], before, after
+
+
+# ── Main ──────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render 1200×630 share cards.")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (1 = in-process)")
+    parser.add_argument("--force", action="store_true", help="redraw every card")
+    parser.add_argument("--out", type=Path, default=OUT_DIR)
+    args = parser.parse_args()
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    manifest = AssetManifest(args.out / ".og-manifest.json", ROOT)
+    cards = all_cards()
+    jobs = [(c, str(args.out / c["file"])) for c in cards
+            if manifest.is_stale(args.out / c["file"], card_inputs(c), force=args.force)]
+    print(f"{len(cards)} cards, {len(jobs)} to render")
+
+    if jobs:
+        if args.jobs == 1:
+            results = list(map(run_job, jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+                results = list(pool.map(run_job, jobs, chunksize=16))
+        total_before = sum(before for _, before, _ in results)
+        total_after = sum(after for _, _, after in results)
+        print(f"Rendered {len(jobs)} cards: {format_saving(total_before, total_after)}")
+        for card, path in jobs:
+            manifest.record(path, card_inputs(card))
+        manifest.save()
+    manifest.report()
+
+    index = {
+        "format": 1,
+        "size": [W, H],
+        "cards": {c["key"]: {k: v for k, v in c.items() if k != "key"} for c in cards},
+    }
+    (args.out / "manifest.json").write_text(
+        json.dumps(index, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    print(f"✅ {args.out / 'manifest.json'}")
+
+
+if __name__ == "__main__":
+    main()
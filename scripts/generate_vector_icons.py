@@ -0,0 +1,373 @@
+"""
+generate_vector_icons.py
+Vector versions of the circle + תורה mark (same geometry as
+generate_icons.draw_circle_torah), with the word converted to glyph outlines
+so no font is needed at runtime.
+
+Outputs:
+  public/icon.svg                                   - full icon (circle on white) for web/PWA
+  public/icon-mark.svg                              - circle + text on transparent
+  android/app/src/main/res/drawable/ic_torah_mark.xml       - VectorDrawable of the mark
+  android/app/src/main/res/drawable/ic_torah_foreground.xml - adaptive icon foreground layer
+
+With --replace-rasters the Android side switches over to the vectors:
+  drawable/splash.xml, drawable-night/splash.xml  - layer-list: solid colour + ic_torah_mark
+  mipmap-anydpi-v26/ic_launcher*.xml              - @color background + ic_torah_foreground
+and the PNGs they supersede are deleted (26 splash.png folders and the
+mipmap ic_launcher_foreground/background layers).  ic_launcher.png and
+ic_launcher_round.png stay — API 24/25 launchers need bitmaps.
+generate_icons.py skips the deleted outputs once these vectors exist.
+
+Font: the mark is set in Frank Ruehl — the frank.ttf that ships with Windows
+(C:\Windows\Fonts, generate_icons.FONT_PATH), the same file the raster icons
+are drawn with.  It is Microsoft's and can't be redistributed, so it is not in
+the repository; on another OS copy it from a Windows machine and pass --font.
+Any font with the four Hebrew letters works for --check.
+
+--check builds every output in memory and validates it (well-formed XML, a
+viewBox / viewport, non-empty path data, outlines for all four letters)
+without writing anything — scripts/tests/test_generate_vector_icons.py runs
+it against a generated test font.
+
+Usage:
+    python scripts/generate_vector_icons.py [--font path/to/frank.ttf] [--replace-rasters]
+    python scripts/generate_vector_icons.py --check [--font path/to/any-hebrew.ttf]
+
+Requirements: pip install fonttools pillow
+"""
+import argparse
+import math
+import os
+import re
+import shutil
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from generate_icons import (
+    DARK_BG, FONT_PATH, GOLD_STROKE, MASTERS, MIPMAP_SIZES, NAVY, SPLASH_CONFIGS, WHITE,
+)
+
+ROOT = Path(__file__).parent.parent
+PUBLIC_DIR = ROOT / "public"
+ANDROID_RES = ROOT / "android" / "app" / "src" / "main" / "res"
+
+# All geometry is expressed in the 512-unit box draw_circle_torah is designed in.
+VIEWBOX = 512
+TEXT = "תורה"
+TEXT_ALPHA = 235 / 255   # transparent variants draw the text at ~0.92 opacity
+
+# Adaptive icon: 108dp canvas, the foreground layer is inset by 16.7% on each
+# side (see mipmap-anydpi-v26/ic_launcher.xml) and drawn at MASTERS scale.
+ADAPTIVE_DP = 108
+ADAPTIVE_INSET = 0.167
+SPLASH_MARK_DP = 108     # ≈ 1/3 of the narrowest (320dp) splash
+
+
+def hex_color(rgb) -> str:
+    return "#{:02X}{:02X}{:02X}".format(*rgb)
+
+
+def fmt(v: float) -> str:
+    s = f"{v:.2f}".rstrip("0").rstrip(".")
+    return "0" if s == "-0" else s
+
+
+def circle_path(cx: float, cy: float, r: float) -> str:
+    """A full circle as two arcs (VectorDrawable has no <circle>)."""
+    return (f"M{fmt(cx - r)},{fmt(cy)}"
+            f"a{fmt(r)},{fmt(r)} 0 1,0 {fmt(2 * r)},0"
+            f"a{fmt(r)},{fmt(r)} 0 1,0 {fmt(-2 * r)},0Z")
+
+
+def text_path(font_path: str, text: str, font_size: float, cx: float, cy: float) -> str:
+    """
+    SVG path data for text, ink box centred on (cx, cy) in a y-down canvas.
+    Hebrew is RTL, so glyphs are laid out left→right in reversed order — the
+    same thing draw_circle_torah does with text[::-1].
+    """
+    try:
+        from fontTools.ttLib import TTFont
+        from fontTools.pens.boundsPen import BoundsPen
+        from fontTools.pens.svgPathPen import SVGPathPen
+        from fontTools.pens.transformPen import TransformPen
+    except ImportError:
+        print("fontTools not found. Install with: pip install fonttools")
+        sys.exit(1)
+
+    font = TTFont(font_path)
+    glyph_set = font.getGlyphSet()
+    cmap = font.getBestCmap()
+    hmtx = font["hmtx"]
+    scale = font_size / font["head"].unitsPerEm
+
+    names = []
+    for ch in reversed(text):
+        if ord(ch) not in cmap:
+            print(f"ERROR: {os.path.basename(font_path)} has no glyph for {ch!r}")
+            sys.exit(1)
+        names.append(cmap[ord(ch)])
+
+    def draw(pen, transform_for):
+        x = 0
+        for name in names:
+            glyph_set[name].draw(TransformPen(pen, transform_for(x)))
+            x += hmtx[name][0]
+
+    bounds = BoundsPen(glyph_set)
+    draw(bounds, lambda x: (1, 0, 0, 1, x, 0))
+    xmin, ymin, xmax, ymax = bounds.bounds
+
+    ox = cx - (xmin + xmax) / 2 * scale
+    oy = cy + (ymin + ymax) / 2 * scale     # font units are y-up
+    pen = SVGPathPen(glyph_set, ntos=fmt)
+    draw(pen, lambda x: (scale, 0, 0, -scale, ox + x * scale, oy))
+    return pen.getCommands()
+
+
+def mark_shapes(font_path: str, scale: float = 1.0) -> dict:
+    """Circle fill, gold ring and text outlines in the 512 box (mirrors draw_circle_torah)."""
+    c = VIEWBOX / 2
+    r = VIEWBOX * 216 / 512 * scale
+    stroke_w = max(2, VIEWBOX * 12 / 512 * scale)
+    font_size = VIEWBOX * 168 / 512 * scale
+    return {
+        "circle": circle_path(c, c, r),
+        # Pillow draws the outline inside the ellipse box
+        "ring": circle_path(c, c, r - stroke_w / 2),
+        "stroke_w": stroke_w,
+        "text": text_path(font_path, TEXT, font_size, c, c - font_size * 0.08),
+    }
+
+
+# ── SVG ──────────────────────────────────────────────────────────────────────
+
+def build_svg(shapes: dict, background=None, text_alpha: float = 1.0) -> str:
+    bg = (f'  <rect width="{VIEWBOX}" height="{VIEWBOX}" fill="{hex_color(background)}"/>\n'
+          if background else "")
+    opacity = f' fill-opacity="{fmt(text_alpha)}"' if text_alpha < 1 else ""
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {VIEWBOX} {VIEWBOX}">\n'
+        f"{bg}"
+        f'  <path d="{shapes["circle"]}" fill="{hex_color(WHITE)}"/>\n'
+        f'  <path d="{shapes["ring"]}" fill="none" stroke="{hex_color(GOLD_STROKE)}"'
+        f' stroke-width="{fmt(shapes["stroke_w"])}"/>\n'
+        f'  <path d="{shapes["text"]}" fill="{hex_color(NAVY)}"{opacity}/>\n'
+        f"</svg>\n"
+    )
+
+
+# ── Android ──────────────────────────────────────────────────────────────────
+
+def build_vector_drawable(shapes: dict, size_dp: float, group_scale: float = 1.0,
+                          group_offset: float = 0.0, text_alpha: float = 1.0) -> str:
+    """VectorDrawable with a viewport of size_dp; the 512 box is scaled into it."""
+    s = size_dp / VIEWBOX * group_scale
+    alpha = f'\n            android:fillAlpha="{fmt(text_alpha)}"' if text_alpha < 1 else ""
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<!-- Generated by scripts/generate_vector_icons.py — do not edit by hand. -->
+<vector xmlns:android="http://schemas.android.com/apk/res/android"
+    android:width="{fmt(size_dp)}dp"
+    android:height="{fmt(size_dp)}dp"
+    android:viewportWidth="{fmt(size_dp)}"
+    android:viewportHeight="{fmt(size_dp)}">
+    <group
+        android:scaleX="{s:.6f}"
+        android:scaleY="{s:.6f}"
+        android:translateX="{fmt(group_offset)}"
+        android:translateY="{fmt(group_offset)}">
+        <path
+            android:fillColor="{hex_color(WHITE)}"
+            android:pathData="{shapes["circle"]}" />
+        <path
+            android:strokeColor="{hex_color(GOLD_STROKE)}"
+            android:strokeWidth="{fmt(shapes["stroke_w"])}"
+            android:pathData="{shapes["ring"]}" />
+        <path
+            android:fillColor="{hex_color(NAVY)}"{alpha}
+            android:pathData="{shapes["text"]}" />
+    </group>
+</vector>
+"""
+
+
+def build_splash_layer_list(bg_color) -> str:
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<!-- Generated by scripts/generate_vector_icons.py — do not edit by hand. -->
+<layer-list xmlns:android="http://schemas.android.com/apk/res/android">
+    <item>
+        <shape android:shape="rectangle">
+            <solid android:color="{hex_color(bg_color)}" />
+        </shape>
+    </item>
+    <item
+        android:width="{SPLASH_MARK_DP}dp"
+        android:height="{SPLASH_MARK_DP}dp"
+        android:gravity="center"
+        android:drawable="@drawable/ic_torah_mark" />
+</layer-list>
+"""
+
+
+ADAPTIVE_ICON_XML = """<?xml version="1.0" encoding="utf-8"?>
+<!-- Generated by scripts/generate_vector_icons.py — do not edit by hand. -->
+<adaptive-icon xmlns:android="http://schemas.android.com/apk/res/android">
+    <background android:drawable="@color/ic_launcher_background" />
+    <foreground android:drawable="@drawable/ic_torah_foreground" />
+</adaptive-icon>
+"""
+
+
+def write(path: Path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(content)
+    print(f"  ✓ {path.relative_to(ROOT).as_posix()}  ({len(content.encode('utf-8')) / 1024:.1f} KB)")
+
+
+def remove_superseded_rasters() -> int:
+    """Delete the PNG/WebP outputs the vector resources replace; returns bytes freed."""
+    freed = 0
+    targets = [ANDROID_RES / folder / "splash" for folder in SPLASH_CONFIGS]
+    for density in MIPMAP_SIZES:
+        targets.append(ANDROID_RES / density / "ic_launcher_foreground")
+        targets.append(ANDROID_RES / density / "ic_launcher_background")
+    for stem in targets:
+        for ext in (".png", ".webp"):
+            f = stem.with_suffix(ext)
+            if f.exists():
+                freed += f.stat().st_size
+                f.unlink()
+                print(f"  ✗ {f.relative_to(ROOT).as_posix()}")
+        # drop density folders that are now empty (drawable-port-hdpi etc.)
+        if stem.parent.exists() and not any(stem.parent.iterdir()):
+            shutil.rmtree(stem.parent)
+    return freed
+
+
+def vector_outputs(font_path: str) -> dict[Path, str]:
+    """The SVGs and VectorDrawables drawn from the font's outlines."""
+    full = mark_shapes(font_path, scale=MASTERS["light"][1])
+    foreground = mark_shapes(font_path, scale=MASTERS["foreground"][1])
+    inner = 1 - 2 * ADAPTIVE_INSET
+    return {
+        PUBLIC_DIR / "icon.svg": build_svg(full, background=WHITE),
+        PUBLIC_DIR / "icon-mark.svg": build_svg(full, text_alpha=TEXT_ALPHA),
+        ANDROID_RES / "drawable" / "ic_torah_mark.xml":
+            build_vector_drawable(full, SPLASH_MARK_DP, text_alpha=TEXT_ALPHA),
+        ANDROID_RES / "drawable" / "ic_torah_foreground.xml":
+            build_vector_drawable(foreground, ADAPTIVE_DP, group_scale=inner,
+                                  group_offset=ADAPTIVE_DP * ADAPTIVE_INSET, text_alpha=TEXT_ALPHA),
+    }
+
+
+def vector_resources() -> dict[Path, str]:
+    """The Android resources --replace-rasters points at the vectors."""
+    return {
+        ANDROID_RES / "drawable" / "splash.xml": build_splash_layer_list(WHITE),
+        ANDROID_RES / "drawable-night" / "splash.xml": build_splash_layer_list(DARK_BG),
+        ANDROID_RES / "mipmap-anydpi-v26" / "ic_launcher.xml": ADAPTIVE_ICON_XML,
+        ANDROID_RES / "mipmap-anydpi-v26" / "ic_launcher_round.xml": ADAPTIVE_ICON_XML,
+    }
+
+
+# ── Check ────────────────────────────────────────────────────────────────────
+
+SVG_NS     = "{http://www.w3.org/2000/svg}"
+ANDROID_NS = "{http://schemas.android.com/apk/res/android}"
+NUMBER     = re.compile(r"-?\d*\.?\d+(?:e-?\d+)?")
+
+
+def check_output(path: Path, content: str) -> list[str]:
+    """Problems with one generated file (empty if it looks right)."""
+    name = path.relative_to(ROOT).as_posix()
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError as e:
+        return [f"{name}: not well-formed XML ({e})"]
+
+    if root.tag == f"{SVG_NS}svg":
+        box = root.get("viewBox", "").split()
+        paths = [p.get("d", "") for p in root.iter(f"{SVG_NS}path")]
+        problems = [] if box == ["0", "0", str(VIEWBOX), str(VIEWBOX)] else [f"{name}: viewBox {box}"]
+    elif root.tag == "vector":
+        size = [float(root.get(f"{ANDROID_NS}{a}", "0")) for a in ("viewportWidth", "viewportHeight")]
+        paths = [p.get(f"{ANDROID_NS}pathData", "") for p in root.iter("path")]
+        problems = [] if all(v > 0 for v in size) else [f"{name}: viewport {size}"]
+    else:
+        return []   # layer-list / adaptive-icon: well-formed is all there is to check
+
+    if len(paths) != 3 or not all(paths):
+        problems.append(f"{name}: expected circle, ring and text paths, got {len(paths)}")
+        return problems
+    text = paths[-1]
+    # each letter is at least one closed contour
+    if text.upper().count("Z") < len(TEXT):
+        problems.append(f"{name}: text path has {text.upper().count('Z')} contours for {len(TEXT)} letters")
+    if not all(math.isfinite(float(n)) for n in NUMBER.findall(text)):
+        problems.append(f"{name}: non-finite coordinates in the text path")
+    return problems
+
+
+def check(font_path: str) -> list[str]:
+    outputs = {**vector_outputs(font_path), **vector_resources()}
+    problems = []
+    for path, content in outputs.items():
+        found = check_output(path, content)
+        problems += found
+        print(f"  {'✗' if found else '✓'} {path.relative_to(ROOT).as_posix()}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vector versions of the circle + תורה mark.")
+    parser.add_argument("--font", default=FONT_PATH, help="Frank Ruehl TTF (default: the Windows font)")
+    parser.add_argument("--replace-rasters", action="store_true",
+                        help="switch splash + adaptive icon to the vectors and delete the PNGs they replace")
+    parser.add_argument("--check", action="store_true", help="build and validate every output, write nothing")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.font):
+        print(f"ERROR: font not found: {args.font}")
+        print("  Pass the Frank Ruehl TTF with --font path/to/frank.ttf")
+        sys.exit(1)
+
+    if args.check:
+        print(f"Checking vector outputs built with {os.path.basename(args.font)}...\n")
+        problems = check(args.font)
+        for problem in problems:
+            print(f"  ✗ {problem}")
+        if problems:
+            sys.exit(1)
+        print("\n✅ All vector outputs are well-formed.")
+        return
+
+    print("Generating vector icons in circle + תורה style...\n")
+    outputs = vector_outputs(args.font)
+
+    print("Web / PWA:")
+    for path, content in outputs.items():
+        if path.parent == PUBLIC_DIR:
+            write(path, content)
+
+    print("\nAndroid vector drawables:")
+    for path, content in outputs.items():
+        if path.parent != PUBLIC_DIR:
+            write(path, content)
+
+    if not args.replace_rasters:
+        print("\nRe-run with --replace-rasters to switch splash + adaptive icon to the vectors.")
+        return
+
+    print("\nRemoving superseded rasters:")
+    freed = remove_superseded_rasters()
+
+    print("\nAndroid resources using the vectors:")
+    for path, content in vector_resources().items():
+        write(path, content)
+
+    print(f"\n✅ Vector resources in place — {freed / 1024:.1f} KB of rasters removed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+optimize_images.py
+Optimized PNG / WebP output stage for every generated image.
+
+  - drops metadata chunks (text, ICC, EXIF, dpi) that Pillow would carry over
+  - RGBA images that are fully opaque are stored as RGB
+  - images with ≤256 distinct colours are stored as an exact palette (P mode);
+    the conversion is verified pixel-for-pixel and skipped if it isn't lossless
+  - PNG is written with optimize=True (zlib level 9 + filter search)
+  - optionally, files under android/app/src/main/res are emitted as lossless
+    WebP instead (smaller APK, faster decode).  Android refuses two resources
+    with the same name, so the .png sibling is removed.
+
+The generators call save_optimized(); this file can also be run on its own to
+re-optimize images already in the tree.
+
+Usage:
+    python scripts/optimize_images.py                 # assets, public, android res, store listing
+    python scripts/optimize_images.py --webp          # ... and convert android res PNGs to WebP
+    python scripts/optimize_images.py path/to/dir_or_file.png ...
+
+Requirements: pip install pillow
+"""
+import io
+import os
+import sys
+from pathlib import Path
+from PIL import Image, ImageChops
+
+# Bump when the encoding below changes (part of the asset manifest hash).
+OPTIMIZER_VERSION = 1
+
+ROOT = Path(__file__).parent.parent
+ANDROID_RES = ROOT / "android" / "app" / "src" / "main" / "res"
+DEFAULT_PATHS = [
+    ROOT / "assets",
+    ROOT / "public",
+    ANDROID_RES,
+    ROOT / "store-listing",
+    ROOT / "google-play-upload",
+]
+
+
+def is_android_res(path) -> bool:
+    return ANDROID_RES in Path(path).resolve().parents
+
+
+def webp_path(path) -> Path:
+    return Path(path).with_suffix(".webp")
+
+
+def _lossless_palette(img: Image.Image) -> Image.Image | None:
+    """Exact P-mode copy of img if it has ≤256 colours, else None."""
+    colors = img.getcolors(256)
+    if colors is None:
+        return None
+    palette = [c for _, c in colors]
+
+    if img.mode == "RGB":
+        pal_img = Image.new("P", (1, 1))
+        pal_img.putpalette([v for c in palette for v in c])
+        p = img.quantize(palette=pal_img, dither=Image.Dither.NONE)
+    else:
+        # quantize(palette=...) only handles RGB/L; octree keeps alpha and is
+        # exact when there are no more colours than slots (verified below)
+        p = img.quantize(colors=256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+
+    if ImageChops.difference(p.convert(img.mode), img).getbbox() is not None:
+        return None
+    return p
+
+
+def prepare(img: Image.Image) -> Image.Image:
+    """Smallest lossless-equivalent representation of img, without metadata."""
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+    if img.mode == "RGBA" and img.getchannel("A").getextrema() == (255, 255):
+        img = img.convert("RGB")
+
+    out = _lossless_palette(img) or img.copy()
+    out.info = {k: v for k, v in out.info.items() if k == "transparency"}
+    return out
+
+
+def encode_png(img: Image.Image) -> bytes:
+    buf = io.BytesIO()
+    prepare(img).save(buf, "PNG", optimize=True)
+    return buf.getvalue()
+
+
+def encode_webp(img: Image.Image) -> bytes:
+    img = img if img.mode in ("RGB", "RGBA") else img.convert("RGBA")
+    buf = io.BytesIO()
+    img.save(buf, "WEBP", lossless=True, quality=100, method=6)
+    return buf.getvalue()
+
+
+def default_png_size(img: Image.Image) -> int:
+    """Bytes Pillow would have written with its defaults (the baseline we report against)."""
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+    return buf.tell()
+
+
+def save_optimized(img: Image.Image, path) -> tuple[int, int]:
+    """
+    Write img to path as an optimized PNG — or, if path ends in .webp, as
+    lossless WebP.  A stale sibling in the other format is removed either way
+    (Android fails the build on ic_launcher.png next to ic_launcher.webp).
+    Returns (baseline_bytes, written_bytes).
+    """
+    path = Path(path)
+    baseline = default_png_size(img)
+    if path.suffix.lower() == ".webp":
+        data, sibling = encode_webp(img), path.with_suffix(".png")
+    else:
+        data, sibling = encode_png(img), path.with_suffix(".webp")
+    path.write_bytes(data)
+    if sibling.exists():
+        sibling.unlink()
+    return baseline, len(data)
+
+
+def format_saving(before: int, after: int) -> str:
+    pct = (before - after) * 100 / before if before else 0
+    return f"{before / 1024:.1f} KB → {after / 1024:.1f} KB (-{pct:.0f}%)"
+
+
+def optimize_file(path: Path, webp: bool = False) -> tuple[int, int, Path]:
+    """Re-encode an existing PNG in place if that makes it smaller."""
+    before = path.stat().st_size
+    with Image.open(path) as im:
+        im.load()
+        if webp and is_android_res(path):
+            data, out = encode_webp(im), webp_path(path)
+        else:
+            data, out = encode_png(im), path
+
+    if len(data) >= before:
+        return before, before, path
+    out.write_bytes(data)
+    if out != path:
+        path.unlink()
+    return before, len(data), out
+
+
+def iter_pngs(paths):
+    for p in paths:
+        p = Path(p)
+        if p.is_file():
+            yield p
+        elif p.is_dir():
+            for f in sorted(p.rglob("*.png")):
+                # 9-patch PNGs carry layout data in their border pixels — leave them alone
+                if not f.name.endswith(".9.png") and "build" not in f.relative_to(p).parts:
+                    yield f
+
+
+def main():
+    args = [a for a in sys.argv[1:] if a != "--webp"]
+    webp = "--webp" in sys.argv
+    paths = [Path(a) for a in args] or DEFAULT_PATHS
+
+    total_before = total_after = 0
+    for f in iter_pngs(paths):
+        before, after, out = optimize_file(f, webp=webp)
+        total_before += before
+        total_after += after
+        rel = os.path.relpath(out, ROOT)
+        if after < before:
+            print(f"  ✓ {rel}  {format_saving(before, after)}")
+        else:
+            print(f"  · {rel}  already optimal ({before / 1024:.1f} KB)")
+
+    print(f"\nTotal: {format_saving(total_before, total_after)}, "
+          f"saved {(total_before - total_after) / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
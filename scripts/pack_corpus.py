@@ -0,0 +1,350 @@
+"""
+pack_corpus.py
+Packs the bundled text corpus (src/data) into one file compressed with a
+trained zstd dictionary, one frame per chapter / section, so any record can be
+read on its own without inflating the rest.
+
+Commentary and siddur text repeats the same abbreviations, citation forms and
+blessing formulas thousands of times; a whole-file gzip can exploit that, but
+a per-chapter frame on its own is too small to.  A dictionary trained on the
+corpus gives each small frame that shared context up front.
+
+Records (the JSON files are split at these containers; everything else in a
+file is kept in its "skeleton" record, with each container replaced by a
+{"$records": [child keys]} marker so the file can be reassembled exactly):
+    sefaria/*.json   text[perek]
+    siddur/*.json    <category>.sections[idx]
+    tehillim.json    <chapter>
+    <navi>.json      parshiot[i].perakim[j]
+    en/*.json        verses, grouped by perek (the map is flat, keyed by
+                     sefer*1e6 + perek*1e3 + pasuk; the skeleton holds
+                     {"$groups": [perakim]} and the groups are merged back)
+
+Pack layout:
+    b"ZPK1" | u32 header length | header JSON | dictionary | frames
+    header: {"format", "level", "dict_id", "dict_size",
+             "records": {key: [offset, compressed size, raw size]}}
+    keys:   "<file>"                  skeleton
+            "<file>:<path>/<child>"   e.g. "sefaria/Rashi_on_Genesis.json:text/11"
+            "<file>:<path>/<group>"   e.g. "en/joshua.json:verses/1"
+
+Usage:
+    python scripts/pack_corpus.py build [-o corpus.zpk] [--dict-kb 112] [--level 19]
+    python scripts/pack_corpus.py bench [-o corpus.zpk]
+    python scripts/pack_corpus.py get "tehillim.json:23" [-o corpus.zpk]
+
+Requirements: pip install zstandard
+"""
+import argparse
+import gzip
+import json
+import random
+import struct
+import sys
+import time
+from pathlib import Path
+
+ROOT     = Path(__file__).parent.parent
+DATA_DIR = ROOT / "src" / "data"
+OUT_PATH = ROOT / "build" / "corpus.zpk"
+
+MAGIC         = b"ZPK1"
+PACK_FORMAT   = 2
+DICT_KB       = 112
+LEVEL         = 19
+MARKER        = "$records"
+GROUPS        = "$groups"
+
+
+def zstd():
+    try:
+        import zstandard
+    except ImportError:
+        print("zstandard not found. Install with: pip install zstandard")
+        sys.exit(1)
+    return zstandard
+
+
+def encode(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# ── Splitting ─────────────────────────────────────────────────────────────────
+
+def containers(rel: str, doc) -> list[list]:
+    """JSON paths whose children become separate records."""
+    if rel.startswith("sefaria/"):
+        return [["text"]] if isinstance(doc.get("text"), list) else []
+    if rel.startswith("siddur/"):
+        return [[cat, "sections"] for cat, v in doc.items()
+                if isinstance(v, dict) and isinstance(v.get("sections"), list)]
+    if rel == "tehillim.json":
+        return [[]]
+    if isinstance(doc, dict) and isinstance(doc.get("parshiot"), list):
+        return [["parshiot", i, "perakim"] for i, p in enumerate(doc["parshiot"])
+                if isinstance(p.get("perakim"), list)]
+    return []
+
+
+def grouped(rel: str, doc) -> list[list]:
+    """JSON paths of flat maps whose entries are packed in per-perek groups."""
+    if rel.startswith("en/") and isinstance(doc.get("verses"), dict):
+        return [["verses"]]
+    return []
+
+
+def group_of(verse_id: str) -> str:
+    return str(int(verse_id) // 1000 % 1000)
+
+
+def node(doc, path: list):
+    for key in path:
+        doc = doc[key]
+    return doc
+
+
+def path_key(path: list) -> str:
+    return "/".join(str(k) for k in path)
+
+
+def split(rel: str, doc) -> dict[str, bytes]:
+    """{record key: encoded JSON} for one file, skeleton included."""
+    records = {}
+    paths = containers(rel, doc)
+    for path in paths:
+        box = node(doc, path)
+        children = list(box.items()) if isinstance(box, dict) else list(enumerate(box))
+        prefix = f"{rel}:{path_key(path)}/" if path else f"{rel}:"
+        for child, value in children:
+            records[f"{prefix}{child}"] = encode(value)
+
+    groups = {}
+    for path in grouped(rel, doc):
+        buckets = {}
+        for child, value in node(doc, path).items():
+            buckets.setdefault(group_of(child), {})[child] = value
+        for group, value in buckets.items():
+            records[f"{rel}:{path_key(path)}/{group}"] = encode(value)
+        groups[path_key(path)] = list(buckets)
+
+    def skeleton(value, path):
+        if path in paths:
+            return {MARKER: list(value) if isinstance(value, dict) else len(value)}
+        if path_key(path) in groups:
+            return {GROUPS: groups[path_key(path)]}
+        if isinstance(value, dict):
+            return {k: skeleton(v, path + [k]) for k, v in value.items()}
+        if isinstance(value, list) and any(p[:len(path)] == path for p in paths):
+            return [skeleton(v, path + [i]) for i, v in enumerate(value)]
+        return value
+
+    records[rel] = encode(skeleton(doc, []))
+    return records
+
+
+def corpus(data_dir: Path = DATA_DIR) -> dict[str, bytes]:
+    records = {}
+    for path in sorted(data_dir.rglob("*.json")):
+        rel = path.relative_to(data_dir).as_posix()
+        with open(path, encoding="utf-8") as f:
+            records.update(split(rel, json.load(f)))
+    return records
+
+
+# ── Build ─────────────────────────────────────────────────────────────────────
+
+def build(out: Path, dict_kb: int = DICT_KB, level: int = LEVEL, data_dir: Path = DATA_DIR):
+    z = zstd()
+    records = corpus(data_dir)
+    samples = list(records.values())
+    started = time.monotonic()
+    dictionary = z.train_dictionary(dict_kb * 1024, samples, level=level)
+    print(f"  ✓ Dictionary: {len(dictionary.as_bytes()) / 1024:.0f} KB trained on "
+          f"{len(samples)} records in {time.monotonic() - started:.1f}s")
+
+    compressor = z.ZstdCompressor(level=level, dict_data=dictionary, write_checksum=True)
+    index, frames, offset = {}, [], 0
+    for key, raw in records.items():
+        frame = compressor.compress(raw)
+        index[key] = [offset, len(frame), len(raw)]
+        frames.append(frame)
+        offset += len(frame)
+
+    dict_bytes = dictionary.as_bytes()
+    header = encode({
+        "format": PACK_FORMAT,
+        "level": level,
+        "dict_id": dictionary.dict_id(),
+        "dict_size": len(dict_bytes),
+        "records": index,
+    })
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header)) + header + dict_bytes)
+        for frame in frames:
+            f.write(frame)
+
+    raw_total = sum(len(r) for r in records.values())
+    print(f"  ✓ {out}: {len(records)} records, {raw_total / (1024 * 1024):.1f} MB → "
+          f"{out.stat().st_size / (1024 * 1024):.1f} MB")
+
+
+# ── Reader ────────────────────────────────────────────────────────────────────
+
+class CorpusPack:
+    """Random access to records of a pack; only the requested frame is read."""
+
+    def __init__(self, path: Path = OUT_PATH):
+        z = zstd()
+        self.file = open(path, "rb")
+        if self.file.read(4) != MAGIC:
+            raise ValueError(f"{path}: not a corpus pack")
+        (size,) = struct.unpack("<I", self.file.read(4))
+        self.header = json.loads(self.file.read(size))
+        if self.header["format"] != PACK_FORMAT:
+            raise ValueError(f"{path}: unsupported pack format {self.header['format']}")
+        dictionary = z.ZstdCompressionDict(self.file.read(self.header["dict_size"]))
+        self.base = 8 + size + self.header["dict_size"]
+        self.records: dict[str, list[int]] = self.header["records"]
+        self.decompressor = z.ZstdDecompressor(dict_data=dictionary)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.records
+
+    def keys(self, prefix: str = "") -> list[str]:
+        return [k for k in self.records if k.startswith(prefix)]
+
+    def get_bytes(self, key: str) -> bytes:
+        offset, size, raw = self.records[key]
+        self.file.seek(self.base + offset)
+        return self.decompressor.decompress(self.file.read(size), max_output_size=raw)
+
+    def get(self, key: str):
+        return json.loads(self.get_bytes(key))
+
+    def load_file(self, rel: str):
+        """Reassemble a whole source file from its skeleton and records."""
+        def fill(value, path):
+            if isinstance(value, dict) and set(value) == {MARKER}:
+                children = value[MARKER]
+                prefix = f"{rel}:{path_key(path)}/" if path else f"{rel}:"
+                if isinstance(children, int):
+                    return [self.get(f"{prefix}{i}") for i in range(children)]
+                return {k: self.get(f"{prefix}{k}") for k in children}
+            if isinstance(value, dict) and set(value) == {GROUPS}:
+                merged = {}
+                for group in value[GROUPS]:
+                    merged.update(self.get(f"{rel}:{path_key(path)}/{group}"))
+                return merged
+            if isinstance(value, dict):
+                return {k: fill(v, path + [k]) for k, v in value.items()}
+            if isinstance(value, list):
+                return [fill(v, path + [i]) for i, v in enumerate(value)]
+            return value
+        return fill(self.get(rel), [])
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def bench(pack_path: Path, data_dir: Path = DATA_DIR, lookups: int = 200):
+    z = zstd()
+    files = {p.relative_to(data_dir).as_posix(): p.read_bytes()
+             for p in sorted(data_dir.rglob("*.json"))}
+    gzipped = {rel: gzip.compress(raw, compresslevel=9) for rel, raw in files.items()}
+    records = corpus(data_dir)
+    plain_records = z.ZstdCompressor(level=LEVEL)
+    no_dict = sum(len(plain_records.compress(r)) for r in records.values())
+
+    with CorpusPack(pack_path) as pack:
+        # Round trip: every file reassembles to the same document
+        for rel, raw in files.items():
+            if pack.load_file(rel) != json.loads(raw):
+                print(f"  ✗ {rel}: reassembled file differs from the source")
+                return
+
+        rng = random.Random(0)
+        candidates = [k for k in pack.records if ":" in k]
+        keys = rng.sample(candidates, min(lookups, len(candidates)))
+        owner = {k: k.split(":", 1)[0] for k in keys}
+
+        def child(doc, key):
+            for part in key.split(":", 1)[1].split("/"):
+                if isinstance(doc, list):
+                    doc = doc[int(part)]
+                elif part in doc:
+                    doc = doc[part]
+                else:  # a per-perek group of a flat verse map
+                    doc = {k: v for k, v in doc.items() if group_of(k) == part}
+            return doc
+
+        per_lookup = {
+            "plain JSON":      lambda: [child(json.loads(files[owner[k]]), k) for k in keys],
+            "gzip whole-file": lambda: [child(json.loads(gzip.decompress(gzipped[owner[k]])), k)
+                                        for k in keys],
+            "zstd+dict":       lambda: [pack.get(k) for k in keys],
+        }
+        sizes = {
+            "plain JSON":      sum(len(b) for b in files.values()),
+            "gzip whole-file": sum(len(b) for b in gzipped.values()),
+            "zstd+dict":       pack_path.stat().st_size,
+        }
+        full = {
+            "plain JSON":      lambda: [json.loads(b) for b in files.values()],
+            "gzip whole-file": lambda: [json.loads(gzip.decompress(b)) for b in gzipped.values()],
+            "zstd+dict":       lambda: [pack.load_file(rel) for rel in files],
+        }
+
+        print(f"\n  {'':16s} {'size MB':>9s} {'1 record ms':>12s} {'all files ms':>13s}")
+        for name in per_lookup:
+            one = timed(per_lookup[name], 1) / len(keys)
+            everything = timed(full[name], 1)
+            print(f"  {name:16s} {sizes[name] / (1024 * 1024):9.2f} {one:12.3f} {everything:13.0f}")
+        print(f"\n  zstd per record without a dictionary: {no_dict / (1024 * 1024):.2f} MB "
+              f"({len(records)} records)")
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Dictionary-compressed pack of src/data.")
+    parser.add_argument("command", choices=["build", "bench", "get"])
+    parser.add_argument("key", nargs="?", help="record key for get")
+    parser.add_argument("-o", "--out", type=Path, default=OUT_PATH)
+    parser.add_argument("--dict-kb", type=int, default=DICT_KB)
+    parser.add_argument("--level", type=int, default=LEVEL)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build(args.out, args.dict_kb, args.level)
+    elif args.command == "bench":
+        if not args.out.exists():
+            build(args.out, args.dict_kb, args.level)
+        bench(args.out)
+    else:
+        if not args.key:
+            parser.error("get needs a record key")
+        with CorpusPack(args.out) as pack:
+            if args.key not in pack:
+                print(f"No record {args.key!r}. Keys look like: {pack.keys()[:3]}")
+                sys.exit(1)
+            print(json.dumps(pack.get(args.key), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+play_publisher.py
+Small Google Play (androidpublisher v3) REST client shared by upload_play.py,
+assign_track.py and check_reviews.py.
+
+  - chunked resumable bundle upload (Content-Range PUTs) with retry/backoff;
+    after a dropped connection the server-acknowledged offset is queried and
+    the upload continues from there instead of starting over
+  - the edit id + upload session URI are persisted in a state file, so a
+    re-run after a crash resumes the same upload (one file per endpoint, so a
+    fake-server run never touches the real upload's state)
+  - throughput / progress reporting per chunk
+  - upload and track assignment (one or several tracks) in a single edit
+  - base_url can point at scripts/fake_play_api.py to run everything offline
+
+Usage (library):
+    pub = PlayPublisher(authorized_session(KEY_FILE), PACKAGE)
+    pub.publish(AAB_PATH, ["internal"], release_notes)
+
+Requirements: pip install requests google-auth
+"""
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+
+API_ROOT = "https://androidpublisher.googleapis.com"
+SCOPES = ["https://www.googleapis.com/auth/androidpublisher"]
+
+CHUNK_SIZE = 8 * 1024 * 1024      # must be a multiple of 256 KiB
+MAX_RETRIES = 8
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+STATE_PATH = Path(__file__).parent / ".play_upload_state.json"
+
+
+def state_path_for(base_url: str) -> Path:
+    """The real API's state file, or one per other endpoint (e.g. the fake), so they never mix."""
+    if base_url.rstrip("/") == API_ROOT:
+        return STATE_PATH
+    slug = re.sub(r"\W+", "_", urlsplit(base_url).netloc or base_url).strip("_")
+    return STATE_PATH.with_name(f".play_upload_state.{slug}.json")
+
+
+class PlayApiError(Exception):
+    """Non-retryable error returned by the publisher API."""
+
+
+def authorized_session(key_file: str):
+    """requests.Session carrying service-account credentials for androidpublisher."""
+    from google.oauth2 import service_account
+    from google.auth.transport.requests import AuthorizedSession
+
+    creds = service_account.Credentials.from_service_account_file(key_file, scopes=SCOPES)
+    return AuthorizedSession(creds)
+
+
+def file_fingerprint(path: Path) -> str:
+    """Identifies the exact bundle a saved upload session belongs to."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def format_mb(n: int) -> str:
+    return f"{n / (1024 * 1024):.1f} MB"
+
+
+class PlayPublisher:
+    def __init__(self, session: requests.Session, package: str, base_url: str = API_ROOT,
+                 chunk_size: int = CHUNK_SIZE, max_retries: int = MAX_RETRIES,
+                 state_path: Path | None = None):
+        self.session = session
+        self.package = package
+        self.base_url = base_url.rstrip("/")
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.state_path = Path(state_path) if state_path else state_path_for(self.base_url)
+
+    # ── REST helpers ─────────────────────────────────────────────────────────
+
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}/androidpublisher/v3/applications/{self.package}{path}"
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request, retrying connection errors and 429/5xx with backoff."""
+        kwargs.setdefault("timeout", 60)
+        for attempt in range(self.max_retries + 1):
+            try:
+                r = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                self._backoff(attempt, f"{type(e).__name__}")
+                continue
+            if r.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                self._backoff(attempt, f"HTTP {r.status_code}")
+                continue
+            return r
+        raise AssertionError("unreachable")
+
+    def _json(self, method: str, path: str, **kwargs) -> dict:
+        r = self._request(method, self._url(path), **kwargs)
+        if r.status_code not in (200, 201, 204):
+            raise PlayApiError(f"{method} {path} → {r.status_code}: {r.text[:300]}")
+        return r.json() if r.content else {}
+
+    @staticmethod
+    def _backoff(attempt: int, reason: str):
+        delay = min(2 ** attempt, 60)
+        print(f"    ↻ {reason} — retrying in {delay}s")
+        time.sleep(delay)
+
+    # ── Edits ────────────────────────────────────────────────────────────────
+
+    def insert_edit(self) -> str:
+        return self._json("POST", "/edits", json={})["id"]
+
+    def get_edit(self, edit_id: str) -> dict | None:
+        r = self._request("GET", self._url(f"/edits/{edit_id}"))
+        return r.json() if r.status_code == 200 else None
+
+    def commit_edit(self, edit_id: str) -> dict:
+        return self._json("POST", f"/edits/{edit_id}:commit")
+
+    def delete_edit(self, edit_id: str):
+        self._json("DELETE", f"/edits/{edit_id}")
+
+    def list_tracks(self, edit_id: str) -> list[dict]:
+        return self._json("GET", f"/edits/{edit_id}/tracks").get("tracks", [])
+
+    def update_track(self, edit_id: str, track: str, version_codes: list, release_notes: list,
+                     status: str = "completed") -> dict:
+        body = {
+            "releases": [{
+                "versionCodes": [str(vc) for vc in version_codes],
+                "status": status,
+                "releaseNotes": release_notes,
+            }]
+        }
+        return self._json("PUT", f"/edits/{edit_id}/tracks/{track}", json=body)
+
+    # ── Reviews ──────────────────────────────────────────────────────────────
+
+    def list_reviews(self, page_token: str | None = None, max_results: int = 100) -> dict:
+        params = {"maxResults": max_results}
+        if page_token:
+            params["token"] = page_token
+        return self._json("GET", "/reviews", params=params)
+
+    # ── Resumable bundle upload ──────────────────────────────────────────────
+
+    def _start_session(self, edit_id: str, total: int) -> str:
+        url = (f"{self.base_url}/upload/androidpublisher/v3/applications/{self.package}"
+               f"/edits/{edit_id}/bundles?uploadType=resumable")
+        r = self._request("POST", url, headers={
+            "X-Upload-Content-Type": "application/octet-stream",
+            "X-Upload-Content-Length": str(total),
+        })
+        if r.status_code != 200 or "Location" not in r.headers:
+            raise PlayApiError(f"could not start upload session → {r.status_code}: {r.text[:300]}")
+        return r.headers["Location"]
+
+    @staticmethod
+    def _acked_offset(r: requests.Response) -> int:
+        """Next byte to send, from a 308 response's Range header (bytes=0-N)."""
+        rng = r.headers.get("Range")
+        return int(rng.rsplit("-", 1)[1]) + 1 if rng else 0
+
+    def query_offset(self, session_uri: str, total: int) -> int | dict | None:
+        """
+        Ask the server how much of the upload it has.
+        Returns the next offset, the final JSON if the upload already completed,
+        or None if the session is gone (expired / unknown).
+        """
+        r = self._request("PUT", session_uri, headers={
+            "Content-Range": f"bytes */{total}", "Content-Length": "0",
+        })
+        if r.status_code == 308:
+            return self._acked_offset(r)
+        if r.status_code in (200, 201):
+            return r.json()
+        return None
+
+    def upload_bundle(self, edit_id: str, path: Path, session_uri: str | None = None,
+                      on_session=None) -> dict:
+        """
+        Upload an .aab in chunks; resumes session_uri if given.
+        on_session(uri) is called once a session exists (used to persist it).
+        Returns the Bundle resource ({"versionCode": ..., "sha256": ...}).
+        """
+        total = path.stat().st_size
+        offset = 0
+        if session_uri:
+            status = self.query_offset(session_uri, total)
+            if isinstance(status, dict):
+                return status
+            if status is None:
+                session_uri = None
+            else:
+                offset = status
+                print(f"  Resuming upload at {format_mb(offset)} / {format_mb(total)}")
+        if not session_uri:
+            session_uri = self._start_session(edit_id, total)
+            if on_session:
+                on_session(session_uri)
+
+        started = time.monotonic()
+        sent = 0
+        failures = 0
+        with open(path, "rb") as f:
+            while True:
+                f.seek(offset)
+                chunk = f.read(self.chunk_size)
+                end = offset + len(chunk) - 1
+                try:
+                    r = self.session.put(session_uri, data=chunk, timeout=300, headers={
+                        "Content-Range": f"bytes {offset}-{end}/{total}",
+                    })
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    r = None
+                    reason = type(e).__name__
+                else:
+                    reason = f"HTTP {r.status_code}"
+
+                if r is not None and r.status_code in (200, 201):
+                    sent += len(chunk)
+                    self._progress(total, total, sent, started)
+                    return r.json()
+                if r is not None and r.status_code == 308:
+                    new_offset = self._acked_offset(r)
+                    if new_offset > offset:
+                        sent += new_offset - offset
+                        offset = new_offset
+                        failures = 0
+                        self._progress(offset, total, sent, started)
+                        continue
+                    # Chunk acknowledged without moving the offset: a retry like
+                    # any other, so a server stuck there can't loop us forever
+                    reason = f"HTTP 308 without progress at {format_mb(offset)}"
+                elif r is not None and r.status_code not in RETRY_STATUSES:
+                    raise PlayApiError(f"chunk upload → {r.status_code}: {r.text[:300]}")
+
+                # Dropped connection or transient error: back off, then ask the
+                # server what it actually received and continue from there.
+                if failures == self.max_retries:
+                    raise PlayApiError(f"upload failed after {failures} retries ({reason})")
+                self._backoff(failures, reason)
+                failures += 1
+                status = self.query_offset(session_uri, total)
+                if isinstance(status, dict):
+                    return status
+                if status is None:
+                    raise PlayApiError("upload session expired — re-run to start a new one")
+                offset = status
+
+    @staticmethod
+    def _progress(offset: int, total: int, sent: int, started: float):
+        elapsed = max(time.monotonic() - started, 1e-6)
+        pct = offset * 100 / total if total else 100
+        print(f"    {format_mb(offset)} / {format_mb(total)} ({pct:.0f}%)  "
+              f"{format_mb(int(sent / elapsed))}/s")
+
+    # ── High level ───────────────────────────────────────────────────────────
+
+    def _load_state(self) -> dict:
+        if self.state_path.exists():
+            try:
+                return json.loads(self.state_path.read_text(encoding="utf-8"))
+            except ValueError:
+                pass
+        return {}
+
+    def _save_state(self, state: dict):
+        self.state_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+    def publish(self, aab_path, tracks: list[str], release_notes: list,
+                status: str = "completed") -> int:
+        """
+        Upload a bundle and assign it to every track in one edit, then commit.
+        An interrupted run leaves its edit/session in the state file; the next
+        run with the same bundle picks it up.  Returns the new versionCode.
+        """
+        aab_path = Path(aab_path)
+        fingerprint = file_fingerprint(aab_path)
+        state = self._load_state()
+        if (state.get("package") != self.package or state.get("fingerprint") != fingerprint
+                or state.get("base_url", self.base_url) != self.base_url):
+            state = {}
+
+        edit_id = state.get("edit_id")
+        if edit_id and self.get_edit(edit_id) is None:
+            print(f"  Saved edit {edit_id} expired — starting over")
+            edit_id, state = None, {}
+        if not edit_id:
+            edit_id = self.insert_edit()
+            state = {"package": self.package, "fingerprint": fingerprint, "edit_id": edit_id,
+                     "base_url": self.base_url}
+            self._save_state(state)
+        print(f"  Edit ID : {edit_id}")
+
+        def remember_session(uri):
+            state["session_uri"] = uri
+            self._save_state(state)
+
+        print(f"  Uploading AAB ({format_mb(aab_path.stat().st_size)}) ...")
+        bundle = self.upload_bundle(edit_id, aab_path, state.get("session_uri"), remember_session)
+        vc = bundle["versionCode"]
+        print(f"  Version Code: {vc}")
+
+        for track in tracks:
+            self.update_track(edit_id, track, [vc], release_notes, status=status)
+            print(f"  Track '{track}' updated")
+
+        self.commit_edit(edit_id)
+        self.state_path.unlink(missing_ok=True)
+        return vc
+
+    def assign(self, tracks: list[str], version_code, release_notes: list,
+               status: str = "completed"):
+        """Point one or more tracks at an already-uploaded versionCode in one edit."""
+        edit_id = self.insert_edit()
+        for track in tracks:
+            self.update_track(edit_id, track, [version_code], release_notes, status=status)
+        self.commit_edit(edit_id)
@@ -0,0 +1,194 @@
+"""
+resolve_refs.py
+Resolves every commentator × book to the one Sefaria title that works, once,
+offline — instead of probing alias after alias on every request.
+
+Each commentator has a list of candidate titles (ALIASES; e.g. Beur HaGra has
+four spellings, Chizkuni is "Chizkuni, Genesis" rather than "... on ...").
+Candidates are checked in order against Sefaria's index API; the canonical
+title of the first one that exists is recorded, and so is a miss (null), so
+consumers don't probe for commentaries Sefaria doesn't have.
+
+Output: supabase/functions/_shared/sefaria_refs.json
+    {"format": 1, "resolved_at": "...",
+     "refs": {"Beur_HaGra": {"Genesis": "Beur HaGra on Genesis", "Joshua": null, ...}, ...}}
+bundled with the fetch-sefaria edge function and read by download_commentaries.py;
+--upload also writes it to the sefaria_ref_aliases table.
+
+Usage:
+    python scripts/resolve_refs.py                 # resolve anything not yet in the table
+    python scripts/resolve_refs.py --refresh       # re-probe everything
+    python scripts/resolve_refs.py --upload        # ... and upsert into Supabase (service role key)
+    python scripts/resolve_refs.py --show          # print the table
+
+Requirements: pip install requests
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import quote
+
+import requests
+
+REFS_PATH  = Path(__file__).parent.parent / "supabase" / "functions" / "_shared" / "sefaria_refs.json"
+INDEX_URL  = "https://www.sefaria.org/api/v2/raw/index/{title}"
+HEADERS    = {"User-Agent": "TorahApp/1.0"}
+REFS_FORMAT = 1
+
+TORAH = ["Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy"]
+NEVIIM = ["Joshua", "Judges", "I Samuel", "II Samuel", "I Kings", "II Kings", "Esther"]
+
+# commentator id (AVAILABLE_COMMENTARIES english name) → candidate titles, in order
+ALIASES = {
+    "Rashi":          ["Rashi on {book}"],
+    "Ramban":         ["Ramban on {book}"],
+    "Ibn_Ezra":       ["Ibn Ezra on {book}"],
+    "Sforno":         ["Sforno on {book}"],
+    "Or_HaChaim":     ["Or HaChaim on {book}"],
+    "Kli_Yakar":      ["Kli Yakar on {book}"],
+    "Rashbam":        ["Rashbam on {book}"],
+    "Chizkuni":       ["Chizkuni, {book}", "Chizkuni on {book}"],
+    "Baal_HaTurim":   ["Baal HaTurim on {book}", "Kitzur Baal HaTurim on {book}"],
+    "Onkelos":        ["Onkelos {book}"],
+    "Malbim":         ["Malbim on {book}"],
+    "Alshich":        ["Alshich on {book}", "Alshich on Torah, {book}"],
+    "HaEmek_Davar":   ["Haamek Davar on {book}", "HaEmek Davar on {book}"],
+    "Daat_Zkenim":    ["Da'at Zkenim on {book}", "Daat Zkenim on {book}"],
+    "Metzudat_David": ["Metzudat David on {book}"],
+    "Beur_HaGra":     ["Beur HaGra on {book}", "Biur HaGra on {book}",
+                       "Vilna Gaon on {book}", "HaGra on {book}"],
+}
+
+# Only Metzudat David is expected on Nevi'im, but misses are cheap to record
+BOOKS = {c: TORAH + NEVIIM for c in ALIASES}
+
+
+def candidates(commentator: str, book: str) -> list[str]:
+    templates = ALIASES.get(commentator) or [commentator.replace("_", " ") + " on {book}"]
+    return [t.format(book=book) for t in templates]
+
+
+def url_ref(title: str) -> str:
+    """Sefaria title → URL path segment ("Chizkuni, Genesis" → "Chizkuni%2C_Genesis")."""
+    return quote(title.replace(" ", "_"), safe="_")
+
+
+# ── Table ─────────────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=None)
+def load_table() -> dict:
+    if REFS_PATH.exists():
+        table = json.loads(REFS_PATH.read_text(encoding="utf-8"))
+        if table.get("format") == REFS_FORMAT:
+            return table
+    return {"format": REFS_FORMAT, "resolved_at": None, "refs": {}}
+
+
+def resolved(commentator: str, book: str) -> str | None:
+    """Resolved title from the table; falls back to the first candidate if never probed."""
+    refs = load_table()["refs"].get(commentator, {})
+    if book in refs:
+        return refs[book]
+    return candidates(commentator, book)[0]
+
+
+def save_table(table: dict):
+    REFS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REFS_PATH.write_text(json.dumps(table, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+# ── Probing ───────────────────────────────────────────────────────────────────
+
+def probe(title: str) -> str | None:
+    """Canonical title if Sefaria's index knows this title (raises on network errors)."""
+    r = requests.get(INDEX_URL.format(title=url_ref(title)), headers=HEADERS, timeout=20)
+    if r.status_code == 404:
+        return None
+    r.raise_for_status()
+    data = r.json()
+    if not isinstance(data, dict) or "error" in data or not data.get("title"):
+        return None
+    return data["title"]
+
+
+def resolve(table: dict, refresh: bool = False) -> tuple[int, int]:
+    """Fill in the table; returns (probed, failed)."""
+    probed = failed = 0
+    for commentator, books in BOOKS.items():
+        refs = table["refs"].setdefault(commentator, {})
+        for book in books:
+            if book in refs and not refresh:
+                continue
+            try:
+                title = None
+                for candidate in candidates(commentator, book):
+                    title = probe(candidate)
+                    time.sleep(0.1)
+                    if title:
+                        break
+            except requests.RequestException as e:
+                print(f"  ✗ {commentator} / {book}: {type(e).__name__} — will retry next run")
+                failed += 1
+                continue
+            refs[book] = title
+            probed += 1
+            print(f"  {'✓' if title else '·'} {commentator:15s} {book:12s} {title or '—'}")
+    table["resolved_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    return probed, failed
+
+
+def upload(table: dict) -> bool:
+    import upload_commentaries as config
+
+    rows = [
+        {"commentator": c, "book": book, "ref": title, "resolved_at": table["resolved_at"]}
+        for c, books in table["refs"].items() for book, title in books.items()
+    ]
+    r = requests.post(f"{config.SUPABASE_URL}/rest/v1/sefaria_ref_aliases",
+                      headers=config.HEADERS, json=rows, timeout=60)
+    if r.status_code not in (200, 201, 204):
+        print(f"  ✗ Upload error {r.status_code}: {r.text[:300]}")
+        return False
+    print(f"  ✓ Uploaded {len(rows)} rows to sefaria_ref_aliases")
+    return True
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve Sefaria titles for every commentator × book.")
+    parser.add_argument("--refresh", action="store_true", help="re-probe entries already resolved")
+    parser.add_argument("--upload", action="store_true", help="upsert the table into Supabase")
+    parser.add_argument("--show", action="store_true", help="print the table and exit")
+    args = parser.parse_args()
+
+    table = load_table()
+    if args.show:
+        for c, books in table["refs"].items():
+            for book, title in books.items():
+                print(f"  {c:15s} {book:12s} {title or '—'}")
+        return
+
+    if args.upload:
+        import upload_commentaries as config
+        # upload_commentaries falls back to the anon key, which can't write sefaria_ref_aliases
+        if config.API_KEY == config.ANON_KEY:
+            print("✗ SUPABASE_SERVICE_ROLE_KEY not set (env or .env)")
+            sys.exit(1)
+
+    probed, failed = resolve(table, args.refresh)
+    if probed:
+        save_table(table)
+    found = sum(1 for books in table["refs"].values() for t in books.values() if t)
+    total = sum(len(books) for books in table["refs"].values())
+    print(f"\n  {probed} probed, {failed} failed — {found} of {total} resolved → {REFS_PATH}")
+    if args.upload:
+        upload(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+sync_client.py
+Reference client (and test harness) for the content change feed from
+migration 20261019020000_content_revisions.sql — what a device does to keep a
+local copy of commentaries / siddur / tehillim and pull
+only the deltas after each data release.
+
+One sync, starting from the stored revision N:
+  1. content_changes?revision=gt.N           which scopes changed or were deleted
+  2. {table}?revision=gt.N                   the current rows of those scopes
+  3. per changed scope: drop local rows, insert the fetched ones
+  4. check each scope's local checksum against the change's checksum
+  5. store the new N (only if every scope verified, so a sync racing an
+     upload is simply retried next time)
+
+Usage:
+    python scripts/sync_client.py                         # sync into scripts/.content_sync.sqlite3
+    python scripts/sync_client.py --db /tmp/copy.sqlite3
+    python scripts/sync_client.py --verify-all            # re-check every scope held locally
+    python scripts/sync_client.py --status
+
+Requirements: pip install requests
+"""
+import argparse
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+import requests
+
+from content_revisions import SCOPES, group_checksums
+
+DB_PATH   = Path(__file__).parent / ".content_sync.sqlite3"
+PAGE_SIZE = 1000
+
+# Columns a client keeps, and a total order for paging, per table
+COLUMNS = {
+    "commentaries":     ["commentator", "sefer_id", "perek", "pasuk", "comment_idx", "dibur_hamatchil", "text"],
+    "rashi_commentary": ["sefer_id", "perek", "pasuk", "text"],   # retired — only deletions arrive
+    "siddur":           ["nusach", "category", "cat_name", "section_idx", "title", "lines"],
+    "tehillim":         ["chapter", "title", "lines"],
+}
+ORDER = {
+    "commentaries":     "revision,id",
+    "rashi_commentary": "revision,id",
+    "siddur":           "revision,id",
+    "tehillim":         "revision,chapter",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS content (
+    table_name TEXT NOT NULL,
+    scope_key  TEXT NOT NULL,
+    data       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_content_scope ON content(table_name, scope_key);
+CREATE TABLE IF NOT EXISTS scopes (
+    table_name TEXT NOT NULL,
+    scope_key  TEXT NOT NULL,
+    revision   INTEGER NOT NULL,
+    checksum   TEXT NOT NULL,
+    PRIMARY KEY (table_name, scope_key)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def scope_key(table: str, scope: dict) -> str:
+    columns = SCOPES[table][0]
+    return json.dumps([scope[c] for c in columns], ensure_ascii=False)
+
+
+class SyncClient:
+    def __init__(self, supabase_url: str, headers: dict, db_path=DB_PATH):
+        self.base = f"{supabase_url}/rest/v1"
+        self.headers = {k: v for k, v in headers.items() if k != "Prefer"}
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+
+    # ── state ────────────────────────────────────────────────────────────────
+
+    @property
+    def revision(self) -> int:
+        row = self.conn.execute("SELECT value FROM sync_state WHERE key = 'revision'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _set_revision(self, revision: int):
+        self.conn.execute("INSERT OR REPLACE INTO sync_state VALUES ('revision', ?)", (str(revision),))
+
+    # ── server ───────────────────────────────────────────────────────────────
+
+    def _paged(self, path: str, params: dict) -> list[dict]:
+        out = []
+        while True:
+            r = requests.get(f"{self.base}/{path}", headers=self.headers, timeout=60,
+                             params={**params, "limit": PAGE_SIZE, "offset": len(out)})
+            r.raise_for_status()
+            page = r.json()
+            out.extend(page)
+            if len(page) < PAGE_SIZE:
+                return out
+
+    def changes_since(self, revision: int) -> list[dict]:
+        return self._paged("content_changes", {
+            "select": "revision,table_name,scope,checksum",
+            "revision": f"gt.{revision}", "order": "revision",
+        })
+
+    def rows_since(self, table: str, revision: int) -> list[dict]:
+        return self._paged(table, {
+            "select": ",".join(COLUMNS[table]),
+            "revision": f"gt.{revision}", "order": ORDER[table],
+        })
+
+    # ── local store ──────────────────────────────────────────────────────────
+
+    def local_rows(self, table: str, key: str) -> list[dict]:
+        return [json.loads(d) for (d,) in self.conn.execute(
+            "SELECT data FROM content WHERE table_name = ? AND scope_key = ?", (table, key))]
+
+    def local_checksum(self, table: str, key: str) -> str | None:
+        columns, line, order = SCOPES[table]
+        rows = self.local_rows(table, key)
+        if not rows:
+            return None
+        return next(iter(group_checksums(rows, lambda r: key, line, order).values()))[1]
+
+    # ── sync ─────────────────────────────────────────────────────────────────
+
+    def sync(self) -> dict:
+        since = self.revision
+        changes = self.changes_since(since)
+        if not changes:
+            return {"from": since, "to": since, "scopes": 0, "rows": 0, "failed": []}
+
+        latest: dict[tuple[str, str], dict] = {}     # last change per scope wins
+        for ch in changes:
+            latest[(ch["table_name"], scope_key(ch["table_name"], ch["scope"]))] = ch
+
+        fetched = 0
+        for table in sorted({t for t, _ in latest}):
+            rows = self.rows_since(table, since)
+            fetched += len(rows)
+            columns = SCOPES[table][0]
+            by_scope: dict[str, list[dict]] = {}
+            for row in rows:
+                by_scope.setdefault(json.dumps([row[c] for c in columns], ensure_ascii=False), []).append(row)
+
+            for (t, key), ch in latest.items():
+                if t != table:
+                    continue
+                self.conn.execute("DELETE FROM content WHERE table_name = ? AND scope_key = ?", (t, key))
+                self.conn.executemany(
+                    "INSERT INTO content VALUES (?, ?, ?)",
+                    [(t, key, json.dumps(r, ensure_ascii=False)) for r in by_scope.get(key, [])])
+                if ch["checksum"] is None:
+                    self.conn.execute("DELETE FROM scopes WHERE table_name = ? AND scope_key = ?", (t, key))
+                else:
+                    self.conn.execute("INSERT OR REPLACE INTO scopes VALUES (?, ?, ?, ?)",
+                                      (t, key, ch["revision"], ch["checksum"]))
+
+        failed = [(t, key) for (t, key), ch in latest.items()
+                  if self.local_checksum(t, key) != ch["checksum"]]
+        new_revision = max(ch["revision"] for ch in changes)
+        if not failed:
+            self._set_revision(new_revision)
+        self.conn.commit()
+        return {"from": since, "to": new_revision if not failed else since,
+                "scopes": len(latest), "rows": fetched, "failed": failed}
+
+    def verify_all(self) -> list[tuple[str, str]]:
+        """Every scope held locally whose content no longer matches its recorded checksum."""
+        return [(t, key) for t, key, checksum in
+                self.conn.execute("SELECT table_name, scope_key, checksum FROM scopes").fetchall()
+                if self.local_checksum(t, key) != checksum]
+
+    def status(self) -> dict:
+        counts = dict(self.conn.execute(
+            "SELECT table_name, COUNT(*) FROM content GROUP BY table_name").fetchall())
+        return {"revision": self.revision, "rows": counts}
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync a local copy of the reference texts.")
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    parser.add_argument("--verify-all", action="store_true", help="re-check every local scope")
+    parser.add_argument("--status", action="store_true", help="show local revision and row counts")
+    args = parser.parse_args()
+
+    import upload_commentaries as config
+    client = SyncClient(config.SUPABASE_URL, config.HEADERS, args.db)
+
+    if args.status:
+        print(json.dumps(client.status(), indent=2))
+        return
+    if args.verify_all:
+        bad = client.verify_all()
+        print(f"{len(bad)} scope(s) don't match their checksum")
+        for t, key in bad:
+            print(f"  ✗ {t} {key}")
+        return
+
+    started = time.monotonic()
+    result = client.sync()
+    print(f"Revision {result['from']} → {result['to']}: {result['scopes']} scope(s), "
+          f"{result['rows']} row(s) in {time.monotonic() - started:.1f}s")
+    for t, key in result["failed"]:
+        print(f"  ✗ {t} {key} — checksum mismatch, will retry on next sync")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The scripts import each other as top-level modules (import upload_commentaries as config)
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+import batch_upload
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    """A fake REST endpoint that rejects rows whose id is in server.bad, and records every request."""
+    class Server:
+        bad: set = set()
+        status = 400
+        calls: list = []
+        inserted: list = []
+        dead_letters = tmp_path / "dead.jsonl"
+
+    def post_rows(url, headers, rows, timeout=60):
+        Server.calls.append([r["id"] for r in rows])
+        if Server.status >= 500:
+            return Server.status, "upstream timeout"
+        if any(r["id"] in Server.bad for r in rows):
+            return Server.status, "value too long"
+        Server.inserted.extend(r["id"] for r in rows)
+        return 201, ""
+
+    original = batch_upload.write_dead_letters
+    monkeypatch.setattr(batch_upload, "post_rows", post_rows)
+    monkeypatch.setattr(batch_upload, "write_dead_letters",
+                        lambda *args: original(*args, path=Server.dead_letters))
+    Server.calls, Server.inserted = [], []
+    return Server
+
+
+def rows(n):
+    return [{"id": i} for i in range(n)]
+
+
+def dead(server):
+    if not server.dead_letters.exists():
+        return []
+    return [json.loads(line) for line in server.dead_letters.read_text(encoding="utf-8").splitlines()]
+
+
+def test_clean_batch_goes_in_whole(server):
+    assert batch_upload.insert_isolating("t", "url", {}, rows(8), "src") == 0
+    assert server.calls == [list(range(8))]
+    assert dead(server) == []
+
+
+def test_bisection_isolates_the_bad_rows(server):
+    server.bad = {3, 12}
+    assert batch_upload.insert_isolating("t", "url", {}, rows(16), "src") == 2
+    assert sorted(server.inserted) == [i for i in range(16) if i not in server.bad]
+    letters = dead(server)
+    assert [d["row"]["id"] for d in letters] == [3, 12]
+    assert {(d["table"], d["source"], d["status"], d["error"]) for d in letters} == \
+        {("t", "src", 400, "value too long")}
+    # one bad row costs about 2·log2(n) requests, not n
+    assert len(server.calls) < 16
+
+
+@pytest.mark.parametrize("status", [409, 429, 503])
+def test_non_data_errors_fail_the_batch(server, status):
+    server.bad, server.status = {0}, status
+    assert batch_upload.insert_isolating("t", "url", {}, rows(4), "src") is None
+    assert server.calls == [[0, 1, 2, 3]]
+    assert dead(server) == []
@@ -0,0 +1,78 @@
+import copy
+import json
+
+import pytest
+
+import data_delta
+
+
+def chapter(perek, text="פסוק"):
+    return {"perek": perek, "psukim": [{"pasuk": i, "text": f"{text} {perek}:{i}" * 20} for i in range(1, 12)]}
+
+
+def roundtrip(old, new):
+    ops = []
+    data_delta.diff(old, new, [], ops)
+    assert data_delta.apply_ops(copy.deepcopy(old), ops) == new
+    return ops
+
+
+@pytest.fixture
+def sefer():
+    return {"id": 1, "name": "בראשית", "chapters": [chapter(p) for p in range(1, 9)]}
+
+
+def test_identical_documents_need_no_ops(sefer):
+    assert roundtrip(sefer, copy.deepcopy(sefer)) == []
+
+
+def test_one_changed_chapter_is_replaced_alone(sefer):
+    new = copy.deepcopy(sefer)
+    new["chapters"][4] = chapter(5, "תיקון")
+    ops = roundtrip(sefer, new)
+    assert [op["path"] for op in ops] == [["chapters", 4]]
+    assert data_delta.encoded_size(ops) < data_delta.encoded_size(new) // 4
+
+
+def test_appended_removed_and_renamed_keys(sefer):
+    grown = copy.deepcopy(sefer)
+    grown["chapters"] += [chapter(9), chapter(10)]
+    grown["source"] = "sefaria"
+    roundtrip(sefer, grown)
+
+    shrunk = copy.deepcopy(sefer)
+    del shrunk["chapters"][5:]
+    del shrunk["name"]
+    ops = roundtrip(sefer, shrunk)
+    assert {"op": "truncate", "path": ["chapters"], "length": 5} in ops
+
+
+def test_patch_reproduces_the_file_bytes(sefer):
+    new = copy.deepcopy(sefer)
+    new["chapters"][2]["psukim"][3]["text"] = "תיקון"
+    old_raw = data_delta.serialize(sefer, {"indent": 2, "ensure_ascii": False, "trailer": "\n"})
+    new_raw = data_delta.serialize(new, {"indent": 2, "ensure_ascii": False, "trailer": "\n"})
+    patch = json.loads(data_delta.make_patch(old_raw, new_raw))
+    doc = data_delta.apply_ops(json.loads(old_raw), patch["ops"])
+    assert data_delta.serialize(doc, patch["format"]) == new_raw
+
+
+def test_reordered_keys_are_not_patched(sefer):
+    # equal as dicts, so diff() has nothing to say — the byte check must refuse the patch
+    new = {"chapters": sefer["chapters"], "name": sefer["name"], "id": sefer["id"]}
+    fmt = {"indent": 2, "ensure_ascii": False}
+    assert data_delta.make_patch(data_delta.serialize(sefer, fmt), data_delta.serialize(new, fmt)) is None
+
+
+def test_small_documents_are_replaced_whole():
+    assert roundtrip({"a": 1, "b": [1, 2]}, {"a": 2, "b": [1, 2]}) == [
+        {"op": "set", "path": [], "value": {"a": 2, "b": [1, 2]}}
+    ]
+
+
+def test_detect_format_reproduces_the_bytes(sefer):
+    for fmt in data_delta.FORMATS:
+        for trailer in ("", "\n"):
+            raw = data_delta.serialize(sefer, {**fmt, "trailer": trailer})
+            assert data_delta.serialize(sefer, data_delta.detect_format(sefer, raw)) == raw
+    assert data_delta.detect_format(sefer, b'{"id":1}') is None
@@ -0,0 +1,51 @@
+import pytest
+
+fontTools = pytest.importorskip("fontTools")
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+import generate_vector_icons as gvi
+
+
+@pytest.fixture(scope="module")
+def hebrew_font(tmp_path_factory):
+    """A TrueType font whose ת ו ר ה are slanted boxes — enough to exercise the outline path."""
+    letters = {"tav": 0x05EA, "vav": 0x05D5, "resh": 0x05E8, "he": 0x05D4}
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder([".notdef", *letters])
+    fb.setupCharacterMap({code: name for name, code in letters.items()})
+    glyphs = {}
+    for name in [".notdef", *letters]:
+        pen = TTGlyphPen(None)
+        # no horizontal / vertical edges, so the SVG path is all x,y pairs
+        pen.moveTo((50, 0))
+        pen.lineTo((100, 700))
+        pen.lineTo((550, 690))
+        pen.lineTo((500, 10))
+        pen.closePath()
+        glyphs[name] = pen.glyph()
+    fb.setupGlyf(glyphs)
+    fb.setupHorizontalMetrics({name: (600, 50) for name in glyphs})
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({"familyName": "Test Hebrew", "styleName": "Regular"})
+    fb.setupOS2()
+    fb.setupPost()
+    path = tmp_path_factory.mktemp("fonts") / "test-hebrew.ttf"
+    fb.save(str(path))
+    return str(path)
+
+
+def test_every_output_passes_the_check(hebrew_font):
+    assert gvi.check(hebrew_font) == []
+
+
+def test_text_is_centred_in_the_viewbox(hebrew_font):
+    shapes = gvi.mark_shapes(hebrew_font)
+    xs = [float(n) for n in gvi.NUMBER.findall(shapes["text"])][0::2]
+    assert abs((min(xs) + max(xs)) / 2 - gvi.VIEWBOX / 2) < 1
+
+
+def test_check_reports_a_missing_text_path(hebrew_font):
+    path, content = next((p, c) for p, c in gvi.vector_outputs(hebrew_font).items() if p.suffix == ".svg")
+    broken = content.rsplit("<path", 1)[0] + "</svg>\n"
+    assert gvi.check_output(path, broken)
@@ -0,0 +1,34 @@
+import pytest
+
+from upload_commentaries import dibur_hamatchil, split_comments
+
+
+def test_split_comments_flattens_nested_lists():
+    assert split_comments("אחד") == ["אחד"]
+    assert split_comments([["אחד", ["שתים"]], "שלש", None, 4]) == ["אחד", "שתים", "שלש"]
+    assert split_comments(None) == []
+
+
+@pytest.mark.parametrize("raw, expected", [
+    # leading bold
+    ("<b>בְּרֵאשִׁית בָּרָא.</b> אֵין הַמִּקְרָא הַזֶּה אוֹמֵר", "בראשית ברא"),
+    ("  <b>וַיֹּאמֶר</b> <i>ה'</i> עוד", "ויאמר"),
+    # text before the first period or colon
+    ("בראשית ברא. אין המקרא הזה אומר אלא דרשני", "בראשית ברא"),
+    ("וְהָאָרֶץ הָיְתָה: תֹהוּ וָבֹהוּ", "והארץ היתה"),
+    ("<span>את השמים.</span> הקדים שמים", "את השמים"),
+    # quotes are kept, other punctuation is dropped
+    ("<b>ויאמר ה', יהי אור</b> וגו'", "ויאמר ה' יהי אור"),
+])
+def test_dibur_hamatchil(raw, expected):
+    assert dibur_hamatchil(raw) == expected
+
+
+@pytest.mark.parametrize("raw", [
+    "אין המקרא הזה אומר אלא דרשני כמו שדרשוהו רבותינו בשביל התורה. ועוד",  # a sentence, not a DH
+    "כמו שכתוב בפסוק הזה",                                                # no period
+    "<b>.,;</b> רק סימנים",
+    "",
+])
+def test_no_dibur_hamatchil(raw):
+    assert dibur_hamatchil(raw) is None
@@ -0,0 +1,58 @@
+import json
+
+from upload_cursor import UploadCursor, file_digest
+
+
+def test_digest_follows_the_file_content(tmp_path):
+    path = tmp_path / "Rashi_1.json"
+    path.write_text("{}", encoding="utf-8")
+    first = file_digest(path)
+    assert file_digest(path) == first
+    path.write_text('{"1": []}', encoding="utf-8")
+    assert file_digest(path) != first
+
+
+def test_resume_after_restart(tmp_path):
+    store = tmp_path / "cursors.json"
+    cursor = UploadCursor(store)
+    assert cursor.resume_index("commentaries:Rashi:1", "aaa") == 0
+    cursor.advance("commentaries:Rashi:1", "aaa", 500, "3:4")
+    cursor.advance("commentaries:Rashi:1", "aaa", 1000, "7:12")
+
+    reloaded = UploadCursor(store)
+    assert reloaded.resume_index("commentaries:Rashi:1", "aaa") == 1000
+    assert reloaded.get("commentaries:Rashi:1", "aaa")["last"] == "7:12"
+    assert not reloaded.is_complete("commentaries:Rashi:1", "aaa")
+    assert reloaded.resume_index("commentaries:Ramban:1", "aaa") == 0
+
+
+def test_changed_file_starts_over(tmp_path):
+    cursor = UploadCursor(tmp_path / "cursors.json")
+    cursor.advance("k", "old", 500, "3:4")
+    assert cursor.resume_index("k", "new") == 0
+    assert cursor.get("k", "new") is None
+
+
+def test_finish_and_reset(tmp_path):
+    store = tmp_path / "cursors.json"
+    cursor = UploadCursor(store)
+    cursor.advance("k", "aaa", 500, "3:4")
+    cursor.finish("k", "aaa", 800)
+
+    reloaded = UploadCursor(store)
+    assert reloaded.is_complete("k", "aaa")
+    assert reloaded.resume_index("k", "aaa") == 0
+    assert reloaded.get("k", "aaa")["last"] == "3:4"
+
+    reloaded.reset("k")
+    assert json.loads(store.read_text(encoding="utf-8")) == {}
+    assert not store.with_suffix(".tmp").exists()
+
+
+def test_unreadable_store_starts_fresh(tmp_path):
+    store = tmp_path / "cursors.json"
+    store.write_text("{not json", encoding="utf-8")
+    cursor = UploadCursor(store)
+    assert cursor.resume_index("k", "aaa") == 0
+    cursor.advance("k", "aaa", 10, "1:1")
+    assert UploadCursor(store).resume_index("k", "aaa") == 10
@@ -0,0 +1,86 @@
+"""
+upload_cursor.py
+Persisted resume points for the batch uploaders (upload_commentaries.py,
+upload_siddur.py), so an interrupted or failed upload continues from the last
+acknowledged batch instead of being skipped as "already in DB" or resent from
+the start with --force.
+
+One cursor per source file, in scripts/.upload_cursors.json:
+    "commentaries:Rashi:1": {"digest": "<sha256 of the file>", "done": 1500,
+                             "last": "12:7", "complete": false, "updated_at": "..."}
+`done` counts the rows acknowledged so far (rows are built deterministically
+from the file, so it is an exact resume index) and `last` is the human-readable
+position of the last one (perek:pasuk, or category/section for the siddur).
+A cursor only applies while the file's digest is unchanged — edit the file and
+the next upload starts over.  Every advance is written to disk atomically.
+
+Usage (from an uploader):
+    cursor = UploadCursor()
+    digest = file_digest(path)
+    start = cursor.resume_index(key, digest)          # 0 when starting fresh
+    ...after each acknowledged batch:
+    cursor.advance(key, digest, done, last)
+    cursor.finish(key, digest, done)
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+CURSOR_PATH = Path(__file__).parent / ".upload_cursors.json"
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class UploadCursor:
+    def __init__(self, path: Path = CURSOR_PATH):
+        self.path = Path(path)
+        self.cursors: dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                self.cursors = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                print(f"  ⚠ unreadable {self.path.name} — uploads start from the beginning")
+
+    def get(self, key: str, digest: str) -> dict | None:
+        """The cursor for key, if it was recorded for this exact file content."""
+        cur = self.cursors.get(key)
+        return cur if cur and cur.get("digest") == digest else None
+
+    def is_complete(self, key: str, digest: str) -> bool:
+        cur = self.get(key, digest)
+        return bool(cur and cur.get("complete"))
+
+    def resume_index(self, key: str, digest: str) -> int:
+        """Rows already acknowledged for this file content (0 if none / complete / changed)."""
+        cur = self.get(key, digest)
+        return cur["done"] if cur and not cur.get("complete") else 0
+
+    def advance(self, key: str, digest: str, done: int, last: str):
+        self._set(key, {"digest": digest, "done": done, "last": last, "complete": False})
+
+    def finish(self, key: str, digest: str, done: int):
+        last = (self.cursors.get(key) or {}).get("last", "")
+        self._set(key, {"digest": digest, "done": done, "last": last, "complete": True})
+
+    def reset(self, key: str):
+        if self.cursors.pop(key, None) is not None:
+            self._save()
+
+    def _set(self, key: str, cur: dict):
+        cur["updated_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.cursors[key] = cur
+        self._save()
+
+    def _save(self):
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.cursors, ensure_ascii=False, indent=1, sort_keys=True) + "\n",
+                       encoding="utf-8")
+        os.replace(tmp, self.path)
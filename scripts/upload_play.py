@@ -1,57 +1,70 @@
-import sys
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+"""
+upload_play.py
+Uploads the release AAB to Google Play and assigns it to one or more tracks,
+all in a single edit (see play_publisher.py for the chunked, resumable upload).
+
+An interrupted upload is resumed from the last byte the server acknowledged
+when the script is re-run with the same AAB.
+
+Usage:
+    python scripts/upload_play.py                      # internal track
+    python scripts/upload_play.py internal alpha       # several tracks, one edit
+    python scripts/upload_play.py internal --chunk-mb 16
+    python scripts/upload_play.py internal --fake      # offline, against fake_play_api.py
+    python scripts/upload_play.py internal --fake http://127.0.0.1:8765 --aab test.aab
+
+Requirements: pip install requests google-auth
+"""
+import argparse
+
+from play_publisher import PlayPublisher, authorized_session
 
 KEY_FILE   = r"scripts\google-play-service-account.json"
 PACKAGE    = "com.torahapp.pash"
 AAB_PATH   = r"android\app\build\outputs\bundle\release\app-release.aab"
-TRACK      = sys.argv[1] if len(sys.argv) > 1 else "internal"
-
-SCOPES = ["https://www.googleapis.com/auth/androidpublisher"]
-
-print(f"  Package : {PACKAGE}")
-print(f"  Track   : {TRACK}")
-print(f"  AAB     : {AAB_PATH}")
-print()
-
-creds   = service_account.Credentials.from_service_account_file(KEY_FILE, scopes=SCOPES)
-service = build("androidpublisher", "v3", credentials=creds)
-
-# Create edit
-edit    = service.edits().insert(body={}, packageName=PACKAGE).execute()
-eid     = edit["id"]
-print(f"  Edit ID : {eid}")
-
-# Upload AAB
-print("  Uploading AAB...")
-media  = MediaFileUpload(AAB_PATH, mimetype="application/octet-stream", resumable=True)
-upload = service.edits().bundles().upload(packageName=PACKAGE, editId=eid, media_body=media).execute()
-vc = upload["versionCode"]
-print(f"  Version Code: {vc}")
-
-# Assign to track
-service.edits().tracks().update(
-    packageName=PACKAGE,
-    editId=eid,
-    track=TRACK,
-    body={
-        "releases": [{
-            "versionCodes": [str(vc)],
-            "status": "completed",
-            "releaseNotes": [
-                {"language": "he-IL", "text": "הוספת 8 מפרשים: רש\"י, רמב\"ן, אבן עזרא, ספורנו, אור החיים, כלי יקר, חזקוני, מלבי\"ם. תיקון תצוגה ושיפורי ביצועים"},
-                {"language": "en-US", "text": "Added 8 commentators: Rashi, Ramban, Ibn Ezra, Sforno, Or HaChaim, Kli Yakar, Chizkuni, Malbim. Display fixes and performance improvements"},
-            ]
-        }]
-    }
-).execute()
-print(f"  Track '{TRACK}' updated")
-
-# Commit
-service.edits().commit(packageName=PACKAGE, editId=eid).execute()
-
-print()
-print("  ========================================")
-print(f"  SUCCESS! Version {vc} uploaded to {TRACK}")
-print("  ========================================")
+
+RELEASE_NOTES = [
+    {"language": "he-IL", "text": "הוספת 8 מפרשים: רש\"י, רמב\"ן, אבן עזרא, ספורנו, אור החיים, כלי יקר, חזקוני, מלבי\"ם. תיקון תצוגה ושיפורי ביצועים"},
+    {"language": "en-US", "text": "Added 8 commentators: Rashi, Ramban, Ibn Ezra, Sforno, Or HaChaim, Kli Yakar, Chizkuni, Malbim. Display fixes and performance improvements"},
+]
+
+
+def make_publisher(fake: str | None, **kwargs) -> PlayPublisher:
+    """Real API with the service account, or the local fake (started in-process if no URL)."""
+    if fake is None:
+        return PlayPublisher(authorized_session(KEY_FILE), PACKAGE, **kwargs)
+
+    import requests
+    if fake == "local":
+        from fake_play_api import start_fake_server
+        _, fake = start_fake_server()
+    print(f"  Using fake Play API at {fake}")
+    return PlayPublisher(requests.Session(), PACKAGE, base_url=fake, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload the AAB and assign it to track(s).")
+    parser.add_argument("tracks", nargs="*", default=["internal"])
+    parser.add_argument("--aab", default=AAB_PATH)
+    parser.add_argument("--chunk-mb", type=int, default=8,
+                        help="upload chunk size in MiB (default 8)")
+    parser.add_argument("--fake", nargs="?", const="local", default=None,
+                        help="use the fake API (optionally at URL) instead of Google Play")
+    args = parser.parse_args()
+
+    print(f"  Package : {PACKAGE}")
+    print(f"  Tracks  : {', '.join(args.tracks)}")
+    print(f"  AAB     : {args.aab}")
+    print()
+
+    publisher = make_publisher(args.fake, chunk_size=args.chunk_mb * 1024 * 1024)
+    vc = publisher.publish(args.aab, args.tracks, RELEASE_NOTES)
+
+    print()
+    print("  ========================================")
+    print(f"  SUCCESS! Version {vc} uploaded to {', '.join(args.tracks)}")
+    print("  ========================================")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,16 @@ Usage:
     .venv-1/Scripts/python.exe scripts/upload_siddur.py            # all 4 nusachim
     .venv-1/Scripts/python.exe scripts/upload_siddur.py sefard     # one nusach only
     .venv-1/Scripts/python.exe scripts/upload_siddur.py --force    # re-upload existing
+    .venv-1/Scripts/python.exe scripts/upload_siddur.py --restart  # ignore unfinished-upload cursors
+    .venv-1/Scripts/python.exe scripts/upload_siddur.py --gzip     # gzip+base64 RPC payloads
+
+Sections are sent through the bulk_upsert_siddur RPC (migration
+20261019070000_bulk_upsert.sql), a few MB per request, with REST batches as
+the fallback.
+
+A nusach that stops part-way resumes from its last acknowledged batch on the
+next run (scripts/.upload_cursors.json, see upload_cursor.py).  Sections the
+server rejects are isolated by bisection and dead-lettered (batch_upload.py).
 
 Requirements (already in .venv-1): pip install requests
 """
@@ -17,6 +27,10 @@ import time
 import requests
 from pathlib import Path
 
+from content_revisions import stamp_rows
+from batch_upload import DEAD_LETTER_PATH, BulkUpserter, without_dead_letters
+from upload_cursor import UploadCursor, file_digest
+
 # ── Config ────────────────────────────────────────────────────────────────────
 SUPABASE_URL = "https://mocukhvfqqzkekphifsr.supabase.co"
 ANON_KEY = (
@@ -46,6 +60,7 @@ HEADERS = {
 
 DATA_DIR = Path(__file__).parent.parent / "src" / "data" / "siddur"
 BATCH_SIZE = 200
+INSERT_URL = f"{SUPABASE_URL}/rest/v1/siddur?on_conflict=nusach,category,section_idx"
 
 NUSACHIM = ["sefard", "ashkenaz", "edot_hamizrach", "chabad"]
 
@@ -60,8 +75,7 @@ CATEGORIES_ORDER = [
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 def insert_batch(rows: list[dict]) -> bool:
-    url = f"{SUPABASE_URL}/rest/v1/siddur"
-    r = requests.post(url, headers=HEADERS, json=rows, timeout=60)
+    r = requests.post(INSERT_URL, headers=HEADERS, json=rows, timeout=60)
     if r.status_code not in (200, 201):
         print(f"    ✗ Insert error {r.status_code}: {r.text[:300]}")
         return False
@@ -79,80 +93,110 @@ def count_existing(nusach: str) -> int:
         return 0
 
 
-def upload_nusach(nusach: str, force: bool = False):
-    path = DATA_DIR / f"siddur_{nusach}.json"
-    if not path.exists():
-        print(f"  ✗ File not found: {path}")
-        return
-
-    print(f"\n{'='*50}")
-    print(f"  Nusach: {nusach}  ← {path.name}  ({path.stat().st_size // 1024}KB)")
-
-    existing = count_existing(nusach)
-    if existing > 0 and not force:
-        print(f"  Already in DB: {existing} rows — skipping. (use --force to re-upload)")
-        return
+def sorted_categories(data: dict) -> list[str]:
+    """Category ids in CATEGORIES_ORDER, unknown ones last."""
+    return sorted(data.keys(), key=lambda k: CATEGORIES_ORDER.index(k) if k in CATEGORIES_ORDER else 99)
 
-    with open(path, encoding="utf-8") as f:
-        data = json.load(f)
-
-    # Sort categories by preferred order
-    cat_keys = sorted(data.keys(), key=lambda k: CATEGORIES_ORDER.index(k) if k in CATEGORIES_ORDER else 99)
 
+def build_rows(nusach: str, data: dict) -> list[dict]:
+    """One table row per section of a siddur_{nusach}.json file."""
     rows = []
-    total = 0
-
-    for cat_id in cat_keys:
+    for cat_id in sorted_categories(data):
         cat = data[cat_id]
         cat_name = cat.get("name", cat_id)
-        sections = cat.get("sections", [])
-        print(f"    {cat_id}: {len(sections)} sections...")
-
-        for idx, section in enumerate(sections):
-            title = section.get("title", "")
-            lines = section.get("lines", [])
+        for idx, section in enumerate(cat.get("sections", [])):
             rows.append({
                 "nusach":      nusach,
                 "category":    cat_id,
                 "cat_name":    cat_name,
                 "section_idx": idx,
-                "title":       title,
-                "lines":       lines,
+                "title":       section.get("title", ""),
+                "lines":       section.get("lines", []),
             })
-            total += 1
+    return rows
 
-            if len(rows) >= BATCH_SIZE:
-                if not insert_batch(rows):
-                    print("    FAILED — aborting this nusach.")
-                    return
-                rows = []
-                time.sleep(0.15)
 
-    if rows:
-        if not insert_batch(rows):
-            print("    Final batch FAILED.")
-            return
+def upload_nusach(nusach: str, force: bool = False, restart: bool = False, gzip: bool = False) -> bool:
+    """
+    Upload one nusach through bulk_upsert_siddur (batch_upload.BulkUpserter),
+    resuming from its cursor (upload_cursor.py). False on failure.
+    """
+    path = DATA_DIR / f"siddur_{nusach}.json"
+    if not path.exists():
+        print(f"  ✗ File not found: {path}")
+        return False
 
-    print(f"  ✓ Done: {total} sections uploaded.")
+    print(f"\n{'='*50}")
+    print(f"  Nusach: {nusach}  ← {path.name}  ({path.stat().st_size // 1024}KB)")
+
+    cursor = UploadCursor()
+    key = f"siddur:{nusach}"
+    digest = file_digest(path)
+    start = 0 if restart else cursor.resume_index(key, digest)
+
+    if start:
+        print(f"  Resuming after {cursor.get(key, digest)['last']} ({start} sections already acknowledged)")
+    elif not force:
+        if cursor.is_complete(key, digest):
+            print(f"  Already uploaded (file unchanged) — skipping. (use --force to re-upload)")
+            return True
+        existing = count_existing(nusach)
+        if existing > 0:
+            print(f"  Already in DB: {existing} rows — skipping. (use --force to re-upload)")
+            return True
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    for cat_id in sorted_categories(data):
+        print(f"    {cat_id}: {len(data[cat_id].get('sections', []))} sections...")
+
+    rows = build_rows(nusach, data)
+    upserter = BulkUpserter("siddur", "bulk_upsert_siddur", INSERT_URL, HEADERS,
+                            BATCH_SIZE, SUPABASE_URL, gzip=gzip)
+    dead = 0
+    for end, chunk in upserter.chunks(rows, start):
+        rejected = upserter.send(chunk, key)
+        if rejected is None:
+            print(f"    FAILED — stopping this nusach; re-run to resume from section {end - len(chunk)}.")
+            return False
+        dead += rejected
+        last = chunk[-1]
+        cursor.advance(key, digest, end, f"{last['category']}/{last['section_idx']}")
+        time.sleep(0.15)
+
+    cursor.finish(key, digest, len(rows))
+    print(f"  ✓ Done: {len(rows) - dead} sections uploaded.")
+    if dead:
+        print(f"  ⚠ {dead} rejected section(s) in {DEAD_LETTER_PATH.name} — python scripts/batch_upload.py replay")
+    stamp_rows("siddur", without_dead_letters(rows, key), SUPABASE_URL, HEADERS)
+    return True
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 
 def main():
-    args = [a for a in sys.argv[1:] if a != "--force"]
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
     force = "--force" in sys.argv
+    restart = "--restart" in sys.argv
+    gzip = "--gzip" in sys.argv
 
     target = args[0] if args else None
     nusachim_to_upload = [target] if target else NUSACHIM
 
     print("Siddur Upload")
     print("=" * 50)
+    failed = []
     for nusach in nusachim_to_upload:
         if nusach not in NUSACHIM:
             print(f"Unknown nusach: {nusach}. Valid: {NUSACHIM}")
             continue
-        upload_nusach(nusach, force=force)
+        if not upload_nusach(nusach, force=force, restart=restart, gzip=gzip):
+            failed.append(nusach)
 
+    if failed:
+        print(f"\n✗ Stopped part-way: {', '.join(failed)} — re-run to resume.")
+        sys.exit(1)
     print("\n✓ Upload complete.")
     print("Now you can remove the large JSON files from the bundle if desired.")
 
@@ -14,6 +14,8 @@ import requests
 import sys
 from pathlib import Path
 
+from content_revisions import stamp_rows
+
 # ── Config ────────────────────────────────────────────────────────────────────
 SUPABASE_URL = "https://mocukhvfqqzkekphifsr.supabase.co"
 ANON_KEY = (
@@ -44,6 +46,20 @@ HEADERS = {
 TEHILLIM_PATH = Path(__file__).parent.parent / "src" / "data" / "tehillim.json"
 
 
+# ── Helpers ───────────────────────────────────────────────────────────────────
+def build_rows(data: dict) -> list[dict]:
+    """One table row per chapter of tehillim.json, in chapter order."""
+    rows = []
+    for ch_str, ch_data in data.items():
+        rows.append({
+            "chapter": int(ch_str),
+            "title":   ch_data.get("title", f"תהלים פרק {ch_str}"),
+            "lines":   ch_data.get("lines", []),
+        })
+    rows.sort(key=lambda r: r["chapter"])
+    return rows
+
+
 # ── Main ──────────────────────────────────────────────────────────────────────
 def main():
     if not TEHILLIM_PATH.exists():
@@ -57,15 +73,7 @@ def main():
     with open(TEHILLIM_PATH, encoding="utf-8") as f:
         data = json.load(f)
 
-    rows = []
-    for ch_str, ch_data in data.items():
-        rows.append({
-            "chapter": int(ch_str),
-            "title":   ch_data.get("title", f"תהלים פרק {ch_str}"),
-            "lines":   ch_data.get("lines", []),
-        })
-
-    rows.sort(key=lambda r: r["chapter"])
+    rows = build_rows(data)
     print(f"  Uploading {len(rows)} chapters ...")
 
     url = f"{SUPABASE_URL}/rest/v1/tehillim"
@@ -75,6 +83,7 @@ def main():
         sys.exit(1)
 
     print(f"✓ Done: {len(rows)} chapters uploaded to Supabase.")
+    stamp_rows("tehillim", rows, SUPABASE_URL, HEADERS)
 
 
 if __name__ == "__main__":
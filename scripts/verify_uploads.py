@@ -0,0 +1,211 @@
+"""
+verify_uploads.py
+Checks that what is in Supabase matches the local JSON, chapter by chapter,
+and re-uploads whatever doesn't.
+
+Checksums are computed locally from the same rows the upload scripts build
+and compared with the per-chapter md5(string_agg(...)) returned by the RPCs in
+migration 20261019000000_content_checksums.sql — one query per table (one per
+commentator for commentaries), so a full check takes seconds and catches
+wrong or truncated text, not just missing rows.
+
+Usage:
+    python scripts/verify_uploads.py                       # verify all 3 tables, repair mismatches
+    python scripts/verify_uploads.py commentaries siddur   # only these tables
+    python scripts/verify_uploads.py --check-only          # report, don't re-upload
+
+Requirements: pip install requests
+"""
+import argparse
+import sys
+import time
+from collections import defaultdict
+
+import requests
+
+import upload_commentaries as commentaries
+import upload_siddur as siddur
+from content_revisions import (comment_order, deleted_change, group_checksums, local_rows, pasuk_line,
+                               scope_changes, siddur_line, stamp, tehillim_line)
+
+SUPABASE_URL = commentaries.SUPABASE_URL
+HEADERS      = commentaries.HEADERS
+TABLES       = ["commentaries", "siddur", "tehillim"]   # Rashi is part of commentaries
+
+
+# ── Checksums ─────────────────────────────────────────────────────────────────
+
+def rpc(name: str, params: dict | None = None) -> list[dict]:
+    r = requests.post(f"{SUPABASE_URL}/rest/v1/rpc/{name}", headers=HEADERS,
+                      json=params or {}, timeout=60)
+    if r.status_code != 200:
+        print(f"  ✗ RPC {name} failed {r.status_code}: {r.text[:300]}")
+        print("    Apply supabase/migrations/20261019000000_content_checksums.sql first.")
+        sys.exit(1)
+    return r.json()
+
+
+def remote_checksums(records: list[dict], key) -> dict:
+    return {key(rec): (rec["row_count"], rec["checksum"]) for rec in records}
+
+
+def compare(local: dict, remote: dict) -> list[tuple]:
+    """[(key, reason)] for every group that differs."""
+    problems = []
+    for k in sorted(set(local) | set(remote)):
+        if k not in remote:
+            problems.append((k, f"missing in DB ({local[k][0]} rows)"))
+        elif k not in local:
+            problems.append((k, f"extra in DB ({remote[k][0]} rows)"))
+        elif local[k] != remote[k]:
+            problems.append((k, f"checksum mismatch (local {local[k][0]} rows, DB {remote[k][0]})"))
+    return problems
+
+
+# ── Repair ────────────────────────────────────────────────────────────────────
+
+def replace_rows(table: str, filters: dict, rows: list[dict], insert_batch, key_cols: tuple) -> bool:
+    """
+    Make the rows matching filters exactly rows (the correct content): upsert
+    rows first, then delete only the DB rows whose key_cols aren't among them.
+    Each step leaves the chapter readable — a failure part-way never empties it.
+    """
+    if not all(insert_batch(rows[i:i + 500]) for i in range(0, len(rows), 500)):
+        return False
+
+    query = "&".join(f"{col}=eq.{val}" for col, val in filters.items())
+    r = requests.get(f"{SUPABASE_URL}/rest/v1/{table}?{query}&select=id,{','.join(key_cols)}",
+                     headers=HEADERS, timeout=60)
+    if r.status_code != 200:
+        print(f"    ✗ Select error {r.status_code}: {r.text[:300]}")
+        return False
+    wanted = {tuple(row[c] for c in key_cols) for row in rows}
+    surplus = [row["id"] for row in r.json() if tuple(row[c] for c in key_cols) not in wanted]
+    for i in range(0, len(surplus), 100):
+        ids = ",".join(surplus[i:i + 100])
+        r = requests.delete(f"{SUPABASE_URL}/rest/v1/{table}?{query}&id=in.({ids})", headers=HEADERS, timeout=60)
+        if r.status_code not in (200, 204):
+            print(f"    ✗ Delete error {r.status_code}: {r.text[:300]}")
+            return False
+    return True
+
+
+# ── Per-table verification ────────────────────────────────────────────────────
+
+def record_repairs(table: str, repaired_rows: list[dict], deleted_scopes: list[dict]):
+    """Give repaired / deleted scopes new revisions so syncing clients pick them up."""
+    changes = scope_changes(table, repaired_rows) + [deleted_change(table, s) for s in deleted_scopes]
+    if changes:
+        stamp(changes, SUPABASE_URL, HEADERS)
+
+
+def verify_commentaries(fix: bool) -> int:
+    by_commentator = defaultdict(list)
+    for row in local_rows("commentaries"):
+        by_commentator[row["commentator"]].append(row)
+
+    key = lambda r: (r["sefer_id"], r["perek"])
+    bad = 0
+    for commentator, rows in by_commentator.items():
+        local = group_checksums(rows, key, pasuk_line, comment_order)
+        remote = remote_checksums(rpc("commentary_checksums", {"p_commentator": commentator}), key)
+        problems = compare(local, remote)
+        print(f"    {commentator}: {len(local)} chapters, {len(problems)} bad")
+        repaired, deleted = [], []
+        for (sefer_id, perek), reason in problems:
+            print(f"      ✗ {commentator} {sefer_id}:{perek} — {reason}")
+            if fix:
+                chapter = [r for r in rows if key(r) == (sefer_id, perek)]
+                filters = {"commentator": commentator, "sefer_id": sefer_id, "perek": perek}
+                if replace_rows("commentaries", filters, chapter, commentaries.insert_batch,
+                                ("pasuk", "comment_idx")):
+                    print(f"        ↻ re-uploaded {len(chapter)} rows")
+                    repaired.extend(chapter)
+                    if not chapter:
+                        deleted.append(filters)
+        record_repairs("commentaries", repaired, deleted)
+        bad += len(problems)
+    return bad
+
+
+def verify_siddur(fix: bool) -> int:
+    rows = local_rows("siddur")
+
+    key = lambda r: (r["nusach"], r["category"])
+    local = group_checksums(rows, key, siddur_line, lambda r: r["section_idx"])
+    remote = remote_checksums(rpc("siddur_checksums"), key)
+    problems = compare(local, remote)
+    print(f"    {len(local)} categories, {len(problems)} bad")
+    repaired, deleted = [], []
+    for (nusach, category), reason in problems:
+        print(f"      ✗ {nusach}/{category} — {reason}")
+        if fix:
+            sections = [r for r in rows if key(r) == (nusach, category)]
+            if replace_rows("siddur", {"nusach": nusach, "category": category},
+                            sections, siddur.insert_batch, ("section_idx",)):
+                print(f"        ↻ re-uploaded {len(sections)} sections")
+                repaired.extend(sections)
+                # sections past the local count existed only in the DB and are gone now
+                db_count = remote.get((nusach, category), (0, None))[0]
+                deleted.extend({"nusach": nusach, "category": category, "section_idx": idx}
+                               for idx in range(len(sections), db_count))
+    record_repairs("siddur", repaired, deleted)
+    return len(problems)
+
+
+def verify_tehillim(fix: bool) -> int:
+    rows = local_rows("tehillim")
+
+    key = lambda r: r["chapter"]
+    local = group_checksums(rows, key, tehillim_line, key)
+    problems = compare(local, remote_checksums(rpc("tehillim_checksums"), key))
+    print(f"    {len(local)} chapters, {len(problems)} bad")
+    for chapter, reason in problems:
+        print(f"      ✗ Tehillim {chapter} — {reason}")
+    fixable = [r for r in rows if any(r["chapter"] == ch for ch, _ in problems)]
+    if fix and fixable:
+        # chapter is the primary key, so a merge-duplicates upsert overwrites in place
+        r = requests.post(f"{SUPABASE_URL}/rest/v1/tehillim", headers=HEADERS, json=fixable, timeout=120)
+        if r.status_code in (200, 201):
+            print(f"        ↻ re-uploaded {len(fixable)} chapters")
+            record_repairs("tehillim", fixable, [])
+        else:
+            print(f"    ✗ Upsert error {r.status_code}: {r.text[:300]}")
+    return len(problems)
+
+
+VERIFIERS = {
+    "commentaries":     verify_commentaries,
+    "siddur":           verify_siddur,
+    "tehillim":         verify_tehillim,
+}
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify uploaded tables against local JSON.")
+    parser.add_argument("tables", nargs="*", help=f"any of {', '.join(TABLES)} (default: all)")
+    parser.add_argument("--check-only", action="store_true", help="report mismatches, don't re-upload")
+    args = parser.parse_args()
+    unknown = set(args.tables) - set(TABLES)
+    if unknown:
+        parser.error(f"unknown table(s): {', '.join(sorted(unknown))}")
+
+    started = time.monotonic()
+    total_bad = 0
+    for table in args.tables or TABLES:
+        t0 = time.monotonic()
+        print(f"\n  {table}")
+        bad = VERIFIERS[table](fix=not args.check_only)
+        total_bad += bad
+        print(f"    {'✓ OK' if not bad else f'✗ {bad} bad'}  ({time.monotonic() - t0:.1f}s)")
+
+    print(f"\n{'='*60}")
+    print(f"Verified in {time.monotonic() - started:.1f}s — {total_bad} chapter(s) "
+          f"{'differ' if args.check_only else 'repaired'}.")
+    sys.exit(1 if total_bad and args.check_only else 0)
+
+
+if __name__ == "__main__":
+    main()
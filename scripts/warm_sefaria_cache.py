@@ -0,0 +1,178 @@
+"""
+warm_sefaria_cache.py
+Pre-warms the sefaria_cache table (migration 20261019040000_sefaria_cache.sql)
+with whole books of the commentators that aren't in the commentaries table —
+everything fetch-sefaria would otherwise proxy from Sefaria verse by verse.
+
+Each book is fetched in one request with the download_commentaries machinery,
+using the resolved title from resolve_refs.py, and stored as one row per
+verse keyed by the exact ref fetch-sefaria asks for ("<title> <perek>:<pasuk>").
+Verses Sefaria has nothing for are stored as '' so they aren't asked again.
+
+A book is skipped while all of its cached rows are still fresh (--ttl-days),
+and warming stops once --max-mb of text has been written in this run.
+
+Usage:
+    python scripts/warm_sefaria_cache.py                        # every uncached commentator, Torah
+    python scripts/warm_sefaria_cache.py Alshich Beur_HaGra     # only these
+    python scripts/warm_sefaria_cache.py --ttl-days 60 --max-mb 200
+    python scripts/warm_sefaria_cache.py --force                # ignore freshness
+    python scripts/warm_sefaria_cache.py --usage                # bytes per commentator / book
+
+Requirements: pip install requests
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+import download_commentaries as commentaries
+import resolve_refs
+import upload_commentaries as config
+from download_neviim import flatten
+
+TTL_DAYS     = 30
+MAX_MB       = 500
+INSERT_BATCH = 500
+
+# Commentators with their own table rows — fetch-sefaria never sees these
+UPLOADED = {c[0] for c in commentaries.COMMENTARIES}
+
+
+def cache_targets(only: list[str]) -> list[tuple[str, str, str]]:
+    """(commentator, book, title) for every book Sefaria has, per resolve_refs."""
+    names = only or [c for c in resolve_refs.ALIASES if c not in UPLOADED]
+    table = resolve_refs.load_table()["refs"]
+    out = []
+    for commentator in names:
+        for book in resolve_refs.BOOKS.get(commentator, resolve_refs.TORAH):
+            if book not in table.get(commentator, {}) and book not in resolve_refs.TORAH:
+                continue                          # Nevi'im only once resolved
+            title = resolve_refs.resolved(commentator, book)
+            if title:
+                out.append((commentator, book, title))
+    return out
+
+
+# ── Cache table ───────────────────────────────────────────────────────────────
+
+def is_fresh(commentator: str, book: str, now: datetime) -> bool:
+    """True if the book has cached rows and none of them has expired."""
+    r = requests.get(f"{config.SUPABASE_URL}/rest/v1/sefaria_cache",
+                     headers=config.HEADERS, timeout=30,
+                     params={"select": "expires_at", "commentator": f"eq.{commentator}",
+                             "book": f"eq.{book}", "order": "expires_at.asc", "limit": 1})
+    r.raise_for_status()
+    rows = r.json()
+    return bool(rows) and datetime.fromisoformat(rows[0]["expires_at"]) > now
+
+
+def book_rows(commentator: str, book: str, title: str, text: list, expires: datetime) -> list[dict]:
+    rows = []
+    for perek, chapter in enumerate(text, start=1):
+        if not isinstance(chapter, list):
+            continue
+        for pasuk, value in enumerate(chapter, start=1):
+            rows.append({
+                "ref":         f"{title} {perek}:{pasuk}",
+                "commentator": commentator,
+                "book":        book,
+                "chapter":     perek,
+                "verse":       pasuk,
+                "text":        " ".join(flatten(value)),
+                "expires_at":  expires.isoformat(),
+            })
+    return rows
+
+
+def store(rows: list[dict]) -> bool:
+    for start in range(0, len(rows), INSERT_BATCH):
+        r = requests.post(f"{config.SUPABASE_URL}/rest/v1/sefaria_cache",
+                          headers=config.HEADERS, json=rows[start:start + INSERT_BATCH], timeout=120)
+        if r.status_code not in (200, 201, 204):
+            print(f"    ✗ Insert error {r.status_code}: {r.text[:300]}")
+            return False
+    return True
+
+
+def print_usage():
+    r = requests.get(f"{config.SUPABASE_URL}/rest/v1/sefaria_cache_usage", headers=config.HEADERS,
+                     params={"select": "*", "order": "commentator,book"}, timeout=30)
+    r.raise_for_status()
+    total = 0
+    print(f"  {'commentator':15s} {'book':12s} {'rows':>6s} {'empty':>6s} {'expired':>8s} {'KB':>9s}")
+    for u in r.json():
+        total += u["bytes"]
+        print(f"  {u['commentator']:15s} {u['book']:12s} {u['rows']:6d} {u['empty_rows']:6d} "
+              f"{u['expired_rows']:8d} {u['bytes'] / 1024:9.1f}")
+    print(f"  Total: {total / (1024 * 1024):.1f} MB")
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-warm sefaria_cache with whole books.")
+    parser.add_argument("commentators", nargs="*", help="commentator ids (default: all not uploaded)")
+    parser.add_argument("--ttl-days", type=int, default=TTL_DAYS)
+    parser.add_argument("--max-mb", type=float, default=MAX_MB, help="stop after writing this much text")
+    parser.add_argument("--force", action="store_true", help="re-fetch books that are still fresh")
+    parser.add_argument("--usage", action="store_true", help="print cache usage and exit")
+    args = parser.parse_args()
+
+    if args.usage:
+        print_usage()
+        return
+    # upload_commentaries falls back to the anon key, which can't write sefaria_cache
+    if config.API_KEY == config.ANON_KEY:
+        print("✗ SUPABASE_SERVICE_ROLE_KEY not set (env or .env)")
+        sys.exit(1)
+
+    unknown = [c for c in args.commentators if c not in resolve_refs.ALIASES]
+    if unknown:
+        parser.error(f"unknown commentator(s) {unknown}; known: {sorted(resolve_refs.ALIASES)}")
+
+    now = datetime.now(timezone.utc)
+    expires = now + timedelta(days=args.ttl_days)
+    budget = int(args.max_mb * 1024 * 1024)
+    written = warmed = skipped = 0
+    failed = []
+
+    for commentator, book, title in cache_targets(args.commentators):
+        if not args.force and is_fresh(commentator, book, now):
+            skipped += 1
+            continue
+        if written >= budget:
+            print(f"\n  ⚠ --max-mb {args.max_mb:g} reached — stopping")
+            break
+
+        print(f"[{book}] {commentator} ({title}) ...")
+        text = commentaries.fetch_text(resolve_refs.url_ref(title))
+        if text is None or not isinstance(text, list):
+            failed.append(f"{commentator} / {book}")
+            time.sleep(1)
+            continue
+
+        rows = book_rows(commentator, book, title, text, expires)
+        size = sum(len(r["text"].encode("utf-8")) for r in rows)
+        if store(rows):
+            written += size
+            warmed += 1
+            print(f"    ✓ {len(rows)} verses, {sum(1 for r in rows if not r['text'])} empty, "
+                  f"{size / 1024:.0f} KB")
+        else:
+            failed.append(f"{commentator} / {book}")
+        time.sleep(1.5)  # be polite to Sefaria
+
+    print(f"\n{'='*60}")
+    print(f"Warmed  : {warmed} book(s), {written / (1024 * 1024):.1f} MB")
+    print(f"Fresh   : {skipped} (skipped, still within TTL)")
+    if failed:
+        print(f"Failed  : {len(failed)}")
+        for f in failed:
+            print(f"          {f}")
+
+
+if __name__ == "__main__":
+    main()
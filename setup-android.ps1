@@ -229,7 +229,7 @@ Write-Ok "npm packages installed"
 # ============================================================
 Write-Step "Step 5/7: Building Web App (vite build)"
 
-$buildOutput = cmd /c "npm run build 2>&1"
+$buildOutput = cmd /c "npm run build:native 2>&1"
 $buildOutput | Select-Object -Last 5
 if ($buildOutput -match "built in") {
     Write-Ok "Web app built successfully"
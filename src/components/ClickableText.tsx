@@ -1,11 +1,12 @@
-import { useState, memo } from "react";
+import { useState, useEffect, memo } from "react";
 import { Popover, PopoverContent, PopoverTrigger } from "@/components/ui/popover";
 import { Button } from "@/components/ui/button";
-import { Bookmark, MessageSquare, X } from "lucide-react";
+import { Bookmark, MessageSquare, X, Loader2 } from "lucide-react";
 import { useHighlights } from "@/contexts/HighlightsContext";
 import { useNotes } from "@/contexts/NotesContext";
 import { toast } from "@/hooks/use-toast";
 import { useTextDisplayStyles } from "@/hooks/useTextDisplayStyles";
+import { ALL_COMMENTATORS, CommentRow, fetchCommentsByWord } from "@/hooks/useCommentaries";
 
 interface ClickableTextProps {
   text: string;
@@ -16,8 +17,12 @@ interface ClickableTextProps {
   fontWeight?: string;
   className?: string;
   style?: React.CSSProperties;
+  /** Set for Torah pesukim: the word popover then lists the comments whose dibur hamatchil quotes the word */
+  pasuk?: { seferId: number; perek: number; pasuk: number };
 }
 
+const commentatorName = (id: string) => ALL_COMMENTATORS.find((c) => c.id === id)?.hebrewName ?? id;
+
 const HIGHLIGHT_COLORS = [
   { name: "צהוב", value: "bg-yellow-200/70 dark:bg-yellow-900/40" },
   { name: "ירוק", value: "bg-green-200/70 dark:bg-green-900/40" },
@@ -35,6 +40,7 @@ export const ClickableText = ({
   fontWeight,
   className = "",
   style = {},
+  pasuk,
 }: ClickableTextProps) => {
   const [selectedWordIndex, setSelectedWordIndex] = useState<number | null>(null);
   const [popoverOpen, setPopoverOpen] = useState(false);
@@ -45,6 +51,19 @@ export const ClickableText = ({
   const words = text.split(' ');
   const highlights = getHighlightsForPasuk(pasukId);
 
+  // Comments on the pasuk that open with the selected word (one indexed query)
+  const [wordComments, setWordComments] = useState<CommentRow[] | null>(null);
+  const selectedWord = popoverOpen && selectedWordIndex !== null ? words[selectedWordIndex] : null;
+  useEffect(() => {
+    setWordComments(null);
+    if (!pasuk || !selectedWord) return;
+    let cancelled = false;
+    fetchCommentsByWord(pasuk.seferId, pasuk.perek, pasuk.pasuk, selectedWord).then((rows) => {
+      if (!cancelled) setWordComments(rows);
+    });
+    return () => { cancelled = true; };
+  }, [pasuk?.seferId, pasuk?.perek, pasuk?.pasuk, selectedWord]);
+
   const handleWordClick = (wordIndex: number, event: React.MouseEvent) => {
     // Only open if Ctrl key is pressed
     if (!event.ctrlKey && !event.metaKey) {
@@ -190,6 +209,26 @@ export const ClickableText = ({
                     </>
                   )}
                   
+                  {pasuk && (
+                    <div className="border-t pt-2 max-w-72" dir="rtl">
+                      <div className="text-sm font-medium mb-1">פירושים על המילה</div>
+                      {wordComments === null ? (
+                        <Loader2 className="h-4 w-4 animate-spin mx-auto text-muted-foreground" />
+                      ) : wordComments.length === 0 ? (
+                        <div className="text-xs text-muted-foreground">לא נמצא דיבור המתחיל</div>
+                      ) : (
+                        <div className="max-h-60 overflow-y-auto space-y-2 text-sm leading-relaxed">
+                          {wordComments.map((c) => (
+                            <p key={`${c.commentator}-${c.comment_idx}`} className="m-0">
+                              <span className="font-bold text-[#c8a04d]">{commentatorName(c.commentator)}: </span>
+                              {c.text}
+                            </p>
+                          ))}
+                        </div>
+                      )}
+                    </div>
+                  )}
+
                   <div className="border-t pt-2 space-y-2">
                     <Button
                       variant="outline"
@@ -7,7 +7,7 @@ import { useFontAndColorSettings } from "@/contexts/FontAndColorSettingsContext"
 import { useDevice } from "@/contexts/DeviceContext";
 import { useBookmarks } from "@/contexts/BookmarksContext";
 import { sharePasukWhatsApp, sharePasukEmail, sharePasukLink } from "@/utils/shareUtils";
-import { useCommentaries, ALL_COMMENTATORS, CommentatorConfig, CommentaryMode, CommentaryMap } from "@/hooks/useCommentaries";
+import { useCommentaries, commentatorsForPasuk, ALL_COMMENTATORS, CommentatorConfig, CommentaryMode, CommentaryMap } from "@/hooks/useCommentaries";
 import { CommentaryPickerDialog } from "@/components/CommentaryPickerDialog";
 import { Button } from "@/components/ui/button";
 import { Bookmark, BookmarkCheck, Settings2, X, ChevronDown, Share2, Mail, Link2, Eye, MoreHorizontal, BookOpen, Loader2, Library } from "lucide-react";
@@ -163,6 +163,12 @@ interface CommentaryEntry {
   mode: CommentaryMode;
 }
 
+/** A commentator that is turned off but has text on the pasuk (availability index) */
+interface AvailableCommentary {
+  id: string;
+  hebrewName: string;
+}
+
 const PasukRow = ({
   pasuk,
   numColor,
@@ -172,6 +178,8 @@ const PasukRow = ({
   seferId,
   templateId,
   commentaries,
+  availableCommentaries,
+  onShowCommentary,
   isMobile,
 }: {
   pasuk: FlatPasuk;
@@ -182,6 +190,8 @@ const PasukRow = ({
   seferId: number;
   templateId: TemplateId;
   commentaries: CommentaryEntry[];
+  availableCommentaries: AvailableCommentary[];
+  onShowCommentary: (id: string) => void;
   isMobile: boolean;
 }) => {
   const [actionsOpen, setActionsOpen] = useState(false);
@@ -207,6 +217,12 @@ const PasukRow = ({
     });
   };
 
+  // Turns the commentator on (click mode) and opens it on this pasuk
+  const showAvailable = (id: string) => {
+    onShowCommentary(id);
+    setOpenCommentaries((prev) => new Set(prev).add(id));
+  };
+
   return (
     <div
       className={cn(
@@ -356,7 +372,7 @@ const PasukRow = ({
       </p>
 
       {/* Click-mode toggle buttons — outside <p> to avoid bidi collision */}
-      {commentaries.some((c) => c.mode === "click") && (
+      {(commentaries.some((c) => c.mode === "click") || availableCommentaries.length > 0) && (
         <div dir="rtl" className="mt-0.5 flex flex-wrap gap-1 justify-end">
           {commentaries
             .filter((c) => c.mode === "click")
@@ -375,6 +391,17 @@ const PasukRow = ({
                 {c.hebrewName}
               </button>
             ))}
+          {/* Indicators: commentators that are off but have text here */}
+          {availableCommentaries.map((c) => (
+            <button
+              key={c.id}
+              onClick={() => showAvailable(c.id)}
+              className="inline-flex items-center justify-center rounded px-1.5 py-0.5 text-[10px] border border-dashed border-muted-foreground/30 text-muted-foreground/70 hover:border-[#c8a04d] hover:text-[#c8a04d] transition-colors"
+              title={`יש פירוש ${c.hebrewName} — הצג`}
+            >
+              {c.hebrewName}
+            </button>
+          ))}
         </div>
       )}
 
@@ -543,11 +570,25 @@ export const LuxuryTextView = ({ pesukim }: LuxuryTextViewProps) => {
     setDisplayedCount((prev) => Math.min(prev + loadMoreStep, pesukim.length));
   }, [loadMoreStep, pesukim.length]);
 
-  const { maps: commentaryMaps, loading: commentaryLoading } = useCommentaries(
+  const { maps: commentaryMaps, availability: commentaryAvailability, loading: commentaryLoading } = useCommentaries(
     displayedPesukim,
     commentaryConfigs
   );
 
+  /** Turned-off commentators the chapter's availability index lists for a pasuk */
+  const availableCommentariesFor = (pasuk: FlatPasuk): AvailableCommentary[] => {
+    const ids = commentatorsForPasuk(commentaryAvailability[`${pasuk.sefer}-${pasuk.perek}`] ?? null, pasuk.pasuk_num);
+    return commentaryConfigs
+      .filter((c) => c.mode === "off" && ids.includes(c.id))
+      .map((c) => ({ id: c.id, hebrewName: c.hebrewName }));
+  };
+
+  const showCommentary = useCallback((id: string) => {
+    saveCommentaryConfigs(
+      commentaryConfigs.map((c) => (c.id === id && c.mode === "off" ? { ...c, mode: "click" as CommentaryMode } : c))
+    );
+  }, [commentaryConfigs, saveCommentaryConfigs]);
+
   const template = TEMPLATES.find((t) => t.id === templateId)!;
 
   const cycleTemplate = useCallback(() => {
@@ -749,6 +790,8 @@ export const LuxuryTextView = ({ pesukim }: LuxuryTextViewProps) => {
                             mode: c.mode,
                           }))
                           .filter((c) => c.text !== "")}
+                        availableCommentaries={availableCommentariesFor(pasuk)}
+                        onShowCommentary={showCommentary}
                         isMobile={isMobile}
                       />
                     );
@@ -796,6 +839,8 @@ export const LuxuryTextView = ({ pesukim }: LuxuryTextViewProps) => {
                             mode: c.mode,
                           }))
                           .filter((c) => c.text !== "")}
+                        availableCommentaries={availableCommentariesFor(pasuk)}
+                        onShowCommentary={showCommentary}
                         isMobile={isMobile}
                       />
                     );
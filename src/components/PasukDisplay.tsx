@@ -354,10 +354,12 @@ const PasukDisplayBase = ({ pasuk, seferId, forceMinimized = false, hideHeaderAc
             <PasukLineActions 
               text={formattedPasukText}
               onBookmark={() => toggleBookmark(pasukId, formattedPasukText)}
+              related={{ book: seferId, perek: pasuk.perek, pasuk: pasuk.pasuk_num }}
             >
               <ClickableText 
                 text={formattedPasukText} 
                 pasukId={pasukId}
+                pasuk={{ seferId, perek: pasuk.perek, pasuk: pasuk.pasuk_num }}
                 fontFamily={settings.pasukFont}
                 fontSize={`${settings.pasukSize}px`}
                 color={settings.pasukColor}
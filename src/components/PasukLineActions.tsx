@@ -1,4 +1,5 @@
 import { useState } from "react";
+import { useNavigate } from "react-router-dom";
 import {
   ContextMenu,
   ContextMenuContent,
@@ -16,8 +17,10 @@ import {
   StickyNote,
   Copy,
   Check,
+  Link2,
 } from "lucide-react";
 import { toast } from "sonner";
+import { getRelatedPesukim, relatedHref, relatedLabel, RelatedPasuk } from "@/utils/relatedPesukim";
 
 interface PasukLineActionsProps {
   children: React.ReactNode;
@@ -25,8 +28,12 @@ interface PasukLineActionsProps {
   onHighlight?: (color: string) => void;
   onBookmark?: () => void;
   onAddNote?: () => void;
+  /** The pasuk this line is — enables the "related pesukim" submenu */
+  related?: { book: number; perek: number; pasuk: number };
 }
 
+const RELATED_LIMIT = 6;
+
 const highlightColors = [
   { name: "צהוב", value: "#fef08a", class: "bg-yellow-200" },
   { name: "ירוק", value: "#bbf7d0", class: "bg-green-200" },
@@ -51,8 +58,17 @@ export const PasukLineActions = ({
   onHighlight,
   onBookmark,
   onAddNote,
+  related,
 }: PasukLineActionsProps) => {
+  const navigate = useNavigate();
   const [copied, setCopied] = useState(false);
+  const [relatedPesukim, setRelatedPesukim] = useState<RelatedPasuk[]>([]);
+
+  // Looked up when the menu opens, so unopened lines cost nothing
+  const handleOpenChange = (open: boolean) => {
+    if (!open || !related) return;
+    getRelatedPesukim(related.book, related.perek, related.pasuk, RELATED_LIMIT).then(setRelatedPesukim);
+  };
 
   const handleCopy = () => {
     navigator.clipboard.writeText(text);
@@ -75,7 +91,7 @@ export const PasukLineActions = ({
   };
 
   return (
-    <ContextMenu>
+    <ContextMenu onOpenChange={handleOpenChange}>
       <ContextMenuTrigger asChild>
         <div className="cursor-context-menu transition-all rounded px-1 w-full text-right overflow-hidden min-w-0">
           {children}
@@ -146,6 +162,34 @@ export const PasukLineActions = ({
           <StickyNote className="h-4 w-4" />
           <span>הוסף הערה</span>
         </ContextMenuItem>
+
+        {relatedPesukim.length > 0 && (
+          <>
+            <ContextMenuSeparator />
+            <ContextMenuSub>
+              <ContextMenuSubTrigger className="gap-2">
+                <Link2 className="h-4 w-4" />
+                <span>פסוקים קשורים</span>
+              </ContextMenuSubTrigger>
+              <ContextMenuSubContent className="w-48">
+                {relatedPesukim.map((r) => {
+                  const href = relatedHref(r);
+                  return (
+                    <ContextMenuItem
+                      key={r.ref}
+                      disabled={!href}
+                      onClick={() => href && navigate(href)}
+                      className="gap-2 justify-between"
+                    >
+                      <span>{relatedLabel(r)}</span>
+                      <span className="text-xs text-muted-foreground">{r.score}%</span>
+                    </ContextMenuItem>
+                  );
+                })}
+              </ContextMenuSubContent>
+            </ContextMenuSub>
+          </>
+        )}
       </ContextMenuContent>
     </ContextMenu>
   );
@@ -140,10 +140,121 @@ async function loadChapterFromLocal(
   }
 }
 
+/** Per-chapter availability row (commentary_availability table).
+ * masks[pasuk - 1] has bit i set when commentators[i] has text on that pasuk. */
+export interface ChapterAvailability {
+  commentators: string[];
+  masks: number[];
+  any_mask: number;
+}
+
+// chapterKey → availability (null = unknown: offline, or no index row for the chapter)
+const availabilityCache = new Map<string, Promise<ChapterAvailability | null>>();
+
+/** One tiny fetch per chapter telling which commentators have text on which pesukim. */
+export function fetchAvailability(seferId: number, perek: number): Promise<ChapterAvailability | null> {
+  const ck = `${seferId}-${perek}`;
+  let pending = availabilityCache.get(ck);
+  if (!pending) {
+    pending = (async () => {
+      try {
+        const { data, error } = await (supabase as any)
+          .from("commentary_availability")
+          .select("commentators, masks, any_mask")
+          .eq("sefer_id", seferId)
+          .eq("perek", perek)
+          .maybeSingle();
+        if (error) return null;
+        // No row means the index doesn't cover the chapter (it is built from the
+        // uploader's local files), not that the chapter is empty
+        return data ?? null;
+      } catch {
+        return null;
+      }
+    })();
+    availabilityCache.set(ck, pending);
+    // Don't pin failures — retry next time (e.g. after coming back online)
+    pending.then((v) => { if (v === null) availabilityCache.delete(ck); });
+  }
+  return pending;
+}
+
+/** Whether a commentator has any text in the chapter (true when unknown). */
+export function chapterHasCommentary(avail: ChapterAvailability | null, commentatorId: string): boolean {
+  if (!avail || avail.commentators.length === 0) return true;
+  const bit = avail.commentators.indexOf(commentatorId);
+  // Commentator newer than the index: can't tell, so let the query happen
+  return bit < 0 || (avail.any_mask & (1 << bit)) !== 0;
+}
+
+/** Commentator ids with text on a given pasuk, in bit order. */
+export function commentatorsForPasuk(avail: ChapterAvailability | null, pasuk: number): string[] {
+  const mask = avail?.masks[pasuk - 1] ?? 0;
+  return avail ? avail.commentators.filter((_, i) => (mask & (1 << i)) !== 0) : [];
+}
+
+/** A single comment row (commentaries is one row per comment). */
+export interface CommentRow {
+  commentator: string;
+  comment_idx: number;
+  dibur_hamatchil: string | null;
+  text: string;
+}
+
+/** Same normalisation the uploader applies to dibur_hamatchil: no nikud / punctuation. */
+const normalizeWord = (word: string) =>
+  word
+    .replace(/־/g, " ") // maqaf joins words the dibur hamatchil keeps apart
+    .replace(/[֑-ׇ]/g, "")
+    .replace(/[^\p{L}\p{N}\s"'״׳]/gu, "")
+    .replace(/\s+/g, " ")
+    .trim();
+
+/** A PostgREST filter value, double-quoted so , . ( ) " can't break an or=(...) list. */
+const quoteFilterValue = (value: string) =>
+  `"${value.replace(/\\/g, "\\\\").replace(/"/g, '\\"')}"`;
+
+/**
+ * Only the comments on a pasuk whose dibur hamatchil contains the tapped word
+ * — instead of the whole chapter.  idx_commentaries_dibur narrows the query to
+ * the pasuk's comments and serves the prefix match; the mid-phrase match is a
+ * filter over those few rows.  Empty when offline or nothing matches.
+ */
+export async function fetchCommentsByWord(
+  seferId: number,
+  perek: number,
+  pasuk: number,
+  word: string,
+  commentatorId?: string
+): Promise<CommentRow[]> {
+  const w = normalizeWord(word);
+  if (!w) return [];
+  try {
+    let query = (supabase as any)
+      .from("commentaries")
+      .select("commentator, comment_idx, dibur_hamatchil, text")
+      .eq("sefer_id", seferId)
+      .eq("perek", perek)
+      .eq("pasuk", pasuk)
+      .or(`dibur_hamatchil.like.${quoteFilterValue(`${w}*`)},dibur_hamatchil.like.${quoteFilterValue(`* ${w}*`)}`);
+    if (commentatorId) query = query.eq("commentator", commentatorId);
+    const { data, error } = await query.order("commentator").order("comment_idx");
+    return error || !data ? [] : data;
+  } catch {
+    return [];
+  }
+}
+
+/**
+ * One chapter of a commentator: Supabase, then the bundled JSON.  skipRemote
+ * (the availability index says the chapter is empty) skips only the Supabase
+ * query — the local fallback is still tried.
+ */
 async function fetchChapter(
   commentatorId: string,
   seferId: number,
-  perek: number
+  perek: number,
+  skipRemote = false
 ): Promise<CommentaryMap> {
   const cache = getOrCreateCommentaryCache(commentatorId);
   const ck = `${seferId}-${perek}`;
@@ -151,24 +262,31 @@ async function fetchChapter(
   if (cache.has(ck)) return cache.get(ck)!;
 
   // 1. Try Supabase (cloud, fast, all books)
-  try {
-    const { data, error } = await (supabase as any)
-      .from("commentaries")
-      .select("pasuk, text")
-      .eq("commentator", commentatorId)
-      .eq("sefer_id", seferId)
-      .eq("perek", perek);
+  if (!skipRemote) {
+    try {
+      const { data, error } = await (supabase as any)
+        .from("commentaries")
+        .select("pasuk, text")
+        .eq("commentator", commentatorId)
+        .eq("sefer_id", seferId)
+        .eq("perek", perek)
+        .order("pasuk")
+        .order("comment_idx");
 
-    if (!error && data && data.length > 0) {
-      const result = new Map<string, string>();
-      for (const row of data) {
-        result.set(commentaryKey(seferId, perek, row.pasuk), row.text);
+      if (!error && data && data.length > 0) {
+        // One row per comment — join a pasuk's comments like the local JSON fallback
+        const result = new Map<string, string>();
+        for (const row of data) {
+          const k = commentaryKey(seferId, perek, row.pasuk);
+          const prev = result.get(k);
+          result.set(k, prev ? `${prev} ${row.text}` : row.text);
+        }
+        setCachedChapter(commentatorId, ck, result);
+        return result;
       }
-      setCachedChapter(commentatorId, ck, result);
-      return result;
+    } catch {
+      // fall through to local JSON
     }
-  } catch {
-    // fall through to local JSON
   }
 
   // 2. Fall back to local bundled JSON (always works offline)
@@ -178,21 +296,30 @@ async function fetchChapter(
     return local;
   }
 
+  // An empty chapter on the index's word alone isn't cached — the index may be stale
+  if (skipRemote) return new Map();
+
   // Mark as empty so we don’t re-fetch this chapter
   setCachedChapter(commentatorId, ck, new Map());
   return new Map();
 }
 
 /**
- * Loads commentary text for all enabled commentators in the given pesukim.
- * Returns a map: commentatorId → (pasukKey → text)
+ * Loads commentary text for all enabled commentators in the given pesukim,
+ * plus the availability index of every visible chapter (for indicators).
+ * Returns maps: commentatorId → (pasukKey → text), availability: "sefer-perek" → index row
  */
 export function useCommentaries(
   pesukim: FlatPasuk[],
   configs: CommentatorConfig[]
-): { maps: Record<string, CommentaryMap>; loading: boolean } {
+): {
+  maps: Record<string, CommentaryMap>;
+  availability: Record<string, ChapterAvailability | null>;
+  loading: boolean;
+} {
   const activeConfigs = configs.filter((c) => c.mode !== "off");
   const [maps, setMaps] = useState<Record<string, CommentaryMap>>({});
+  const [availability, setAvailability] = useState<Record<string, ChapterAvailability | null>>({});
   const [loading, setLoading] = useState(false);
   const mountedRef = useRef(true);
 
@@ -201,34 +328,62 @@ export function useCommentaries(
     return () => { mountedRef.current = false; };
   }, []);
 
-  // Stable key so we only re-fetch when sefer/perek or active commentators change
-  const depsKey = [
-    pesukim.map((p) => `${p.sefer}-${p.perek}`).join(","),
-    activeConfigs.map((c) => c.id).join(","),
-  ].join("|");
-
-  useEffect(() => {
-    if (pesukim.length === 0 || activeConfigs.length === 0) {
-      setMaps({});
-      return;
-    }
+  // Stable keys so we only re-fetch when sefer/perek or active commentators change
+  const chaptersKey = pesukim.map((p) => `${p.sefer}-${p.perek}`).join(",");
+  const depsKey = [chaptersKey, activeConfigs.map((c) => c.id).join(",")].join("|");
 
-    // Unique (sefer, perek) pairs visible right now
+  // Unique (sefer, perek) pairs visible right now
+  const chapterPairs = () => {
     const pairs = new Map<string, { seferId: number; perek: number }>();
     for (const p of pesukim) {
       const k = `${p.sefer}-${p.perek}`;
       if (!pairs.has(k)) pairs.set(k, { seferId: p.sefer, perek: p.perek });
     }
+    return pairs;
+  };
 
+  useEffect(() => {
+    const pairs = chapterPairs();
+    if (pairs.size === 0) {
+      setAvailability({});
+      return;
+    }
+    Promise.all(
+      [...pairs.entries()].map(async ([pairKey, { seferId, perek }]) =>
+        [pairKey, await fetchAvailability(seferId, perek)] as const
+      )
+    ).then((entries) => {
+      if (mountedRef.current) setAvailability(Object.fromEntries(entries));
+    });
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [chaptersKey]);
+
+  useEffect(() => {
+    if (pesukim.length === 0 || activeConfigs.length === 0) {
+      setMaps({});
+      return;
+    }
+
+    const pairs = chapterPairs();
     setLoading(true);
 
     const fetchAll = async () => {
       const result: Record<string, CommentaryMap> = {};
 
+      // Same cached promises as the indicator effect above — one fetch per chapter
+      const chapterAvailability = new Map<string, ChapterAvailability | null>();
+      await Promise.all(
+        [...pairs.entries()].map(async ([pairKey, { seferId, perek }]) => {
+          chapterAvailability.set(pairKey, await fetchAvailability(seferId, perek));
+        })
+      );
+
       for (const config of activeConfigs) {
         const merged = new Map<string, string>();
-        for (const { seferId, perek } of pairs.values()) {
-          const chapterMap = await fetchChapter(config.id, seferId, perek);
+        for (const [pairKey, { seferId, perek }] of pairs.entries()) {
+          // Skip the Supabase query when the index says the chapter is empty
+          const skipRemote = !chapterHasCommentary(chapterAvailability.get(pairKey) ?? null, config.id);
+          const chapterMap = await fetchChapter(config.id, seferId, perek, skipRemote);
           chapterMap.forEach((v, k) => merged.set(k, v));
         }
         result[config.id] = merged;
@@ -244,5 +399,5 @@ export function useCommentaries(
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [depsKey]);
 
-  return { maps, loading };
+  return { maps, availability, loading };
 }
@@ -75,21 +75,27 @@ export function useRashi(pesukim: FlatPasuk[], enabled: boolean) {
           continue;
         }
 
-        // Try Supabase
+        // Try Supabase — Rashi lives in the unified commentaries table
+        // (rashi_commentary is only a compatibility view over it)
         try {
           const { data, error } = await (supabase as any)
-            .from("rashi_commentary")
+            .from("commentaries")
             .select("pasuk, text")
+            .eq("commentator", "Rashi")
             .eq("sefer_id", seferId)
-            .eq("perek", perek);
+            .eq("perek", perek)
+            .order("pasuk")
+            .order("comment_idx");
 
           if (!error && data && data.length > 0) {
+            // One row per comment (dibur hamatchil) — join them per pasuk
             const perekMap = new Map<string, string>();
             for (const row of data) {
               const k = rashiKey(seferId, perek, row.pasuk);
-              perekMap.set(k, row.text);
-              result.set(k, row.text);
+              const prev = perekMap.get(k);
+              perekMap.set(k, prev ? `${prev} ${row.text}` : row.text);
             }
+            perekMap.forEach((v, k) => result.set(k, v));
             setCacheEntry(ck, perekMap);
             continue;
           }
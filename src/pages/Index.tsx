@@ -29,7 +29,7 @@ import { SelectionProvider } from "@/contexts/SelectionContext";
 import { MultiShareBar } from "@/components/MultiShareBar";
 import { SelectionModeButton } from "@/components/SelectionModeButton";
 import { yieldToMain } from "@/utils/asyncHelpers";
-import { lazyLoadSefer, preloadNextSefer } from "@/utils/lazyLoadSefer";
+import { lazyLoadSefer, preloadNextSefer, withEnglish } from "@/utils/lazyLoadSefer";
 import { usePinchZoom } from "@/hooks/usePinchZoom";
 import { useKeyboardShortcuts } from "@/hooks/useKeyboardShortcuts";
 import { SidePanelTrigger } from "@/components/SidePanelTrigger";
@@ -423,6 +423,19 @@ const Index = () => {
     
     return () => { cancelled = true; };
   }, [selectedSefer, seferCache, corpusMode]);
+
+  // Nevi'im English is a separate payload - fetch it only once the English view is on
+  useEffect(() => {
+    if (textLanguage !== "en" || !seferData) return;
+    let cancelled = false;
+    withEnglish(seferData)
+      .then((merged) => {
+        if (!cancelled && merged !== seferData) setSeferData(merged);
+      })
+      .catch((err) => console.error("Error loading English text:", err));
+    return () => { cancelled = true; };
+  }, [textLanguage, seferData]);
+
   // Flatten pesukim from nested structure with batching to prevent blocking
   const flattenedPesukim = useMemo(() => {
     if (!seferData) return [];
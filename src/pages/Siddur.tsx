@@ -2,7 +2,7 @@ import { useState, useEffect, useRef } from "react";
 import { useNavigate } from "react-router-dom";
 import { TextDisplaySettings } from "@/components/TextDisplaySettings";
 import { useFontAndColorSettings } from "@/contexts/FontAndColorSettingsContext";
-import { ArrowLeft, ChevronDown, ChevronUp, BookMarked, Loader2, BookOpen, ExternalLink, LayoutList, AlignJustify, ScrollText, Layers, Sunrise, Sun, Moon, Sparkles, Flame, Star, Leaf, Heart, Book, type LucideProps } from "lucide-react";
+import { ArrowLeft, ChevronDown, ChevronUp, Share2, BookMarked, Loader2, BookOpen, ExternalLink, LayoutList, AlignJustify, ScrollText, Layers, Sunrise, Sun, Moon, Sparkles, Flame, Star, Leaf, Heart, Book, type LucideProps } from "lucide-react";
 import { Button } from "@/components/ui/button";
 import {
   DropdownMenu,
@@ -13,6 +13,7 @@ import {
   DropdownMenuTrigger,
 } from "@/components/ui/dropdown-menu";
 import { cn } from "@/lib/utils";
+import { shareCard } from "@/utils/shareUtils";
 import { useSiddurCategories, useSiddurSections, useTehillimData } from "@/hooks/useSiddurData";
 
 /* ─── Types ─────────────────────────────────────────────── */
@@ -113,7 +114,16 @@ const OrnamentTitle = ({ text }: { text: string }) => (
 );
 
 /* ─── SectionCard ────────────────────────────────────────── */
-const SectionCard = ({ section, initialOpen = false }: { section: SiddurSection; initialOpen?: boolean }) => {
+const SectionCard = ({
+  section,
+  initialOpen = false,
+  cardKey,
+}: {
+  section: SiddurSection;
+  initialOpen?: boolean;
+  /** Share card key (siddur/<nusach>/<category>/<idx>); shows a share button */
+  cardKey?: string;
+}) => {
   const [open, setOpen] = useState(initialOpen);
   const { settings: siddurSettings } = useFontAndColorSettings();
 
@@ -123,9 +133,10 @@ const SectionCard = ({ section, initialOpen = false }: { section: SiddurSection;
       boxShadow: "0 1px 4px rgba(0,0,0,0.06)",
     }}>
       {/* Section header / toggle */}
+      <div className="flex items-center" style={{ direction: "rtl" }}>
       <button
         onClick={() => setOpen(v => !v)}
-        className="w-full flex items-center justify-between px-4 py-3 text-right transition-colors hover:bg-accent/10 focus:outline-none"
+        className="flex-1 flex items-center justify-between px-4 py-3 text-right transition-colors hover:bg-accent/10 focus:outline-none"
         style={{ direction: "rtl" }}
       >
         <div className="flex items-center gap-2">
@@ -144,6 +155,16 @@ const SectionCard = ({ section, initialOpen = false }: { section: SiddurSection;
           {open ? <ChevronUp className="h-4 w-4" /> : <ChevronDown className="h-4 w-4" />}
         </span>
       </button>
+      {cardKey && (
+        <button
+          onClick={() => shareCard(cardKey, section.title)}
+          className="px-3 py-3 text-muted-foreground hover:text-accent transition-colors"
+          title="שתף"
+        >
+          <Share2 className="h-4 w-4" />
+        </button>
+      )}
+      </div>
 
       {/* Prayer lines */}
       {open && (
@@ -293,7 +314,12 @@ const CategoryPane = ({
           : (
             <div className="space-y-1">
               {sections.map((sec, i) => (
-                <SectionCard key={`${sec.title}-${i}`} section={sec} initialOpen={i === 0} />
+                <SectionCard
+                  key={`${sec.title}-${i}`}
+                  section={sec}
+                  initialOpen={i === 0}
+                  cardKey={`siddur/${nusach}/${catId}/${i}`}
+                />
               ))}
             </div>
           )
@@ -405,6 +431,20 @@ const FullContinuousPane = ({ nusach }: { nusach: string }) => {
 };
 
 /* ─── TehillimPane ───────────────────────────────────────── */
+const TehillimShareButton = ({ chapter }: { chapter: number }) => (
+  <div className="flex justify-center -mt-2 mb-3">
+    <button
+      onClick={() => shareCard(`tehillim/${chapter}`, `תהילים פרק ${heNum(chapter)}`)}
+      className="inline-flex items-center gap-1 text-xs px-3 py-1 rounded-full transition-all"
+      style={{ background: `${GOLD}22`, color: GOLD, border: `1px solid ${GOLD}55` }}
+      title="שתף"
+    >
+      <Share2 className="h-3.5 w-3.5" />
+      שתף
+    </button>
+  </div>
+);
+
 const TEHILLIM_DAILY: Record<number, number>   = { 0: 24, 1: 48, 2: 82, 3: 94, 4: 81, 5: 93, 6: 92 };
 const TEHILLIM_DAY_HEB: Record<number, string> = { 0: "ראשון", 1: "שני", 2: "שלישי", 3: "רביעי", 4: "חמישי", 5: "שישי", 6: "שבת" };
 
@@ -633,6 +673,7 @@ const TehillimPane = () => {
               </div>
 
               <OrnamentTitle text={`פרק ${heNum(chapter)} — ${current.title || "תהלים"}`} />
+              <TehillimShareButton chapter={chapter} />
               <div ref={textRef}>
                 {renderVerseCard(current.lines, pasuk, true)}
               </div>
@@ -683,6 +724,7 @@ const TehillimPane = () => {
             </span>
           </div>
           <OrnamentTitle text={`פרק ${heNum(todayChapter)} — ${dailyCurrent.title || "תהלים"}`} />
+          <TehillimShareButton chapter={todayChapter} />
           {renderVerseCard(dailyCurrent.lines, null, false)}
         </div>
       )}
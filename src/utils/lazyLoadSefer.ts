@@ -3,6 +3,9 @@ import { torahDB } from "@/utils/torahDB";
 
 // In-memory cache for instant access
 const memoryCache = new Map<number, Sefer>();
+// Nevi'im English translations live in separate payloads (src/data/en), keyed by pasuk id
+const englishCache = new Map<number, Promise<Map<number, string>>>();
+const withEnglishSefarim = new WeakSet<Sefer>();
 const ESTHER_SEFER_ID = 101;
 const ESTHER_EXPECTED_VERSE_COUNT = 167;
 
@@ -39,6 +42,7 @@ const normalizeSeferText = (sefer: Sefer): Sefer => {
           ...pasuk,
           text: decodeHtmlEntities(pasuk.text || ""),
           text_en: pasuk.text_en ? decodeHtmlEntities(pasuk.text_en) : pasuk.text_en,
+          content: pasuk.content ?? [],
         })),
       })),
     })),
@@ -115,6 +119,68 @@ export const lazyLoadSefer = async (seferId: number): Promise<Sefer> => {
   return data;
 };
 
+interface EnglishPayload {
+  sefer_id: number;
+  english_name: string;
+  verses: Record<string, string>;
+}
+
+const importEnglish = async (seferId: number): Promise<EnglishPayload> => {
+  let module;
+  switch (seferId) {
+    case 101: module = await import("@/data/en/esther.json"); break;
+    case 102: module = await import("@/data/en/joshua.json"); break;
+    case 103: module = await import("@/data/en/judges.json"); break;
+    case 104: module = await import("@/data/en/i_samuel.json"); break;
+    case 105: module = await import("@/data/en/ii_samuel.json"); break;
+    case 106: module = await import("@/data/en/i_kings.json"); break;
+    case 107: module = await import("@/data/en/ii_kings.json"); break;
+    default: throw new Error(`No separate English payload for sefer ID: ${seferId}`);
+  }
+  return module.default as EnglishPayload;
+};
+
+const loadEnglish = (seferId: number): Promise<Map<number, string>> => {
+  let pending = englishCache.get(seferId);
+  if (!pending) {
+    pending = importEnglish(seferId).then((payload) => {
+      const verses = new Map<number, string>();
+      for (const [id, text] of Object.entries(payload.verses)) {
+        verses.set(Number(id), decodeHtmlEntities(text));
+      }
+      return verses;
+    });
+    pending.catch(() => englishCache.delete(seferId));
+    englishCache.set(seferId, pending);
+  }
+  return pending;
+};
+
+/**
+ * Sefer with text_en filled in, for the English view.
+ * Torah sefarim carry text_en inline and are returned unchanged; for Nevi'im
+ * the English payload is only fetched here, on first use.
+ */
+export const withEnglish = async (sefer: Sefer): Promise<Sefer> => {
+  if (!NEVIIM_IDS.has(sefer.sefer_id) || withEnglishSefarim.has(sefer)) return sefer;
+  const verses = await loadEnglish(sefer.sefer_id);
+  const merged: Sefer = {
+    ...sefer,
+    parshiot: sefer.parshiot.map((parsha) => ({
+      ...parsha,
+      perakim: parsha.perakim.map((perek) => ({
+        ...perek,
+        pesukim: perek.pesukim.map((pasuk) => ({
+          ...pasuk,
+          text_en: verses.get(pasuk.id) ?? pasuk.text_en,
+        })),
+      })),
+    })),
+  };
+  withEnglishSefarim.add(merged);
+  return merged;
+};
+
 /**
  * Preload next sefer in background for smooth navigation
  */
@@ -152,5 +218,6 @@ export const downloadAllSefarim = async (
  */
 export const clearAllSeferCache = async () => {
   memoryCache.clear();
+  englishCache.clear();
   await torahDB.clearSefarim();
 };
@@ -0,0 +1,89 @@
+/**
+ * "Related pesukim" lookup, from the offline TF-IDF neighbour table built by
+ * scripts/build_related.py (src/data/related_pesukim.json).
+ *
+ * Refs are "<sefer_id>.<perek>.<pasuk>", or "tehillim.<perek>.<pasuk>".
+ * Shown in the pasuk context menu (PasukLineActions) when the table is bundled.
+ */
+import { toHebrewNumber } from "@/utils/hebrewNumbers";
+
+interface RelatedTable {
+  format: number;
+  k: number;
+  refs: string[];
+  neighbours: number[][];
+  scores: number[][];
+}
+
+export interface RelatedPasuk {
+  ref: string;
+  book: number | "tehillim";
+  perek: number;
+  pasuk: number;
+  score: number; // cosine similarity × 100
+}
+
+// The table is a build artifact - glob so a tree without it still builds
+const RELATED_FILE = import.meta.glob<{ default: RelatedTable }>("../data/related_pesukim.json");
+
+let tablePromise: Promise<{ table: RelatedTable; index: Map<string, number> } | null> | null = null;
+
+const loadTable = () => {
+  if (!tablePromise) {
+    const importer = RELATED_FILE["../data/related_pesukim.json"];
+    tablePromise = importer
+      ? importer()
+          .then((mod) => {
+            const table = mod.default;
+            return { table, index: new Map(table.refs.map((ref, i) => [ref, i])) };
+          })
+          .catch(() => {
+            tablePromise = null;
+            return null;
+          })
+      : Promise.resolve(null);
+  }
+  return tablePromise;
+};
+
+const parseRef = (ref: string): Omit<RelatedPasuk, "score"> => {
+  const [book, perek, pasuk] = ref.split(".");
+  return {
+    ref,
+    book: book === "tehillim" ? "tehillim" : Number(book),
+    perek: Number(perek),
+    pasuk: Number(pasuk),
+  };
+};
+
+const BOOK_NAMES: Record<string, string> = {
+  1: "בראשית", 2: "שמות", 3: "ויקרא", 4: "במדבר", 5: "דברים",
+  101: "אסתר", 102: "יהושע", 103: "שופטים", 104: "שמואל א", 105: "שמואל ב",
+  106: "מלכים א", 107: "מלכים ב", tehillim: "תהלים",
+};
+
+/** e.g. "יהושע א:ה" */
+export const relatedLabel = (r: RelatedPasuk): string =>
+  `${BOOK_NAMES[r.book] ?? r.book} ${toHebrewNumber(r.perek)}:${toHebrewNumber(r.pasuk)}`;
+
+/** App link to the pasuk (Index reads sefer/perek/pasuk), or null for Tehillim, which has no pasuk view. */
+export const relatedHref = (r: RelatedPasuk): string | null =>
+  r.book === "tehillim" ? null : `/?sefer=${r.book}&perek=${r.perek}&pasuk=${r.pasuk}`;
+
+/**
+ * Nearest pesukim to the given one, best first. Empty if the table isn't
+ * bundled or the pasuk isn't in it.
+ */
+export const getRelatedPesukim = async (
+  book: number | "tehillim",
+  perek: number,
+  pasuk: number,
+  limit?: number
+): Promise<RelatedPasuk[]> => {
+  const loaded = await loadTable();
+  if (!loaded) return [];
+  const i = loaded.index.get(`${book}.${perek}.${pasuk}`);
+  if (i === undefined) return [];
+  const { refs, neighbours, scores } = loaded.table;
+  return neighbours[i].slice(0, limit).map((j, n) => ({ ...parseRef(refs[j]), score: scores[i][n] }));
+};
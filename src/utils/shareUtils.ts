@@ -20,15 +20,19 @@ function buildAppUrl(params: { seferId: number; perek: number; pasuk: number; hi
 
 /**
  * Build OG share URL (for social media previews only).
+ * card: a pre-rendered share card key (generate_og_images.py), e.g.
+ * "tehillim/23" or "siddur/sefard/shacharit/3", for pages without a Torah location.
  */
-export function buildOgShareUrl(params: {
-  seferId: number;
-  perek: number;
-  pasuk: number;
-  highlight?: string;
-  mefaresh?: string;
-}): string {
+export function buildOgShareUrl(
+  params:
+    | { seferId: number; perek: number; pasuk: number; highlight?: string; mefaresh?: string; card?: string }
+    | { card: string }
+): string {
   const supabaseUrl = import.meta.env.VITE_SUPABASE_URL;
+  if (!("seferId" in params)) {
+    if (!supabaseUrl) return `${window.location.origin}/siddur`;
+    return `${supabaseUrl}/functions/v1/og-share?${new URLSearchParams({ card: params.card }).toString()}`;
+  }
   if (!supabaseUrl) return buildAppUrl(params);
   const qs = new URLSearchParams({
     sefer: String(params.seferId),
@@ -37,9 +41,24 @@ export function buildOgShareUrl(params: {
   });
   if (params.highlight) qs.set("highlight", params.highlight);
   if (params.mefaresh) qs.set("mefaresh", params.mefaresh);
+  if (params.card) qs.set("card", params.card);
   return `${supabaseUrl}/functions/v1/og-share?${qs.toString()}`;
 }
 
+/**
+ * Share a Tehillim chapter or Siddur section by its share card key, so link
+ * previews show the pre-rendered card.
+ * Uses native share on mobile, WhatsApp on desktop.
+ */
+export function shareCard(card: string, title: string) {
+  const url = buildOgShareUrl({ card });
+  if (navigator.share) {
+    navigator.share({ title, url }).catch(() => {});
+  } else {
+    window.open(`https://wa.me/?text=${encodeURIComponent(`📖 *${title}*\n\n🔗 ${url}`)}`, '_blank');
+  }
+}
+
 interface ShareCommentaryOptions {
   mefaresh: string;
   text: string;
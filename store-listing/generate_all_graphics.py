@@ -1,13 +1,32 @@
-"""Generate all store listing graphics with correct RTL Hebrew text."""
-from PIL import Image, ImageDraw, ImageFont
-from bidi.algorithm import get_display
+"""Generate all store listing graphics with correct RTL Hebrew text.
+
+Gradients, fonts and Hebrew text layouts come from rendering.py (shared with
+generate_feature_graphic.py).  Graphics whose inputs (size, colors, font, texts, DRAW_VERSION) are unchanged
+since the last run are skipped — see .graphics-manifest.json.  Pass --force
+to redraw everything.
+"""
+from PIL import Image, ImageDraw
 import os
+import sys
 import math
 
+from rendering import (
+    draw_centered_text, draw_right_aligned_text, font_inputs, heb, vertical_gradient,
+)
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
 SCREENSHOTS_DIR = os.path.join(SCRIPT_DIR, "screenshots")
 os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
 
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+from asset_manifest import AssetManifest
+from optimize_images import OPTIMIZER_VERSION, format_saving, save_optimized
+
+MANIFEST_PATH = os.path.join(SCRIPT_DIR, ".graphics-manifest.json")
+# Bump when the drawing code below changes output.
+DRAW_VERSION = 1
+
 # Colors
 BG_COLOR = (30, 58, 95)       # #1e3a5f
 ACCENT_BLUE = (59, 130, 246)
@@ -17,29 +36,21 @@ DARK_BG = (20, 40, 70)
 LIGHT_BG = (248, 249, 250)
 TEXT_DARK = (51, 51, 51)
 
-def heb(text):
-    """Convert Hebrew text to display form (fixes RTL)."""
-    return get_display(text)
-
-def get_fonts(sizes):
-    """Get fonts at specified sizes."""
-    fonts = {}
-    for name, size in sizes.items():
-        try:
-            fonts[name] = ImageFont.truetype("arial.ttf", size)
-        except:
-            try:
-                fonts[name] = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", size)
-            except:
-                fonts[name] = ImageFont.load_default()
-    return fonts
-
-def draw_centered_text(draw, y, text, font, fill, width):
-    """Draw text centered horizontally."""
-    bbox = draw.textbbox((0, 0), text, font=font)
-    tw = bbox[2] - bbox[0]
-    x = (width - tw) // 2
-    draw.text((x, y), text, fill=fill, font=font)
+# Font sizes
+FEATURE_SIZES = {'title': 64, 'subtitle': 32, 'small': 24}
+PHONE_SIZES = {'title': 72, 'subtitle': 40, 'feature': 36, 'small': 28}
+
+def base_inputs(kind, size, colors):
+    """Inputs shared by every graphic, for the manifest hash."""
+    return {
+        "script": "generate_all_graphics",
+        "draw_version": DRAW_VERSION,
+        "kind": kind,
+        "size": size,
+        "colors": colors,
+        "fonts": font_inputs(),
+        "optimizer": OPTIMIZER_VERSION,
+    }
 
 def draw_hexagon(draw, cx, cy, size, color, width=2):
     """Draw a hexagon."""
@@ -55,17 +66,16 @@ def draw_hexagon(draw, cx, cy, size, color, width=2):
 # ============================================================
 # 1. Feature Graphic (1024x500)
 # ============================================================
-def generate_feature_graphic():
+def generate_feature_graphic(manifest, force=False):
     W, H = 1024, 500
-    img = Image.new('RGB', (W, H), BG_COLOR)
-    draw = ImageDraw.Draw(img)
+    path = os.path.join(SCRIPT_DIR, "feature_graphic.png")
+    inputs = base_inputs("feature_graphic", (W, H), [BG_COLOR, GOLD, TEXT_WHITE, ACCENT_BLUE])
+    if not manifest.is_stale(path, inputs, force=force):
+        return
 
     # Gradient background
-    for y in range(H):
-        r = int(30 + (y / H) * 20)
-        g = int(58 + (y / H) * 15)
-        b = int(95 + (y / H) * 30)
-        draw.line([(0, y), (W, y)], fill=(r, g, b))
+    img = vertical_gradient(W, H, BG_COLOR, (20, 15, 30))
+    draw = ImageDraw.Draw(img)
 
     # Decorative borders
     draw.rectangle([20, 20, W-20, H-20], outline=GOLD, width=2)
@@ -74,25 +84,25 @@ def generate_feature_graphic():
     # Hexagon decoration
     draw_hexagon(draw, W // 2, H // 2 - 10, 60, GOLD, 2)
 
-    fonts = get_fonts({'title': 64, 'subtitle': 32, 'small': 24})
+    sizes = FEATURE_SIZES
 
     # Title - Hebrew (RTL fixed)
     title = heb("חמישה חומשי תורה")
-    draw_centered_text(draw, 120, title, fonts['title'], TEXT_WHITE, W)
+    draw_centered_text(draw, 120, title, sizes['title'], TEXT_WHITE, W)
 
     # English subtitle
-    draw_centered_text(draw, 220, "Five Books of Torah", fonts['subtitle'], ACCENT_BLUE, W)
+    draw_centered_text(draw, 220, "Five Books of Torah", sizes['subtitle'], ACCENT_BLUE, W)
 
     # Book names - Hebrew (RTL fixed)
     tagline = heb("בראשית · שמות · ויקרא · במדבר · דברים")
-    draw_centered_text(draw, 330, tagline, fonts['small'], GOLD, W)
+    draw_centered_text(draw, 330, tagline, sizes['small'], GOLD, W)
 
     # Bottom accent bar
     draw.rectangle([100, H - 60, W - 100, H - 55], fill=GOLD)
 
-    path = os.path.join(SCRIPT_DIR, "feature_graphic.png")
-    img.save(path, "PNG")
-    print(f"[OK] Feature graphic: {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+    before, after = save_optimized(img, path)
+    manifest.record(path, inputs)
+    print(f"[OK] Feature graphic: {path} ({format_saving(before, after)})")
 
 # ============================================================
 # 2. Screenshots (1080x1920 - phone portrait)
@@ -101,29 +111,23 @@ def create_phone_frame(title_text, subtitle_text, features=None, bg_color=BG_COL
     """Create a phone-style screenshot."""
     W, H = 1080, 1920
     img = Image.new('RGB', (W, H), bg_color)
-    draw = ImageDraw.Draw(img)
-
-    fonts = get_fonts({'title': 72, 'subtitle': 40, 'feature': 36, 'small': 28})
+    sizes = PHONE_SIZES
 
     # Top gradient area
-    for y in range(600):
-        alpha = y / 600
-        r = int(bg_color[0] + alpha * 15)
-        g = int(bg_color[1] + alpha * 10)
-        b = int(bg_color[2] + alpha * 20)
-        draw.line([(0, y), (W, y)], fill=(min(r, 255), min(g, 255), min(b, 255)))
+    img.paste(vertical_gradient(W, 600, bg_color, (15, 10, 20)), (0, 0))
+    draw = ImageDraw.Draw(img)
 
     # Gold decorative line
     draw.rectangle([80, 160, W - 80, 163], fill=GOLD)
 
     # Title
     title = heb(title_text)
-    draw_centered_text(draw, 220, title, fonts['title'], TEXT_WHITE, W)
+    draw_centered_text(draw, 220, title, sizes['title'], TEXT_WHITE, W)
 
     # Subtitle
     if subtitle_text:
         sub = heb(subtitle_text)
-        draw_centered_text(draw, 320, sub, fonts['subtitle'], GOLD, W)
+        draw_centered_text(draw, 320, sub, sizes['subtitle'], GOLD, W)
 
     # Features list
     if features:
@@ -133,104 +137,96 @@ def create_phone_frame(title_text, subtitle_text, features=None, bg_color=BG_COL
             # Draw bullet
             draw.ellipse([W - 140, y_start + i * 90 + 10, W - 120, y_start + i * 90 + 30], fill=GOLD)
             # Draw text right-aligned
-            bbox = draw.textbbox((0, 0), feat_text, font=fonts['feature'])
-            tw = bbox[2] - bbox[0]
-            draw.text((W - 160 - tw, y_start + i * 90), feat_text, fill=TEXT_WHITE, font=fonts['feature'])
+            draw_right_aligned_text(draw, W - 160, y_start + i * 90, feat_text, sizes['feature'], TEXT_WHITE)
 
     # Decorative bottom
     draw.rectangle([80, H - 160, W - 80, H - 157], fill=GOLD)
 
     # App name at bottom
     app_name = heb("חמישה חומשי תורה")
-    draw_centered_text(draw, H - 120, app_name, fonts['small'], ACCENT_BLUE, W)
+    draw_centered_text(draw, H - 120, app_name, sizes['small'], ACCENT_BLUE, W)
 
     return img
 
-def generate_screenshots():
-    # Screenshot 1: Main - app overview
-    img1 = create_phone_frame(
-        "חמישה חומשי תורה",
-        "האפליקציה המושלמת ללימוד תורה",
-        [
-            "בראשית · שמות · ויקרא · במדבר · דברים",
-            "פירושי רש\"י, רמב\"ן, אבן עזרא, ספורנו",
-            "חיפוש חכם בכל התורה",
-            "סימניות והערות אישיות",
-            "הדגשת טקסט בצבעים",
-            "מצב כהה ובהיר",
-        ]
-    )
-    img1.save(os.path.join(SCREENSHOTS_DIR, "screenshot_1_main.png"), "PNG")
-    print(f"[OK] Screenshot 1: Main")
-
-    # Screenshot 2: Reading experience
-    img2 = create_phone_frame(
-        "קריאה נוחה",
-        "ניקוד וטעמים מלאים",
-        [
-            "גלילה חלקה בין פסוקים",
-            "ניווט מהיר בין פרקים",
-            "גודל גופן מותאם אישית",
-            "תצוגה קומפקטית או מורחבת",
-            "תמיכה מלאה בעברית",
-        ]
-    )
-    img2.save(os.path.join(SCREENSHOTS_DIR, "screenshot_2_scroll.png"), "PNG")
-    print(f"[OK] Screenshot 2: Reading")
-
-    # Screenshot 3: Commentaries
-    img3 = create_phone_frame(
-        "פירושים ומפרשים",
-        "גישה ישירה לפירושים",
-        [
-            "רש\"י - פירוש מקיף",
-            "רמב\"ן - פירוש מעמיק",
-            "אבן עזרא - פשט הכתוב",
-            "ספורנו - הסבר ברור",
-            "תצוגה נוחה לצד הפסוק",
-        ]
-    )
-    img3.save(os.path.join(SCREENSHOTS_DIR, "screenshot_3_nav.png"), "PNG")
-    print(f"[OK] Screenshot 3: Commentaries")
-
-    # Screenshot 4: Personal features
-    img4 = create_phone_frame(
-        "כלים אישיים",
-        "שמרו את הלימוד שלכם",
-        [
-            "סימניות לגישה מהירה",
-            "הערות אישיות לכל פסוק",
-            "שאלות ותשובות",
-            "הדגשות בצבעים שונים",
-            "סנכרון בענן בין מכשירים",
-        ]
-    )
-    img4.save(os.path.join(SCREENSHOTS_DIR, "screenshot_4_back.png"), "PNG")
-    print(f"[OK] Screenshot 4: Personal tools")
-
-    # Screenshot 5: Search
-    img5 = create_phone_frame(
-        "חיפוש חכם",
-        "מצאו כל פסוק במהירות",
-        [
-            "חיפוש בכל חמשת החומשים",
-            "תוצאות מדויקות מיידיות",
-            "הדגשה אוטומטית של תוצאות",
-            "ניווט ישיר לפסוק",
-            "היסטוריית חיפושים",
-        ]
-    )
-    img5.save(os.path.join(SCREENSHOTS_DIR, "screenshot_5_landscape.png"), "PNG")
-    print(f"[OK] Screenshot 5: Search")
+SCREENSHOTS = [
+    # (filename, label, title, subtitle, features)
+    ("screenshot_1_main.png", "Main",
+     "חמישה חומשי תורה",
+     "האפליקציה המושלמת ללימוד תורה",
+     [
+         "בראשית · שמות · ויקרא · במדבר · דברים",
+         "פירושי רש\"י, רמב\"ן, אבן עזרא, ספורנו",
+         "חיפוש חכם בכל התורה",
+         "סימניות והערות אישיות",
+         "הדגשת טקסט בצבעים",
+         "מצב כהה ובהיר",
+     ]),
+    ("screenshot_2_scroll.png", "Reading",
+     "קריאה נוחה",
+     "ניקוד וטעמים מלאים",
+     [
+         "גלילה חלקה בין פסוקים",
+         "ניווט מהיר בין פרקים",
+         "גודל גופן מותאם אישית",
+         "תצוגה קומפקטית או מורחבת",
+         "תמיכה מלאה בעברית",
+     ]),
+    ("screenshot_3_nav.png", "Commentaries",
+     "פירושים ומפרשים",
+     "גישה ישירה לפירושים",
+     [
+         "רש\"י - פירוש מקיף",
+         "רמב\"ן - פירוש מעמיק",
+         "אבן עזרא - פשט הכתוב",
+         "ספורנו - הסבר ברור",
+         "תצוגה נוחה לצד הפסוק",
+     ]),
+    ("screenshot_4_back.png", "Personal tools",
+     "כלים אישיים",
+     "שמרו את הלימוד שלכם",
+     [
+         "סימניות לגישה מהירה",
+         "הערות אישיות לכל פסוק",
+         "שאלות ותשובות",
+         "הדגשות בצבעים שונים",
+         "סנכרון בענן בין מכשירים",
+     ]),
+    ("screenshot_5_landscape.png", "Search",
+     "חיפוש חכם",
+     "מצאו כל פסוק במהירות",
+     [
+         "חיפוש בכל חמשת החומשים",
+         "תוצאות מדויקות מיידיות",
+         "הדגשה אוטומטית של תוצאות",
+         "ניווט ישיר לפסוק",
+         "היסטוריית חיפושים",
+     ]),
+]
+
+def generate_screenshots(manifest, force=False):
+    for i, (filename, label, title, subtitle, features) in enumerate(SCREENSHOTS, start=1):
+        path = os.path.join(SCREENSHOTS_DIR, filename)
+        inputs = base_inputs("screenshot", (1080, 1920), [BG_COLOR, GOLD, TEXT_WHITE, ACCENT_BLUE])
+        inputs["texts"] = [title, subtitle, features]
+        if not manifest.is_stale(path, inputs, force=force):
+            continue
+        img = create_phone_frame(title, subtitle, features)
+        before, after = save_optimized(img, path)
+        manifest.record(path, inputs)
+        print(f"[OK] Screenshot {i}: {label} ({format_saving(before, after)})")
 
 # ============================================================
 # Run all
 # ============================================================
 if __name__ == "__main__":
+    force = "--force" in sys.argv
+    manifest = AssetManifest(MANIFEST_PATH, ROOT_DIR)
     print("Generating store listing graphics...")
     print("=" * 50)
-    generate_feature_graphic()
-    generate_screenshots()
+    generate_feature_graphic(manifest, force=force)
+    generate_screenshots(manifest, force=force)
+    manifest.save()
+    manifest.report()
     print("=" * 50)
     print("All graphics generated successfully!")
     print(f"\nFiles location:")
@@ -0,0 +1,89 @@
+"""Shared rendering primitives for the store-listing generators.
+
+- vertical_gradient: NumPy-built gradient bands (one array op instead of a
+  draw.line call per pixel row)
+- get_font: cached font registry — the candidate chain is resolved once and
+  each (size) is loaded once per run
+- heb / text_width: cached bidi conversion and text measurements, so the same
+  Hebrew string is reordered and measured only once across all graphics
+
+Requirements: pip install pillow numpy python-bidi
+"""
+from functools import lru_cache
+import os
+import sys
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from bidi.algorithm import get_display
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from asset_manifest import file_digest
+
+# Tried in order; the first one that loads wins.
+FONT_FILES = ["arial.ttf", "C:/Windows/Fonts/arial.ttf"]
+
+
+def vertical_gradient(width, height, start, delta):
+    """RGB image whose row y is int(start + (y / height) * delta), per channel, clipped to 0-255."""
+    t = np.arange(height, dtype=np.float64)[:, None] / height
+    rows = np.asarray(start, dtype=np.float64) + t * np.asarray(delta, dtype=np.float64)
+    rows = np.clip(np.floor(rows), 0, 255).astype(np.uint8)
+    return Image.fromarray(np.repeat(rows[:, None, :], width, axis=1), "RGB")
+
+
+@lru_cache(maxsize=None)
+def resolve_font_file():
+    """
+    Path of the first entry of FONT_FILES that FreeType can open, or None.
+    Bare names like "arial.ttf" are looked up in the system font dirs, so the
+    path Pillow actually opened is returned, not the name.
+    """
+    for name in FONT_FILES:
+        try:
+            return ImageFont.truetype(name, 12).path
+        except OSError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_font(size):
+    """Font at the given size, loaded once per run."""
+    font_file = resolve_font_file()
+    if font_file is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(font_file, size)
+
+
+def font_inputs():
+    """Identity of the font in use, for the asset manifest hash."""
+    font_file = resolve_font_file()
+    return [file_digest(font_file) if font_file else "pillow-default"]
+
+
+@lru_cache(maxsize=None)
+def heb(text):
+    """Convert Hebrew text to display form (fixes RTL)."""
+    return get_display(text)
+
+
+_MEASURE = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+
+@lru_cache(maxsize=None)
+def text_width(text, size):
+    """Rendered width of (already display-ordered) text at a font size."""
+    bbox = _MEASURE.textbbox((0, 0), text, font=get_font(size))
+    return bbox[2] - bbox[0]
+
+
+def draw_centered_text(draw, y, text, size, fill, width):
+    """Draw text centered horizontally."""
+    x = (width - text_width(text, size)) // 2
+    draw.text((x, y), text, fill=fill, font=get_font(size))
+
+
+def draw_right_aligned_text(draw, right, y, text, size, fill):
+    """Draw text so that it ends at x=right."""
+    draw.text((right - text_width(text, size), y), text, fill=fill, font=get_font(size))
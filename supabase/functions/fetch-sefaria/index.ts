@@ -1,5 +1,63 @@
 import "https://deno.land/x/xhr@0.1.0/mod.ts";
 import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
+import sefariaRefs from "../_shared/sefaria_refs.json" with { type: "json" };
+
+// Titles resolved offline by scripts/resolve_refs.py: commentator → book → title,
+// or null when Sefaria has no such commentary.  Absent entries were never probed.
+const RESOLVED_REFS = sefariaRefs.refs as Record<string, Record<string, string | null>>;
+
+// Verse-level cache table (migration 20261019040000_sefaria_cache.sql), pre-warmed
+// by scripts/warm_sefaria_cache.py and written through here on a miss.  Only the
+// service role may write it (migration 20261019130000); without that key the
+// cache is read-only.
+const SUPABASE_URL = Deno.env.get("SUPABASE_URL");
+const SERVICE_KEY = Deno.env.get("SUPABASE_SERVICE_ROLE_KEY");
+const CACHE_KEY = SERVICE_KEY ?? Deno.env.get("SUPABASE_ANON_KEY");
+const CACHE_TTL_DAYS = 30;
+
+interface CachedVerse {
+  ref: string;
+  text: string;
+}
+
+const cacheHeaders = () => ({
+  apikey: CACHE_KEY!,
+  Authorization: `Bearer ${CACHE_KEY}`,
+  'Content-Type': 'application/json',
+});
+
+// First fresh cached row among the candidate refs (in their order), or null
+async function readCache(refs: string[]): Promise<CachedVerse | null> {
+  if (!SUPABASE_URL || !CACHE_KEY) return null;
+  try {
+    const list = refs.map((r) => `"${r.replace(/\\/g, '\\\\').replace(/"/g, '\\"')}"`).join(',');
+    const url = `${SUPABASE_URL}/rest/v1/sefaria_cache?select=ref,text` +
+      `&ref=in.(${encodeURIComponent(list)})` +
+      `&expires_at=gt.${encodeURIComponent(new Date().toISOString())}`;
+    const response = await fetch(url, { headers: cacheHeaders() });
+    if (!response.ok) return null;
+    const rows: CachedVerse[] = await response.json();
+    return refs.map((r) => rows.find((row) => row.ref === r)).find(Boolean) ?? null;
+  } catch {
+    return null;
+  }
+}
+
+async function writeCache(row: { ref: string; commentator: string; book: string; chapter: number; verse: number; text: string }) {
+  if (!SUPABASE_URL || !SERVICE_KEY) return;
+  try {
+    await fetch(`${SUPABASE_URL}/rest/v1/sefaria_cache`, {
+      method: 'POST',
+      headers: { ...cacheHeaders(), Prefer: 'resolution=merge-duplicates' },
+      body: JSON.stringify({
+        ...row,
+        expires_at: new Date(Date.now() + CACHE_TTL_DAYS * 86_400_000).toISOString(),
+      }),
+    });
+  } catch (error) {
+    console.warn('sefaria_cache write failed:', error);
+  }
+}
 
 const corsHeaders = {
   'Access-Control-Allow-Origin': '*',
@@ -16,9 +74,26 @@ serve(async (req) => {
     
     console.log(`Fetching from Sefaria: ${commentaryName} on ${book} ${chapter}:${verse}`);
 
-    // Build Sefaria API refs (try multiple aliases when needed)
+    const resolvedTitle = RESOLVED_REFS[commentaryName]?.[book];
+    if (resolvedTitle === null) {
+      return new Response(
+        JSON.stringify({
+          error: 'Sefaria returned 404',
+          details: `Sefaria has no ${commentaryName} on ${book}`,
+          requestedRefs: []
+        }),
+        {
+          status: 404,
+          headers: { ...corsHeaders, 'Content-Type': 'application/json' },
+        }
+      );
+    }
+
+    // Build Sefaria API refs: the resolved title, or (not resolved yet) try the aliases
     let refs: string[] = [];
-    if (commentaryName === "Onkelos") {
+    if (resolvedTitle) {
+      refs = [`${resolvedTitle} ${chapter}:${verse}`];
+    } else if (commentaryName === "Onkelos") {
       refs = [`Onkelos ${book} ${chapter}:${verse}`];
     } else if (commentaryName === "HaEmek_Davar") {
       refs = [`Haamek Davar on ${book} ${chapter}:${verse}`];
@@ -42,6 +117,32 @@ serve(async (req) => {
     } else {
       refs = [`${commentaryName.replace(/_/g, ' ')} on ${book} ${chapter}:${verse}`];
     }
+    const cached = await readCache(refs);
+    if (cached) {
+      console.log(`Served from sefaria_cache: ${cached.ref}`);
+      if (!cached.text) {
+        return new Response(
+          JSON.stringify({
+            error: 'Sefaria returned 404',
+            details: 'No text found for requested refs (cached)',
+            requestedRefs: refs
+          }),
+          {
+            status: 404,
+            headers: { ...corsHeaders, 'Content-Type': 'application/json' },
+          }
+        );
+      }
+      return new Response(JSON.stringify({
+        text: cached.text,
+        ref: cached.ref,
+        heRef: '',
+        fullData: { ref: cached.ref, he: cached.text, cached: true }
+      }), {
+        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
+      });
+    }
+
     let data: any = null;
     let usedRef: string | null = null;
     let lastStatus = 0;
@@ -91,9 +192,12 @@ serve(async (req) => {
 
     // Extract Hebrew text from the response
     const hebrewText = data.he || data.text || '';
-    
+    const text = Array.isArray(hebrewText) ? hebrewText.join(' ') : hebrewText;
+
+    await writeCache({ ref: usedRef!, commentator: commentaryName, book, chapter, verse, text });
+
     return new Response(JSON.stringify({
-      text: Array.isArray(hebrewText) ? hebrewText.join(' ') : hebrewText,
+      text,
       ref: data.ref || usedRef,
       heRef: data.heRef || '',
       fullData: data
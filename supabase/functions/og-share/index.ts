@@ -16,6 +16,47 @@ function toHebrewNumber(n: number): string {
   return tens[t] + "״" + ones[o];
 }
 
+// Static cards pre-rendered by scripts/generate_og_images.py, served by the web
+// deploy (npm run build) at /og/<file>; manifest.json lists them.  Fetched
+// once per isolate; without it og:image falls back to the og-image function.
+interface OgCard {
+  file: string;
+  title: string;
+  desc: string;
+  sefer?: number;
+  perek?: number;
+  pasuk?: number;
+}
+
+let ogCardsPromise: Promise<Record<string, OgCard>> | null = null;
+
+function loadOgCards(appOrigin: string): Promise<Record<string, OgCard>> {
+  if (!ogCardsPromise) {
+    ogCardsPromise = fetch(`${appOrigin}/og/manifest.json`)
+      .then((r) => (r.ok ? r.json() : { cards: {} }))
+      .then((m) => m.cards ?? {})
+      .catch(() => {
+        ogCardsPromise = null;
+        return {};
+      });
+  }
+  return ogCardsPromise;
+}
+
+// Card for a shared location: Nevi'im chapter, or the Torah parsha containing it
+function findOgCard(cards: Record<string, OgCard>, sefer: number, perek: number, pasuk: number): OgCard | null {
+  if (cards[`sefer/${sefer}/${perek}`]) return cards[`sefer/${sefer}/${perek}`];
+  let best: OgCard | null = null;
+  for (const [key, card] of Object.entries(cards)) {
+    if (!key.startsWith("parsha/") || card.sefer !== sefer) continue;
+    const starts = card.perek! < perek || (card.perek === perek && card.pasuk! <= (pasuk || 1));
+    if (starts && (!best || card.perek! > best.perek! || (card.perek === best.perek && card.pasuk! > best.pasuk!))) {
+      best = card;
+    }
+  }
+  return best;
+}
+
 serve(async (req) => {
   const url = new URL(req.url);
   const sefer = parseInt(url.searchParams.get("sefer") || "0", 10);
@@ -23,6 +64,7 @@ serve(async (req) => {
   const pasuk = parseInt(url.searchParams.get("pasuk") || "0", 10);
   const highlight = url.searchParams.get("highlight") || "";
   const mefaresh = url.searchParams.get("mefaresh") || "";
+  const cardKey = url.searchParams.get("card") || "";   // e.g. tehillim/23, siddur/sefard/shacharit/3
 
   // Build the app URL to redirect to
   const appOrigin = Deno.env.get("APP_ORIGIN") || "https://pash.lovable.app";
@@ -32,7 +74,8 @@ serve(async (req) => {
   if (pasuk) appParams.set("pasuk", String(pasuk));
   if (highlight) appParams.set("highlight", highlight);
   if (mefaresh) appParams.set("mefaresh", mefaresh);
-  const appUrl = `${appOrigin}/?${appParams.toString()}`;
+  // Tehillim / Siddur cards have no Torah location: open the siddur page
+  const appUrl = cardKey && !sefer ? `${appOrigin}/siddur` : `${appOrigin}/?${appParams.toString()}`;
 
   const seferName = SEFER_NAMES[sefer - 1] || "תורה";
   const seferEn = SEFER_ENGLISH[sefer - 1] || "Torah";
@@ -59,8 +102,16 @@ serve(async (req) => {
     }
   }
 
-  // Generate a simple OG image via text overlay (using a solid color card)
-  const ogImageUrl = `${url.origin}/functions/v1/og-image?title=${encodeURIComponent(ogTitle)}&desc=${encodeURIComponent(ogDescription.slice(0, 100))}`;
+  // Prefer a pre-rendered static card; highlighted text still needs the dynamic image
+  const cards = await loadOgCards(appOrigin);
+  const card = cardKey ? cards[cardKey] ?? null : !highlight && sefer && perek ? findOgCard(cards, sefer, perek, pasuk) : null;
+  if (card && cardKey && !sefer) {
+    ogTitle = card.title;
+    ogDescription = card.desc || ogDescription;
+  }
+  const ogImageUrl = card
+    ? `${appOrigin}/og/${card.file}`
+    : `${url.origin}/functions/v1/og-image?title=${encodeURIComponent(ogTitle)}&desc=${encodeURIComponent(ogDescription.slice(0, 100))}`;
 
   const html = `<!DOCTYPE html>
 <html lang="he" dir="rtl">
@@ -0,0 +1,58 @@
+-- Per-chapter content checksums, used by scripts/verify_uploads.py to compare
+-- uploaded data with the local JSON without downloading it.
+--
+-- Each function hashes exactly the canonical text the verifier builds locally:
+--   commentaries / rashi_commentary : "<pasuk>\t<text>" per row, ordered by pasuk
+--   siddur                          : "<section_idx>\t<cat_name>\t<title>\t<lines::text>"
+--   tehillim                        : "<title>\t<lines::text>"
+-- joined with "\n" and md5'd, grouped by chapter (category for siddur).
+
+CREATE OR REPLACE FUNCTION public.commentary_checksums(p_commentator text)
+RETURNS TABLE (sefer_id integer, perek integer, row_count bigint, checksum text)
+LANGUAGE sql STABLE
+AS $$
+  SELECT c.sefer_id, c.perek, count(*),
+         md5(string_agg(c.pasuk::text || E'\t' || c.text, E'\n' ORDER BY c.pasuk, c.text))
+  FROM public.commentaries c
+  WHERE c.commentator = p_commentator
+  GROUP BY c.sefer_id, c.perek
+  ORDER BY c.sefer_id, c.perek;
+$$;
+
+CREATE OR REPLACE FUNCTION public.rashi_checksums()
+RETURNS TABLE (sefer_id integer, perek integer, row_count bigint, checksum text)
+LANGUAGE sql STABLE
+AS $$
+  SELECT r.sefer_id, r.perek, count(*),
+         md5(string_agg(r.pasuk::text || E'\t' || r.text, E'\n' ORDER BY r.pasuk, r.text))
+  FROM public.rashi_commentary r
+  GROUP BY r.sefer_id, r.perek
+  ORDER BY r.sefer_id, r.perek;
+$$;
+
+CREATE OR REPLACE FUNCTION public.siddur_checksums()
+RETURNS TABLE (nusach text, category text, row_count bigint, checksum text)
+LANGUAGE sql STABLE
+AS $$
+  SELECT s.nusach, s.category, count(*),
+         md5(string_agg(
+           s.section_idx::text || E'\t' || s.cat_name || E'\t' || s.title || E'\t' || s.lines::text,
+           E'\n' ORDER BY s.section_idx))
+  FROM public.siddur s
+  GROUP BY s.nusach, s.category
+  ORDER BY s.nusach, s.category;
+$$;
+
+CREATE OR REPLACE FUNCTION public.tehillim_checksums()
+RETURNS TABLE (chapter integer, row_count bigint, checksum text)
+LANGUAGE sql STABLE
+AS $$
+  SELECT t.chapter, 1::bigint, md5(t.title || E'\t' || t.lines::text)
+  FROM public.tehillim t
+  ORDER BY t.chapter;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.commentary_checksums(text) TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.rashi_checksums()          TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.siddur_checksums()         TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.tehillim_checksums()       TO anon, authenticated;
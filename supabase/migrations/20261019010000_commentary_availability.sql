@@ -0,0 +1,29 @@
+-- Which commentators have text for each pasuk, one row per chapter.
+-- Built from the local JSON by scripts/upload_commentaries.py, so the app can
+-- show commentary indicators for a whole chapter (and skip empty commentary
+-- queries) from a single tiny fetch.
+--
+--   commentators : bit order, e.g. {Rashi,Ramban,...}  (bit 0 = first entry)
+--   masks        : masks[i] = bitmask of commentators with text on pasuk i+1;
+--                  trailing zero pesukim are omitted
+--   any_mask     : OR of all masks (which commentators have anything in the chapter)
+CREATE TABLE IF NOT EXISTS public.commentary_availability (
+  sefer_id     integer   NOT NULL,
+  perek        integer   NOT NULL,
+  commentators text[]    NOT NULL,
+  masks        integer[] NOT NULL,
+  any_mask     integer   NOT NULL,
+  updated_at   timestamptz DEFAULT now() NOT NULL,
+  PRIMARY KEY (sefer_id, perek)
+);
+
+ALTER TABLE public.commentary_availability ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "commentary_availability_public_read"
+  ON public.commentary_availability FOR SELECT USING (true);
+
+CREATE POLICY "commentary_availability_public_insert"
+  ON public.commentary_availability FOR INSERT WITH CHECK (true);
+
+CREATE POLICY "commentary_availability_public_update"
+  ON public.commentary_availability FOR UPDATE USING (true);
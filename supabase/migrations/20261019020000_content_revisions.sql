@@ -0,0 +1,113 @@
+-- Change feed for offline-first clients.
+--
+-- Every chapter (commentaries, rashi_commentary, tehillim) or section (siddur)
+-- carries the revision at which its content last changed, and each change is
+-- appended to content_changes.  A client that last synced at revision N asks
+-- for content_changes with revision > N (and rows with revision > N), so only
+-- what changed since then is transferred.  See scripts/sync_client.py.
+--
+-- Revisions are handed out by record_content_changes(), which the upload
+-- scripts call with a checksum per scope (scripts/content_revisions.py); an
+-- unchanged checksum does not create a new revision.
+
+CREATE SEQUENCE IF NOT EXISTS public.content_revision_seq;
+
+CREATE TABLE IF NOT EXISTS public.content_changes (
+  revision    bigint  PRIMARY KEY,
+  table_name  text    NOT NULL,   -- commentaries | rashi_commentary | siddur | tehillim
+  scope       jsonb   NOT NULL,   -- e.g. {"commentator": "Rashi", "sefer_id": 1, "perek": 3}
+  checksum    text,               -- md5 of the scope's canonical text; NULL = deleted
+  changed_at  timestamptz DEFAULT now() NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_content_changes_scope
+  ON public.content_changes (table_name, scope, revision DESC);
+
+ALTER TABLE public.content_changes ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "content_changes_public_read"
+  ON public.content_changes FOR SELECT USING (true);
+
+-- ── Revision column on the content tables ────────────────────────────────────
+ALTER TABLE public.commentaries     ADD COLUMN IF NOT EXISTS revision bigint;
+ALTER TABLE public.rashi_commentary ADD COLUMN IF NOT EXISTS revision bigint;
+ALTER TABLE public.siddur           ADD COLUMN IF NOT EXISTS revision bigint;
+ALTER TABLE public.tehillim         ADD COLUMN IF NOT EXISTS revision bigint;
+
+CREATE INDEX IF NOT EXISTS idx_commentaries_revision     ON public.commentaries (revision);
+CREATE INDEX IF NOT EXISTS idx_rashi_commentary_revision ON public.rashi_commentary (revision);
+CREATE INDEX IF NOT EXISTS idx_siddur_revision           ON public.siddur (revision);
+CREATE INDEX IF NOT EXISTS idx_tehillim_revision         ON public.tehillim (revision);
+
+-- ── Stamping ──────────────────────────────────────────────────────────────────
+-- p_changes: [{"table": ..., "scope": {...}, "checksum": "..." | null}, ...]
+-- Returns how many scopes got a new revision.  Rows of unchanged scopes that
+-- were re-inserted (and so lost their revision) are re-stamped with the
+-- existing one.
+CREATE OR REPLACE FUNCTION public.record_content_changes(p_changes jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  ch        jsonb;
+  tbl       text;
+  sc        jsonb;
+  last_sum  text;
+  last_rev  bigint;
+  rev       bigint;
+  created   integer := 0;
+BEGIN
+  FOR ch IN SELECT * FROM jsonb_array_elements(p_changes) LOOP
+    tbl := ch->>'table';
+    sc  := ch->'scope';
+    IF tbl NOT IN ('commentaries', 'rashi_commentary', 'siddur', 'tehillim') THEN
+      RAISE EXCEPTION 'record_content_changes: unknown table %', tbl;
+    END IF;
+
+    SELECT c.checksum, c.revision INTO last_sum, last_rev
+    FROM content_changes c
+    WHERE c.table_name = tbl AND c.scope = sc
+    ORDER BY c.revision DESC
+    LIMIT 1;
+
+    IF FOUND AND last_sum IS NOT DISTINCT FROM (ch->>'checksum') THEN
+      rev := last_rev;
+    ELSE
+      rev := nextval('content_revision_seq');
+      INSERT INTO content_changes (revision, table_name, scope, checksum)
+      VALUES (rev, tbl, sc, ch->>'checksum');
+      created := created + 1;
+    END IF;
+
+    IF tbl = 'commentaries' THEN
+      UPDATE commentaries SET revision = rev
+      WHERE commentator = sc->>'commentator'
+        AND sefer_id = (sc->>'sefer_id')::int
+        AND perek = (sc->>'perek')::int
+        AND revision IS DISTINCT FROM rev;
+    ELSIF tbl = 'rashi_commentary' THEN
+      UPDATE rashi_commentary SET revision = rev
+      WHERE sefer_id = (sc->>'sefer_id')::int
+        AND perek = (sc->>'perek')::int
+        AND revision IS DISTINCT FROM rev;
+    ELSIF tbl = 'siddur' THEN
+      UPDATE siddur SET revision = rev
+      WHERE nusach = sc->>'nusach'
+        AND category = sc->>'category'
+        AND section_idx = (sc->>'section_idx')::int
+        AND revision IS DISTINCT FROM rev;
+    ELSE
+      UPDATE tehillim SET revision = rev
+      WHERE chapter = (sc->>'chapter')::int
+        AND revision IS DISTINCT FROM rev;
+    END IF;
+  END LOOP;
+
+  RETURN created;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public.record_content_changes(jsonb) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.record_content_changes(jsonb) TO anon, authenticated;
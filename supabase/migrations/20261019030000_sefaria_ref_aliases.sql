@@ -0,0 +1,23 @@
+-- Sefaria title for every commentator × book, resolved once offline by
+-- scripts/resolve_refs.py instead of probing aliases on each request.
+-- ref IS NULL records that Sefaria has no such commentary.
+-- The same table ships as supabase/functions/_shared/sefaria_refs.json with
+-- the fetch-sefaria edge function.
+CREATE TABLE IF NOT EXISTS public.sefaria_ref_aliases (
+  commentator  text        NOT NULL,   -- e.g. Beur_HaGra (AVAILABLE_COMMENTARIES english name)
+  book         text        NOT NULL,   -- Sefaria book title, e.g. Genesis, I Samuel
+  ref          text,                   -- e.g. "Beur HaGra on Genesis"
+  resolved_at  timestamptz DEFAULT now() NOT NULL,
+  PRIMARY KEY (commentator, book)
+);
+
+ALTER TABLE public.sefaria_ref_aliases ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "sefaria_ref_aliases_public_read"
+  ON public.sefaria_ref_aliases FOR SELECT USING (true);
+
+CREATE POLICY "sefaria_ref_aliases_public_insert"
+  ON public.sefaria_ref_aliases FOR INSERT WITH CHECK (true);
+
+CREATE POLICY "sefaria_ref_aliases_public_update"
+  ON public.sefaria_ref_aliases FOR UPDATE USING (true);
@@ -0,0 +1,69 @@
+-- Server-side cache of Sefaria commentary text, per verse, for commentators
+-- that aren't in the commentaries table (Alshich, Beur HaGra, ...).
+-- Filled for whole books by scripts/warm_sefaria_cache.py and written through
+-- by the fetch-sefaria edge function on a miss; the function serves rows whose
+-- expires_at is still in the future instead of proxying Sefaria.
+--
+--   ref    the exact Sefaria ref requested, e.g. "Beur HaGra on Genesis 1:1"
+--          (title from sefaria_ref_aliases)
+--   text   Hebrew text as fetch-sefaria returns it; '' = Sefaria has nothing
+--          for this verse (cached so it isn't asked again)
+--   bytes  stored size, for accounting (see sefaria_cache_usage)
+CREATE TABLE IF NOT EXISTS public.sefaria_cache (
+  ref          text        PRIMARY KEY,
+  commentator  text        NOT NULL,
+  book         text        NOT NULL,
+  chapter      integer     NOT NULL,
+  verse        integer     NOT NULL,
+  text         text        NOT NULL,
+  bytes        integer     GENERATED ALWAYS AS (octet_length(text)) STORED,
+  fetched_at   timestamptz DEFAULT now() NOT NULL,
+  expires_at   timestamptz NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_sefaria_cache_book
+  ON public.sefaria_cache (commentator, book, expires_at);
+CREATE INDEX IF NOT EXISTS idx_sefaria_cache_expires
+  ON public.sefaria_cache (expires_at);
+
+ALTER TABLE public.sefaria_cache ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "sefaria_cache_public_read"
+  ON public.sefaria_cache FOR SELECT USING (true);
+
+CREATE POLICY "sefaria_cache_public_insert"
+  ON public.sefaria_cache FOR INSERT WITH CHECK (true);
+
+CREATE POLICY "sefaria_cache_public_update"
+  ON public.sefaria_cache FOR UPDATE USING (true);
+
+-- ── Accounting ────────────────────────────────────────────────────────────────
+CREATE OR REPLACE VIEW public.sefaria_cache_usage AS
+SELECT
+  commentator,
+  book,
+  count(*)                                    AS rows,
+  count(*) FILTER (WHERE text = '')           AS empty_rows,
+  count(*) FILTER (WHERE expires_at <= now()) AS expired_rows,
+  coalesce(sum(bytes), 0)::bigint             AS bytes,
+  min(expires_at)                             AS first_expiry
+FROM public.sefaria_cache
+GROUP BY commentator, book;
+
+GRANT SELECT ON public.sefaria_cache_usage TO anon, authenticated;
+
+-- Drops expired rows; returns how many were deleted.
+CREATE OR REPLACE FUNCTION public.purge_expired_sefaria_cache()
+RETURNS integer
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  WITH gone AS (
+    DELETE FROM sefaria_cache WHERE expires_at <= now() RETURNING 1
+  )
+  SELECT count(*)::integer FROM gone;
+$$;
+
+REVOKE ALL ON FUNCTION public.purge_expired_sefaria_cache() FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.purge_expired_sefaria_cache() TO authenticated;
@@ -0,0 +1,116 @@
+-- Rashi is stored once, in commentaries (commentator = 'Rashi').
+--
+-- upload_rashi.py used to write the same Rashi_on_*.json files into
+-- rashi_commentary that upload_commentaries.py writes into commentaries —
+-- double the writes, storage and index upkeep, and two copies that could drift.
+-- rashi_commentary becomes a read-only view over commentaries so existing
+-- readers keep working while served from the one indexed copy
+-- (idx_commentaries_chapter).
+
+-- ── Move any Rashi rows that only exist in the old table ────────────────────
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_tables WHERE schemaname = 'public' AND tablename = 'rashi_commentary') THEN
+    INSERT INTO public.commentaries (commentator, sefer_id, perek, pasuk, text, created_at)
+    SELECT 'Rashi', r.sefer_id, r.perek, r.pasuk, r.text, r.created_at
+    FROM public.rashi_commentary r
+    ON CONFLICT (commentator, sefer_id, perek, pasuk) DO NOTHING;
+
+    -- Change feed: retire every rashi_commentary scope; syncing clients drop
+    -- their copy and get Rashi through the commentaries scopes instead.
+    INSERT INTO public.content_changes (revision, table_name, scope, checksum)
+    SELECT nextval('public.content_revision_seq'), 'rashi_commentary', s.scope, NULL
+    FROM (
+      SELECT DISTINCT ON (c.scope) c.scope, c.checksum
+      FROM public.content_changes c
+      WHERE c.table_name = 'rashi_commentary'
+      ORDER BY c.scope, c.revision DESC
+    ) s
+    WHERE s.checksum IS NOT NULL;
+
+    DROP TABLE public.rashi_commentary;
+  END IF;
+END;
+$$;
+
+-- ── Compatible view ──────────────────────────────────────────────────────────
+-- Same columns as the old table.  revision is NULL: Rashi's revisions are
+-- recorded on the commentaries scopes.
+CREATE OR REPLACE VIEW public.rashi_commentary
+WITH (security_invoker = true) AS
+SELECT c.id, c.sefer_id, c.perek, c.pasuk, c.text, c.created_at, NULL::bigint AS revision
+FROM public.commentaries c
+WHERE c.commentator = 'Rashi';
+
+GRANT SELECT ON public.rashi_commentary TO anon, authenticated;
+
+CREATE OR REPLACE FUNCTION public.rashi_checksums()
+RETURNS TABLE (sefer_id integer, perek integer, row_count bigint, checksum text)
+LANGUAGE sql STABLE
+AS $$
+  SELECT * FROM public.commentary_checksums('Rashi');
+$$;
+
+-- ── Stamping: rashi_commentary is no longer a table of its own ─────────────
+CREATE OR REPLACE FUNCTION public.record_content_changes(p_changes jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  ch        jsonb;
+  tbl       text;
+  sc        jsonb;
+  last_sum  text;
+  last_rev  bigint;
+  rev       bigint;
+  created   integer := 0;
+BEGIN
+  FOR ch IN SELECT * FROM jsonb_array_elements(p_changes) LOOP
+    tbl := ch->>'table';
+    sc  := ch->'scope';
+    IF tbl = 'rashi_commentary' THEN
+      RAISE EXCEPTION 'record_content_changes: rashi_commentary is a view — stamp commentaries (commentator Rashi)';
+    END IF;
+    IF tbl NOT IN ('commentaries', 'siddur', 'tehillim') THEN
+      RAISE EXCEPTION 'record_content_changes: unknown table %', tbl;
+    END IF;
+
+    SELECT c.checksum, c.revision INTO last_sum, last_rev
+    FROM content_changes c
+    WHERE c.table_name = tbl AND c.scope = sc
+    ORDER BY c.revision DESC
+    LIMIT 1;
+
+    IF FOUND AND last_sum IS NOT DISTINCT FROM (ch->>'checksum') THEN
+      rev := last_rev;
+    ELSE
+      rev := nextval('content_revision_seq');
+      INSERT INTO content_changes (revision, table_name, scope, checksum)
+      VALUES (rev, tbl, sc, ch->>'checksum');
+      created := created + 1;
+    END IF;
+
+    IF tbl = 'commentaries' THEN
+      UPDATE commentaries SET revision = rev
+      WHERE commentator = sc->>'commentator'
+        AND sefer_id = (sc->>'sefer_id')::int
+        AND perek = (sc->>'perek')::int
+        AND revision IS DISTINCT FROM rev;
+    ELSIF tbl = 'siddur' THEN
+      UPDATE siddur SET revision = rev
+      WHERE nusach = sc->>'nusach'
+        AND category = sc->>'category'
+        AND section_idx = (sc->>'section_idx')::int
+        AND revision IS DISTINCT FROM rev;
+    ELSE
+      UPDATE tehillim SET revision = rev
+      WHERE chapter = (sc->>'chapter')::int
+        AND revision IS DISTINCT FROM rev;
+    END IF;
+  END LOOP;
+
+  RETURN created;
+END;
+$$;
@@ -0,0 +1,37 @@
+-- One row per comment instead of one joined blob per pasuk.
+--
+-- Sefaria gives most commentators a list of separate comments per pasuk, each
+-- opening with its dibur hamatchil (the quoted words it explains).  The
+-- uploader used to join them into one text value, so a client that wanted
+-- the comment on a single word had to fetch and re-split the whole pasuk.
+-- Rows are now keyed by (commentator, sefer_id, perek, pasuk, comment_idx),
+-- with the dibur hamatchil extracted by scripts/upload_commentaries.py, so
+--   commentaries?sefer_id=eq.1&perek=eq.1&pasuk=eq.1&dibur_hamatchil=like.בראשית*
+-- returns only the matching comment(s).
+--
+-- Existing rows become comment 0 of their pasuk; re-run
+-- upload_commentaries.py --force to split them (verify_uploads.py also
+-- repairs chapters whose rows differ).
+
+ALTER TABLE public.commentaries ADD COLUMN IF NOT EXISTS comment_idx     integer NOT NULL DEFAULT 0;
+ALTER TABLE public.commentaries ADD COLUMN IF NOT EXISTS dibur_hamatchil text;
+
+ALTER TABLE public.commentaries DROP CONSTRAINT IF EXISTS commentaries_unique;
+ALTER TABLE public.commentaries
+  ADD CONSTRAINT commentaries_unique UNIQUE (commentator, sefer_id, perek, pasuk, comment_idx);
+
+-- The unique constraint's index covers pasuk lookups; the old one is redundant
+DROP INDEX IF EXISTS public.idx_commentaries_lookup;
+
+-- Quoted-word lookups (equality or prefix) on one pasuk, any commentator
+CREATE INDEX IF NOT EXISTS idx_commentaries_dibur
+  ON public.commentaries (sefer_id, perek, pasuk, dibur_hamatchil text_pattern_ops)
+  WHERE dibur_hamatchil IS NOT NULL;
+
+-- rashi_commentary view (20261019050000) gains the new columns
+CREATE OR REPLACE VIEW public.rashi_commentary
+WITH (security_invoker = true) AS
+SELECT c.id, c.sefer_id, c.perek, c.pasuk, c.text, c.created_at, NULL::bigint AS revision,
+       c.comment_idx, c.dibur_hamatchil
+FROM public.commentaries c
+WHERE c.commentator = 'Rashi';
@@ -0,0 +1,85 @@
+-- Bulk upsert RPCs: a whole file (or a few MB of it) per request.
+--
+-- POST /rest/v1/<table> makes PostgREST convert and insert every request's
+-- JSON separately, and the uploaders needed dozens of requests per
+-- commentator.  With only the anon / service key there is no COPY path, so
+-- these functions take one large jsonb array and upsert it in a single
+-- INSERT ... SELECT FROM jsonb_to_recordset ... ON CONFLICT statement:
+--
+--   POST /rest/v1/rpc/bulk_upsert_commentaries   {"p_rows": [{...}, ...]}
+--   POST /rest/v1/rpc/bulk_upsert_commentaries   {"p_gzip": "<base64 of gzipped JSON array>"}
+--
+-- p_gzip needs the gzip extension (pgsql-gzip); without it the function
+-- raises and scripts/batch_upload.py falls back to p_rows.  Rows whose content
+-- is unchanged are not rewritten; the return value is the number of rows
+-- inserted or changed.  SECURITY INVOKER — the tables' RLS policies apply.
+
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'gzip') THEN
+    CREATE EXTENSION IF NOT EXISTS gzip WITH SCHEMA extensions;
+  END IF;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.bulk_payload(p_rows jsonb, p_gzip text)
+RETURNS jsonb
+LANGUAGE plpgsql STABLE
+AS $$
+BEGIN
+  IF p_gzip IS NULL THEN
+    RETURN coalesce(p_rows, '[]'::jsonb);
+  END IF;
+  IF NOT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'gzip') THEN
+    RAISE EXCEPTION 'bulk_payload: gzip extension not installed — send p_rows instead';
+  END IF;
+  RETURN convert_from(extensions.gunzip(decode(p_gzip, 'base64')), 'UTF8')::jsonb;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.bulk_upsert_commentaries(p_rows jsonb DEFAULT NULL, p_gzip text DEFAULT NULL)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  written integer;
+BEGIN
+  INSERT INTO public.commentaries AS c
+    (commentator, sefer_id, perek, pasuk, comment_idx, dibur_hamatchil, text)
+  SELECT r.commentator, r.sefer_id, r.perek, r.pasuk, coalesce(r.comment_idx, 0), r.dibur_hamatchil, r.text
+  FROM jsonb_to_recordset(public.bulk_payload(p_rows, p_gzip)) AS r(
+    commentator text, sefer_id integer, perek integer, pasuk integer,
+    comment_idx integer, dibur_hamatchil text, text text)
+  ON CONFLICT (commentator, sefer_id, perek, pasuk, comment_idx) DO UPDATE
+    SET dibur_hamatchil = EXCLUDED.dibur_hamatchil,
+        text            = EXCLUDED.text
+    WHERE (c.dibur_hamatchil, c.text) IS DISTINCT FROM (EXCLUDED.dibur_hamatchil, EXCLUDED.text);
+  GET DIAGNOSTICS written = ROW_COUNT;
+  RETURN written;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.bulk_upsert_siddur(p_rows jsonb DEFAULT NULL, p_gzip text DEFAULT NULL)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  written integer;
+BEGIN
+  INSERT INTO public.siddur AS s (nusach, category, cat_name, section_idx, title, lines)
+  SELECT r.nusach, r.category, r.cat_name, r.section_idx, r.title, r.lines
+  FROM jsonb_to_recordset(public.bulk_payload(p_rows, p_gzip)) AS r(
+    nusach text, category text, cat_name text, section_idx integer, title text, lines jsonb)
+  ON CONFLICT (nusach, category, section_idx) DO UPDATE
+    SET cat_name = EXCLUDED.cat_name,
+        title    = EXCLUDED.title,
+        lines    = EXCLUDED.lines
+    WHERE (s.cat_name, s.title, s.lines) IS DISTINCT FROM (EXCLUDED.cat_name, EXCLUDED.title, EXCLUDED.lines);
+  GET DIAGNOSTICS written = ROW_COUNT;
+  RETURN written;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.bulk_payload(jsonb, text)             TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.bulk_upsert_commentaries(jsonb, text) TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.bulk_upsert_siddur(jsonb, text)       TO anon, authenticated;
@@ -0,0 +1,206 @@
+-- commentaries, list-partitioned by commentator.
+--
+-- All commentators used to share one heap and one set of indexes, so
+-- re-seeding one of them churned indexes every other commentator's reads use.
+-- Each commentator now has its own partition (schema commentary_partitions,
+-- not exposed over REST); reads filtered on commentator — every chapter query
+-- the app makes — are pruned to one partition, and unknown commentators land
+-- in c_default.  Sub-partitioning by sefer_id was left out: a commentator's
+-- five books are a few thousand rows.
+--
+-- A full reload of one commentator (upload_commentaries.py --reload) builds a
+-- staging table off to the side and swaps it in with detach + attach in one
+-- transaction, touching nothing else:
+--   rpc/commentary_reload_begin  {"p_commentator": "Malbim"}
+--   rpc/commentary_reload_rows   {"p_commentator": "Malbim", "p_rows": [...]}   (or p_gzip)
+--   rpc/commentary_reload_swap   {"p_commentator": "Malbim"}
+-- These are SECURITY DEFINER and granted to service_role only.
+
+CREATE SCHEMA IF NOT EXISTS commentary_partitions;
+
+-- Everything up to the swap runs only while public.commentaries is still a
+-- plain table, so a re-run (apply_migration.py --all, or after a partial
+-- failure) skips it; leftovers of an earlier attempt are dropped first.
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+             WHERE n.nspname = 'public' AND c.relname = 'commentaries' AND c.relkind = 'p') THEN
+    RETURN;
+  END IF;
+
+  -- ── New partitioned table ─────────────────────────────────────────────────
+  DROP TABLE IF EXISTS public.commentaries_partitioned CASCADE;
+  DROP TABLE IF EXISTS commentary_partitions.c_rashi, commentary_partitions.c_ramban,
+    commentary_partitions.c_ibn_ezra, commentary_partitions.c_sforno, commentary_partitions.c_or_hachaim,
+    commentary_partitions.c_kli_yakar, commentary_partitions.c_chizkuni, commentary_partitions.c_malbim,
+    commentary_partitions.c_default;
+
+  CREATE TABLE public.commentaries_partitioned (
+    id              uuid    DEFAULT gen_random_uuid() NOT NULL,
+    commentator     text    NOT NULL,
+    sefer_id        integer NOT NULL,
+    perek           integer NOT NULL,
+    pasuk           integer NOT NULL,
+    text            text    NOT NULL,
+    created_at      timestamptz DEFAULT now() NOT NULL,
+    revision        bigint,
+    comment_idx     integer NOT NULL DEFAULT 0,
+    dibur_hamatchil text
+  ) PARTITION BY LIST (commentator);
+
+  CREATE TABLE commentary_partitions.c_rashi       PARTITION OF public.commentaries_partitioned FOR VALUES IN ('Rashi');
+  CREATE TABLE commentary_partitions.c_ramban      PARTITION OF public.commentaries_partitioned FOR VALUES IN ('Ramban');
+  CREATE TABLE commentary_partitions.c_ibn_ezra    PARTITION OF public.commentaries_partitioned FOR VALUES IN ('Ibn_Ezra');
+  CREATE TABLE commentary_partitions.c_sforno      PARTITION OF public.commentaries_partitioned FOR VALUES IN ('Sforno');
+  CREATE TABLE commentary_partitions.c_or_hachaim  PARTITION OF public.commentaries_partitioned FOR VALUES IN ('Or_HaChaim');
+  CREATE TABLE commentary_partitions.c_kli_yakar   PARTITION OF public.commentaries_partitioned FOR VALUES IN ('Kli_Yakar');
+  CREATE TABLE commentary_partitions.c_chizkuni    PARTITION OF public.commentaries_partitioned FOR VALUES IN ('Chizkuni');
+  CREATE TABLE commentary_partitions.c_malbim      PARTITION OF public.commentaries_partitioned FOR VALUES IN ('Malbim');
+  CREATE TABLE commentary_partitions.c_default     PARTITION OF public.commentaries_partitioned DEFAULT;
+
+  INSERT INTO public.commentaries_partitioned
+    (id, commentator, sefer_id, perek, pasuk, text, created_at, revision, comment_idx, dibur_hamatchil)
+  SELECT id, commentator, sefer_id, perek, pasuk, text, created_at, revision, comment_idx, dibur_hamatchil
+  FROM public.commentaries;
+
+  -- ── Swap it in ──────────────────────────────────────────────────────────────
+  DROP VIEW IF EXISTS public.rashi_commentary;
+  DROP TABLE IF EXISTS public.commentaries;
+  ALTER TABLE public.commentaries_partitioned RENAME TO commentaries;
+
+  -- Unique keys must include the partition key
+  ALTER TABLE public.commentaries ADD CONSTRAINT commentaries_pkey PRIMARY KEY (commentator, id);
+  ALTER TABLE public.commentaries
+    ADD CONSTRAINT commentaries_unique UNIQUE (commentator, sefer_id, perek, pasuk, comment_idx);
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_commentaries_chapter  ON public.commentaries (commentator, sefer_id, perek);
+CREATE INDEX IF NOT EXISTS idx_commentaries_revision ON public.commentaries (revision);
+CREATE INDEX IF NOT EXISTS idx_commentaries_dibur
+  ON public.commentaries (sefer_id, perek, pasuk, dibur_hamatchil text_pattern_ops)
+  WHERE dibur_hamatchil IS NOT NULL;
+
+ALTER TABLE public.commentaries ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "commentaries_public_read"   ON public.commentaries;
+DROP POLICY IF EXISTS "commentaries_public_insert" ON public.commentaries;
+DROP POLICY IF EXISTS "commentaries_public_delete" ON public.commentaries;
+DROP POLICY IF EXISTS "commentaries_public_update" ON public.commentaries;
+
+CREATE POLICY "commentaries_public_read"
+  ON public.commentaries FOR SELECT USING (true);
+
+CREATE POLICY "commentaries_public_insert"
+  ON public.commentaries FOR INSERT WITH CHECK (true);
+
+CREATE POLICY "commentaries_public_delete"
+  ON public.commentaries FOR DELETE USING (true);
+
+CREATE POLICY "commentaries_public_update"
+  ON public.commentaries FOR UPDATE USING (true);
+
+GRANT SELECT, INSERT, UPDATE, DELETE ON public.commentaries TO anon, authenticated;
+
+CREATE OR REPLACE VIEW public.rashi_commentary
+WITH (security_invoker = true) AS
+SELECT c.id, c.sefer_id, c.perek, c.pasuk, c.text, c.created_at, NULL::bigint AS revision,
+       c.comment_idx, c.dibur_hamatchil
+FROM public.commentaries c
+WHERE c.commentator = 'Rashi';
+
+GRANT SELECT ON public.rashi_commentary TO anon, authenticated;
+
+-- ── Partition reload ──────────────────────────────────────────────────────────
+CREATE OR REPLACE FUNCTION public.commentary_partition_name(p_commentator text)
+RETURNS text
+LANGUAGE sql IMMUTABLE
+AS $$
+  SELECT 'c_' || lower(regexp_replace(p_commentator, '\W', '_', 'g'));
+$$;
+
+-- Fresh, empty staging table shaped like the parent (indexes included, so the
+-- attach adopts them instead of building them under lock)
+CREATE OR REPLACE FUNCTION public.commentary_reload_begin(p_commentator text)
+RETURNS text
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  stage text := public.commentary_partition_name(p_commentator) || '_staging';
+BEGIN
+  EXECUTE format('DROP TABLE IF EXISTS commentary_partitions.%I', stage);
+  -- the CHECK lets ATTACH PARTITION skip its validation scan
+  EXECUTE format('CREATE TABLE commentary_partitions.%I (LIKE public.commentaries INCLUDING ALL, '
+                 'CONSTRAINT %I CHECK (commentator = %L))', stage, stage || '_commentator', p_commentator);
+  RETURN stage;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.commentary_reload_rows(p_commentator text, p_rows jsonb DEFAULT NULL,
+                                                         p_gzip text DEFAULT NULL)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  stage   text := public.commentary_partition_name(p_commentator) || '_staging';
+  written integer;
+BEGIN
+  EXECUTE format($q$
+    INSERT INTO commentary_partitions.%I
+      (commentator, sefer_id, perek, pasuk, comment_idx, dibur_hamatchil, text)
+    SELECT r.commentator, r.sefer_id, r.perek, r.pasuk, coalesce(r.comment_idx, 0), r.dibur_hamatchil, r.text
+    FROM jsonb_to_recordset($1) AS r(
+      commentator text, sefer_id integer, perek integer, pasuk integer,
+      comment_idx integer, dibur_hamatchil text, text text)
+    ON CONFLICT (commentator, sefer_id, perek, pasuk, comment_idx) DO UPDATE
+      SET dibur_hamatchil = EXCLUDED.dibur_hamatchil, text = EXCLUDED.text
+  $q$, stage) USING public.bulk_payload(p_rows, p_gzip);
+  GET DIAGNOSTICS written = ROW_COUNT;
+  RETURN written;
+END;
+$$;
+
+-- Replace the commentator's partition with the staging table in one
+-- transaction: readers see either the old rows or the new ones.  Returns the
+-- new partition's row count.
+CREATE OR REPLACE FUNCTION public.commentary_reload_swap(p_commentator text)
+RETURNS bigint
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  part  text := public.commentary_partition_name(p_commentator);
+  stage text := part || '_staging';
+  total bigint;
+BEGIN
+  IF to_regclass(format('commentary_partitions.%I', stage)) IS NULL THEN
+    RAISE EXCEPTION 'commentary_reload_swap: no staging table for % — call commentary_reload_begin first', p_commentator;
+  END IF;
+  EXECUTE format('SELECT count(*) FROM commentary_partitions.%I', stage) INTO total;
+
+  IF to_regclass(format('commentary_partitions.%I', part)) IS NOT NULL THEN
+    EXECUTE format('ALTER TABLE public.commentaries DETACH PARTITION commentary_partitions.%I', part);
+    EXECUTE format('DROP TABLE commentary_partitions.%I', part);
+  ELSE
+    -- first reload of a commentator without its own partition: its rows are in c_default
+    DELETE FROM commentary_partitions.c_default WHERE commentator = p_commentator;
+  END IF;
+
+  EXECUTE format('ALTER TABLE commentary_partitions.%I RENAME TO %I', stage, part);
+  EXECUTE format('ALTER TABLE public.commentaries ATTACH PARTITION commentary_partitions.%I FOR VALUES IN (%L)',
+                 part, p_commentator);
+  RETURN total;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public.commentary_reload_begin(text)             FROM PUBLIC, anon, authenticated;
+REVOKE ALL ON FUNCTION public.commentary_reload_rows(text, jsonb, text) FROM PUBLIC, anon, authenticated;
+REVOKE ALL ON FUNCTION public.commentary_reload_swap(text)              FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.commentary_reload_begin(text)             TO service_role;
+GRANT EXECUTE ON FUNCTION public.commentary_reload_rows(text, jsonb, text) TO service_role;
+GRANT EXECUTE ON FUNCTION public.commentary_reload_swap(text)              TO service_role;
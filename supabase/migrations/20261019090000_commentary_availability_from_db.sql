@@ -0,0 +1,58 @@
+-- Rebuild commentary_availability from what is actually in commentaries.
+--
+-- The index used to be built from the uploader's local JSON only, so a chapter
+-- uploaded from elsewhere (or a commentator whose local file is missing)
+-- showed up as empty and the app skipped its query.  scripts/upload_commentaries.py
+-- now calls this after uploading, passing its COMMENTATORS list as the bit
+-- order, and only falls back to the local build when the RPC is missing or
+-- not permitted (anon key):
+--
+--   POST /rest/v1/rpc/refresh_commentary_availability  {"p_commentators": ["Rashi", ...]}
+--
+-- Returns the number of chapter rows written.  Chapters with no commentary
+-- left are removed.
+
+CREATE OR REPLACE FUNCTION public.refresh_commentary_availability(p_commentators text[])
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  written integer;
+BEGIN
+  WITH per_pasuk AS (
+    SELECT sefer_id, perek, pasuk,
+           bit_or(1 << (array_position(p_commentators, commentator) - 1)) AS mask
+    FROM public.commentaries
+    WHERE array_position(p_commentators, commentator) IS NOT NULL
+    GROUP BY sefer_id, perek, pasuk
+  ),
+  chapters AS (
+    SELECT c.sefer_id, c.perek,
+           array_agg(coalesce(p.mask, 0) ORDER BY g.pasuk) AS masks,
+           bit_or(coalesce(p.mask, 0))                     AS any_mask
+    FROM (SELECT sefer_id, perek, max(pasuk) AS last FROM per_pasuk GROUP BY sefer_id, perek) c
+    CROSS JOIN LATERAL generate_series(1, c.last) AS g(pasuk)
+    LEFT JOIN per_pasuk p ON p.sefer_id = c.sefer_id AND p.perek = c.perek AND p.pasuk = g.pasuk
+    GROUP BY c.sefer_id, c.perek
+  )
+  INSERT INTO public.commentary_availability (sefer_id, perek, commentators, masks, any_mask, updated_at)
+  SELECT sefer_id, perek, p_commentators, masks, any_mask, now()
+  FROM chapters
+  ON CONFLICT (sefer_id, perek) DO UPDATE
+    SET commentators = EXCLUDED.commentators,
+        masks        = EXCLUDED.masks,
+        any_mask     = EXCLUDED.any_mask,
+        updated_at   = now();
+  GET DIAGNOSTICS written = ROW_COUNT;
+
+  DELETE FROM public.commentary_availability a
+  WHERE NOT EXISTS (SELECT 1 FROM public.commentaries c
+                    WHERE c.sefer_id = a.sefer_id AND c.perek = a.perek);
+  RETURN written;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public.refresh_commentary_availability(text[]) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.refresh_commentary_availability(text[]) TO service_role;
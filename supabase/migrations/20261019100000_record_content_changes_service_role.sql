@@ -0,0 +1,9 @@
+-- record_content_changes() is SECURITY DEFINER: whoever may call it appends to
+-- content_changes and re-stamps revisions on every content table — i.e. writes
+-- the sync feed every client trusts.  It was granted to anon / authenticated
+-- (20261019020000), and the CREATE OR REPLACE in 20261019050000 kept that
+-- grant.  Only the upload scripts call it, and they stamp with the service
+-- role key (scripts/content_revisions.py).
+
+REVOKE ALL ON FUNCTION public.record_content_changes(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.record_content_changes(jsonb) TO service_role;
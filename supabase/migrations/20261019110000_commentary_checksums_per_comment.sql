@@ -0,0 +1,27 @@
+-- commentary_checksums(), per comment.
+--
+-- Since 20261019060000 a pasuk has one row per comment.  The canonical text
+-- ordered a pasuk's rows by text, which Postgres sorts by the DB collation and
+-- Python by codepoint — multi-comment pesukim hashed differently on the two
+-- sides — and it left out comment_idx and dibur_hamatchil, so reordered
+-- comments or a changed dibur hamatchil were never detected or synced.
+--
+-- Canonical line is now "<pasuk>\t<comment_idx>\t<dibur_hamatchil>\t<text>"
+-- (empty dibur_hamatchil for NULL), ordered by pasuk, comment_idx — matching
+-- pasuk_line in scripts/content_revisions.py.  rashi_checksums() delegates
+-- here.  Every commentaries scope gets a new checksum, so the next stamp hands
+-- each chapter one new revision.
+
+CREATE OR REPLACE FUNCTION public.commentary_checksums(p_commentator text)
+RETURNS TABLE (sefer_id integer, perek integer, row_count bigint, checksum text)
+LANGUAGE sql STABLE
+AS $$
+  SELECT c.sefer_id, c.perek, count(*),
+         md5(string_agg(c.pasuk::text || E'\t' || c.comment_idx::text || E'\t' ||
+                        coalesce(c.dibur_hamatchil, '') || E'\t' || c.text,
+                        E'\n' ORDER BY c.pasuk, c.comment_idx))
+  FROM public.commentaries c
+  WHERE c.commentator = p_commentator
+  GROUP BY c.sefer_id, c.perek
+  ORDER BY c.sefer_id, c.perek;
+$$;
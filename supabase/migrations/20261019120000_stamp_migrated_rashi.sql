@@ -0,0 +1,20 @@
+-- Change feed for the Rashi rows 20261019050000 copied from rashi_commentary
+-- into commentaries.
+--
+-- That migration retired every rashi_commentary scope, but the copied rows
+-- came without a revision and without a commentaries feed entry, so syncing
+-- clients dropped those chapters and never got them back.  Every Rashi
+-- chapter that still has unstamped rows is recorded here with its checksum
+-- (commentary_checksums, per-comment since 20261019110000), which hands it a
+-- revision and stamps its rows — exactly what content_revisions.py does
+-- after an upload.  Chapters already stamped with the same checksum are left
+-- alone, so this is safe on projects where the Rashi upload ran since.
+
+SELECT public.record_content_changes(coalesce(jsonb_agg(jsonb_build_object(
+         'table',    'commentaries',
+         'scope',    jsonb_build_object('commentator', 'Rashi', 'sefer_id', c.sefer_id, 'perek', c.perek),
+         'checksum', c.checksum)), '[]'::jsonb))
+FROM public.commentary_checksums('Rashi') c
+WHERE EXISTS (SELECT 1 FROM public.commentaries r
+              WHERE r.commentator = 'Rashi' AND r.sefer_id = c.sefer_id AND r.perek = c.perek
+                AND r.revision IS NULL);
@@ -0,0 +1,7 @@
+-- sefaria_cache is served by fetch-sefaria to every user, so public write
+-- policies let anyone holding the anon key plant text in it.  Both writers —
+-- scripts/warm_sefaria_cache.py and the fetch-sefaria edge function — use the
+-- service role, which bypasses RLS, so only the public read policy stays.
+
+DROP POLICY IF EXISTS "sefaria_cache_public_insert" ON public.sefaria_cache;
+DROP POLICY IF EXISTS "sefaria_cache_public_update" ON public.sefaria_cache;
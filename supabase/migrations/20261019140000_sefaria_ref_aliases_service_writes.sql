@@ -0,0 +1,8 @@
+-- sefaria_ref_aliases is the shared record of which Sefaria title each
+-- commentator × book resolves to, so public write policies let anyone holding
+-- the anon key point a commentator at another text.  Its one writer,
+-- scripts/resolve_refs.py --upload, uses the service role, which bypasses RLS,
+-- so only the public read policy stays (as for sefaria_cache).
+
+DROP POLICY IF EXISTS "sefaria_ref_aliases_public_insert" ON public.sefaria_ref_aliases;
+DROP POLICY IF EXISTS "sefaria_ref_aliases_public_update" ON public.sefaria_ref_aliases;
@@ -0,0 +1,8 @@
+-- purge_expired_sefaria_cache is SECURITY DEFINER, so the grant to
+-- authenticated let any signed-in user delete from the cache every reader
+-- shares.  Purging is maintenance: service_role only, like
+-- record_content_changes (20261019100000) and the sefaria_cache writes
+-- (20261019130000).
+
+REVOKE ALL ON FUNCTION public.purge_expired_sefaria_cache() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.purge_expired_sefaria_cache() TO service_role;
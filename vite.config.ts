@@ -1,9 +1,32 @@
-import { defineConfig } from "vite";
+import { defineConfig, type Plugin } from "vite";
 import react from "@vitejs/plugin-react-swc";
+import fs from "fs";
 import path from "path";
 import { componentTagger } from "lovable-tagger";
 import { VitePWA } from "vite-plugin-pwa";
 
+// Pre-rendered share cards (scripts/generate_og_images.py → og-cards/) are
+// copied to <outDir>/og by the web build (`npm run build`, what the web deploy
+// runs).  The Capacitor and Electron builds use `--mode native` and skip them.
+function ogCards(): Plugin {
+  let outDir = "dist";
+  return {
+    name: "og-cards",
+    apply: "build",
+    configResolved(config) {
+      outDir = path.resolve(config.root, config.build.outDir);
+    },
+    closeBundle() {
+      const src = path.resolve(__dirname, "og-cards");
+      if (!fs.existsSync(src)) return;
+      fs.cpSync(src, path.join(outDir, "og"), {
+        recursive: true,
+        filter: (p) => !path.basename(p).startsWith("."),
+      });
+    },
+  };
+}
+
 // https://vitejs.dev/config/
 export default defineConfig(({ mode }) => ({
   server: {
@@ -18,6 +41,7 @@ export default defineConfig(({ mode }) => ({
   plugins: [
     react(),
     mode === "development" && componentTagger(),
+    mode !== "native" && ogCards(),
     VitePWA({
       registerType: 'autoUpdate',
       includeAssets: ['favicon.ico', 'robots.txt'],
@@ -51,7 +75,7 @@ export default defineConfig(({ mode }) => ({
       },
       workbox: {
         globPatterns: ['**/*.{js,css,html,ico,png,svg,woff2}'],
-        globIgnores: ['**/assets/data-*.js'],
+        globIgnores: ['**/assets/data-*.js', 'og/**'],
         maximumFileSizeToCacheInBytes: 5 * 1024 * 1024, // 5 MB
         runtimeCaching: [
           {